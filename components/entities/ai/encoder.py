@@ -1,23 +1,31 @@
 import typing
 import numpy as np
 from components.entities.ai.helper import (
-    fill_row_by_count,
-    fill_plane,
-    fill_row,
     TILE_IDX,
-    AKA_DORA_TILES,
     HistoryLayer,
 )
+from utils.tile_names import AKA_DORA_HAND136
 
 if typing.TYPE_CHECKING:
     from components.game_scenes.game_manager import GameManager
     from components.entities.buttons.tile import Tile
+    from components.round_engine import RoundEngine
+
+NOW_PLANES = 28
+HISTORY_PLANES = 58
+# A row is filled up to ``count`` columns: cell (kind, column) is set when count > column
+THRESHOLDS = np.arange(4)
+ALL_KINDS = np.arange(34)
 
 
 class Encoder:
     """
     Encode game state into input feature planes for CNN. (86 x 34 x 4)
 
+    Every plane is built from tile kind indices: the kinds of all planes are gathered into one flat
+    array of cells (``plane * 34 + kind``), counted with ``np.bincount`` and turned into planes with
+    the threshold mask ``counts[:, None] > arange(4)``. Filled rows and planes are counted 4 times.
+
     Plane layout:
     0: Own hand tiles
     1: Aka dora tiles in own hand
@@ -53,106 +61,233 @@ class Encoder:
         self.pov_order = list(range(4))
         self.pov_order = self.pov_order[pov_seat:] + self.pov_order[:pov_seat]
 
+    # ---------------- index helpers ----------------
+    @staticmethod
+    def _to_kinds(X: list["Tile"] | list[str] | list[int]) -> np.ndarray:
+        """
+        Convert tiles to an array of hand34 kinds. Accept Tile objects, tile strings or hand136 indices.
+        """
+        if len(X) == 0:
+            return np.empty(0, dtype=np.int64)
+        first = X[0]
+        if isinstance(first, str):
+            return np.fromiter((TILE_IDX[tile] for tile in X), np.int64, len(X))
+        if isinstance(first, (int, np.integer)):
+            return np.asarray(X, dtype=np.int64) // 4
+        return np.fromiter((tile.hand34_idx for tile in X), np.int64, len(X))
+
+    @staticmethod
+    def _row(plane: int, kind: int) -> np.ndarray:
+        """Cells filling a whole row."""
+        return np.full(4, plane * 34 + kind, dtype=np.int64)
+
+    @staticmethod
+    def _plane(plane: int) -> np.ndarray:
+        """Cells filling a whole plane."""
+        return np.repeat(plane * 34 + ALL_KINDS, 4)
+
+    @staticmethod
+    def _cells_to_planes(cells: np.ndarray, planes: int) -> np.ndarray:
+        """
+        Count the cells and turn them into (planes, 34, 4) with the threshold mask.
+        """
+        counts = np.bincount(cells, minlength=planes * 34).reshape(planes, 34)
+        return (counts[:, :, None] > THRESHOLDS).astype(np.float32)
+
     @staticmethod
     def _from_arr_to_plane(X: list["Tile"] | list[str]) -> np.ndarray:
-        plane = np.zeros((34, 4), dtype=np.float32)
-        counts = {i: 0 for i in range(34)}
-        for tile in X:
-            idx = TILE_IDX[str(tile)]
-            counts[idx] += 1
-        for idx, cnt in counts.items():
-            fill_row_by_count(plane, idx, cnt)
-        return plane
+        return Encoder._cells_to_planes(Encoder._to_kinds(X), 1)[0]
 
     # ---------------- main encoder ----------------
     def encode_now(self, X: np.ndarray, game_state: "GameManager") -> None:
         """Encode current game state into planes."""
         player_list = game_state.player_list
+        hand = player_list[self.pov_seat].player_deck
+        X[0:NOW_PLANES] = self._cells_to_planes(
+            self._now_cells(
+                hand=self._to_kinds(hand),
+                aka=[tile.hand34_idx for tile in hand if tile.aka],
+                discards=[
+                    self._to_kinds(player_list[seat].discard_tiles)
+                    for seat in self.pov_order
+                ],
+                melds=[
+                    self._to_kinds(player_list[seat].call_field.get_tiles_list())
+                    for seat in self.pov_order
+                ],
+                dora=self._to_kinds(game_state.deck.dora),
+                riichi=[player_list[seat].is_riichi() >= 0 for seat in self.pov_order],
+                rank=sorted(
+                    player_list,
+                    key=lambda p: (-p.points, p.get_initial_direction().value),
+                ).index(player_list[self.pov_seat]),
+                round_direction=game_state.round_direction.value,
+                round_direction_number=game_state.round_direction_number,
+                own_direction=player_list[self.pov_seat].direction.value,
+            ),
+            NOW_PLANES,
+        )
+
+    def encode_engine(self, X: np.ndarray, engine: "RoundEngine") -> None:
+        """Encode current state of a headless ``RoundEngine`` into planes, same layout as ``encode_now``."""
+        X[0:NOW_PLANES] = self._cells_to_planes(self._engine_cells(engine), NOW_PLANES)
+
+    def _engine_cells(self, engine: "RoundEngine") -> np.ndarray:
+        seats = engine.seats
+        hand = seats[self.pov_seat].hand
+        return self._now_cells(
+            hand=self._to_kinds(hand),
+            aka=[tile // 4 for tile in hand if tile in AKA_DORA_HAND136],
+            discards=[self._to_kinds(seats[seat].discards) for seat in self.pov_order],
+            melds=[self._to_kinds(seats[seat].meld_tiles) for seat in self.pov_order],
+            dora=self._to_kinds(engine.dora),
+            riichi=[seats[seat].is_riichi() >= 0 for seat in self.pov_order],
+            rank=sorted(
+                seats, key=lambda seat: (-seat.points, seat.initial_direction.value)
+            ).index(seats[self.pov_seat]),
+            round_direction=engine.round_direction.value,
+            round_direction_number=engine.round_direction_number,
+            own_direction=seats[self.pov_seat].direction.value,
+        )
+
+    def _now_cells(
+        self,
+        hand: np.ndarray,
+        aka: list[int],
+        discards: list[np.ndarray],
+        melds: list[np.ndarray],
+        dora: np.ndarray,
+        riichi: list[bool],
+        rank: int,
+        round_direction: int,
+        round_direction_number: int,
+        own_direction: int,
+    ) -> np.ndarray:
+        """
+        Gather the cells of planes 0-27. Seat lists are in POV order [self, right, across, left].
+        """
         # Plane 0: Own hand tiles
-        X[0, :, :] = self._from_arr_to_plane(player_list[self.pov_seat].player_deck)
+        cells = [hand]
 
         # Plane 1: Aka dora tiles in own hand
-        plane = np.zeros((34, 4), dtype=np.float32)
-        for tile in player_list[self.pov_seat].player_deck:
-            if tile in AKA_DORA_TILES:
-                fill_row(plane, TILE_IDX[tile])
-        X[1, :, :] = plane
+        for kind in aka:
+            cells.append(self._row(1, kind))
 
         # Planes 2-5: Every discards [self, right, across, left]
-        for i in range(4):
-            discards = player_list[self.pov_order[i]].discard_tiles
-            X[2 + i, :, :] = self._from_arr_to_plane(discards)
-
         # Planes 6-9: Every melds [self, right, across, left]
         for i in range(4):
-            meld_tiles = player_list[self.pov_order[i]].call_field.get_tiles_list()
-            X[6 + i, :, :] = self._from_arr_to_plane(meld_tiles)
+            cells.append((2 + i) * 34 + discards[i])
+            cells.append((6 + i) * 34 + melds[i])
 
         # Plane 10: Dora indicators
-        X[10, :, :] = self._from_arr_to_plane(game_state.deck.dora)
+        cells.append(10 * 34 + dora)
 
         # Planes 11-13: Riichi status of players [right, across, left]
         for i in range(1, 4):
-            if player_list[self.pov_order[i]].is_riichi() >= 0:
-                fill_plane(X[10 + i, :, :])
+            if riichi[i]:
+                cells.append(self._plane(10 + i))
 
         # Planes 14-17: Rank positions of POV
-        sorted_player = sorted(
-            player_list, key=lambda p: (-p.points, p.get_initial_direction().value)
-        )
-        rank = sorted_player.index(player_list[self.pov_seat])
-        fill_plane(X[14 + rank, :, :])
+        cells.append(self._plane(14 + rank))
 
         # Planes 18-25: Kyoku index (8 planes)
-        if game_state.round_direction.value == 0:
-            kyoku_idx = game_state.round_direction_number - 1
+        if round_direction == 0:
+            kyoku_idx = round_direction_number - 1
         else:
-            kyoku_idx = game_state.round_direction_number + 3
-        fill_plane(X[18 + kyoku_idx, :, :])
+            kyoku_idx = round_direction_number + 3
+        cells.append(self._plane(18 + kyoku_idx))
 
         # Plane 26: Round wind
-        round_wind = str(game_state.round_direction)[0]
-        fill_row(X[26, :, :], TILE_IDX[round_wind])
+        cells.append(self._row(26, 27 + round_direction))
 
         # Plane 27: Own wind
-        own_wind = str(player_list[self.pov_seat].direction)[0]
-        fill_row(X[27, :, :], TILE_IDX[own_wind])
+        cells.append(self._row(27, 27 + own_direction))
+
+        return np.concatenate(cells)
 
     def encode_history(self, X: np.ndarray, history: list["HistoryLayer"]) -> None:
         """Encode past 6 steps of .history into planes. 13 planes for first step, 9 planes for each subsequent step."""
+        X[NOW_PLANES:] = self._cells_to_planes(
+            self._history_cells(history), HISTORY_PLANES
+        )
+
+    def _history_cells(self, history: list["HistoryLayer"]) -> np.ndarray:
         # .history[-1] is the most recent past step, each frame views store from 0~3, the self.pov_order store the order:
         # [POV, right of POV, opposite of POV, left of POV]
+        # Plane numbers are relative to plane 28
 
         FIRST_FRAME_FLAG = True
-        offset = 28
+        offset = 0
+        cells = [np.empty(0, dtype=np.int64)]
         for frame in history[::-1]:
-            hands = frame.hands
-            discards = frame.discards
-            melds = frame.calls
-            riichi_declared = frame.riichi_declared
-            dora = frame.dora
+            if offset >= HISTORY_PLANES:
+                break
 
             # Plane 0: Own hand tiles
-            X[offset + 0, :, :] = self._from_arr_to_plane(hands[self.pov_seat])
+            cells.append(offset * 34 + self._to_kinds(frame.hands[self.pov_seat]))
 
             # Plane 1-4: Every discards [self, right, across, left]
-            for i in range(4):
-                _discards = discards[self.pov_order[i]]
-                X[offset + 1 + i, :, :] = self._from_arr_to_plane(_discards)
-
             # Plane 5-8: Every melds [self, right, across, left]
             for i in range(4):
-                _melds = melds[self.pov_order[i]]
-                X[offset + 5 + i, :, :] = self._from_arr_to_plane(_melds)
+                seat = self.pov_order[i]
+                cells.append((offset + 1 + i) * 34 + self._to_kinds(frame.discards[seat]))
+                cells.append((offset + 5 + i) * 34 + self._to_kinds(frame.calls[seat]))
 
             if FIRST_FRAME_FLAG:
                 # Plane 9: Dora indicators
-                X[offset + 9, :, :] = self._from_arr_to_plane(dora)
+                cells.append((offset + 9) * 34 + self._to_kinds(frame.dora))
                 # Planes 10-12: Riichi status of players [right, across, left]
                 for i in range(1, 4):
-                    if riichi_declared[self.pov_order[i]]:
-                        fill_plane(X[offset + 9 + i, :, :])
+                    if frame.riichi_declared[self.pov_order[i]]:
+                        cells.append(self._plane(offset + 9 + i))
                 offset += 13
                 FIRST_FRAME_FLAG = False
             else:
                 offset += 9
+
+        return np.concatenate(cells)
+
+    def encode_history_block(self, history: list["HistoryLayer"]) -> np.ndarray:
+        """
+        Encode the history planes (28-85) once for every POV seat.
+        :param history: Past steps, 0 being the oldest.
+        :return: Read-only array (4, 58, 34, 4), indexed by POV seat.
+        :rtype: np.ndarray
+        """
+        pov_seat = self.pov_seat
+        cells = []
+        for seat in range(4):
+            self.change_POV(seat)
+            cells.append(seat * HISTORY_PLANES * 34 + self._history_cells(history))
+        self.change_POV(pov_seat)
+        block = self._cells_to_planes(np.concatenate(cells), 4 * HISTORY_PLANES)
+        block = block.reshape(4, HISTORY_PLANES, self.H, self.W)
+        block.setflags(write=False)
+        return block
+
+    # ---------------- batch encoder ----------------
+    def encode_engine_batch(
+        self,
+        requests: list[tuple["RoundEngine", int, np.ndarray]],
+    ) -> np.ndarray:
+        """
+        Encode the POV of many (engine, seat, history planes) at once into (B,86,34,4),
+        with a single ``np.bincount`` and threshold over the whole batch.
+        :param requests: List of (engine, POV seat, history planes of that seat from ``encode_history_block``).
+        :return: The stacked encoded states.
+        :rtype: np.ndarray
+        """
+        batch_size = len(requests)
+        X = np.empty((batch_size, self.P, self.H, self.W), dtype=np.float32)
+        if batch_size == 0:
+            return X
+
+        cells = []
+        for b, (engine, seat, _) in enumerate(requests):
+            self.change_POV(seat)
+            cells.append(b * NOW_PLANES * 34 + self._engine_cells(engine))
+        planes = self._cells_to_planes(np.concatenate(cells), batch_size * NOW_PLANES)
+        X[:, 0:NOW_PLANES] = planes.reshape(batch_size, NOW_PLANES, self.H, self.W)
+        for b, (_, _, history_planes) in enumerate(requests):
+            X[b, NOW_PLANES:] = history_planes
+        return X
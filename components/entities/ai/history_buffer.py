@@ -0,0 +1,126 @@
+from collections import deque
+import typing
+from typing import Optional
+import numpy as np
+from components.entities.ai.encoder import Encoder
+from components.entities.ai.helper import HistoryLayer
+from components.history_store import HistoryStore, HISTORY_STORE
+from utils.game_history_data_dict import GameHistoryData
+from utils.tile_names import tile_to_str
+
+if typing.TYPE_CHECKING:
+    from components.round_engine import RoundEngine
+
+# Number of past rounds seen by the AI agents
+HISTORY_SIZE = 6
+
+
+def history_layer_from_data(data: GameHistoryData) -> HistoryLayer:
+    """
+    Snapshot an ended round from its game history data.
+    :param data: The game history data of the round.
+    :return: The history frame.
+    :rtype: HistoryLayer
+    """
+    riichi_declared = [False] * 4
+    for i in data["reaches"]:
+        riichi_declared[i] = True
+    return HistoryLayer(
+        hands=[[tile["string"] for tile in hand] for hand in data["hands"]],
+        discards=[[tile["string"] for tile in discard] for discard in data["discards"]],
+        calls=[
+            [tile["string"] for meld in melds for tile in meld["tiles"]]
+            for melds in data["melds"]
+        ],
+        riichi_declared=riichi_declared,
+        dora=[tile["string"] for tile in data["dora"]],
+    )
+
+
+def history_layer_from_engine(engine: "RoundEngine") -> HistoryLayer:
+    """
+    Snapshot an ended ``RoundEngine`` the same way ``history_layer_from_data`` does a .history snapshot.
+    :param engine: The ended round.
+    :return: The history frame.
+    :rtype: HistoryLayer
+    """
+    riichi_declared = [False] * 4
+    for i in engine.log["reaches"]:
+        riichi_declared[i] = True
+    return HistoryLayer(
+        hands=[list(map(tile_to_str, state.hand)) for state in engine.seats],
+        discards=[list(map(tile_to_str, state.discards)) for state in engine.seats],
+        calls=[list(map(tile_to_str, state.meld_tiles)) for state in engine.seats],
+        riichi_declared=riichi_declared,
+        dora=list(map(tile_to_str, engine.dora)),
+    )
+
+
+class HistoryBuffer:
+    """
+    The latest ended rounds seen by the AI agents (0 being the oldest), with their history planes.
+
+    The game pushes each ended round once, and the agents sharing the buffer share its planes,
+    encoded again only when a round is pushed. The snapshots of ``store`` are only read on first use.
+
+    :ivar size: Number of rounds kept.
+    :ivar store: History store read on first use, None to start empty.
+    """
+
+    def __init__(self, size: int = HISTORY_SIZE, store: Optional[HistoryStore] = None):
+        self.size = size
+        self.store = store
+        self.__layers: deque[HistoryLayer] = deque(maxlen=size)
+        self.__loaded = store is None
+        self.__encoder = Encoder()
+        self.__planes: Optional[np.ndarray] = None
+
+    @property
+    def history(self) -> list[HistoryLayer]:
+        self.__load()
+        return list(self.__layers)
+
+    @property
+    def planes(self) -> np.ndarray:
+        """
+        History planes of every POV seat, read-only array (4, 58, 34, 4).
+        """
+        self.__load()
+        if self.__planes is None:
+            self.__planes = self.__encoder.encode_history_block(list(self.__layers))
+        return self.__planes
+
+    def push(self, data: GameHistoryData) -> None:
+        """
+        Add an ended round, the oldest round leaves a full buffer.
+        :param data: The game history data of the round, ignored if the round is not ended.
+        :return: None
+        """
+        if data["end_game"]:
+            self.push_layer(history_layer_from_data(data))
+
+    def push_layer(self, layer: HistoryLayer) -> None:
+        self.__load()
+        self.__layers.append(layer)
+        self.__planes = None
+
+    def replace(self, layers: list[HistoryLayer]) -> None:
+        self.__loaded = True
+        self.__layers = deque(layers, maxlen=self.size)
+        self.__planes = None
+
+    def clear(self) -> None:
+        self.replace([])
+
+    def __load(self) -> None:
+        if self.__loaded:
+            return
+        self.__loaded = True
+        entries = self.store.recent_entries(self.size, end_game_only=True)
+        self.__layers.extend(
+            history_layer_from_data(self.store.load(entry)) for entry in entries
+        )
+
+
+# Rounds of the .history directory, shared by the AI agents of the game
+HISTORY_BUFFER = HistoryBuffer(store=HISTORY_STORE)
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
 import sys
-import json
+import numpy as np
 import torch
 import typing
-import os
-from utils.enums import ActionType, CallType
-from components.entities.ai.model import MahjongCNN
+from collections import OrderedDict
+from utils.enums import ActionType, CallType, EventLevel, EventType
+from utils.event_bus import emit_event, is_enabled
+from components.entities.ai.runtime import Backend, Model, get_model
 from components.entities.ai.encoder import Encoder
 from components.entities.ai.helper import TILE_IDX, AKA_DORA_TILES, HistoryLayer
-from utils.constants import HISTORY_PATH
+from components.entities.ai.history_buffer import HISTORY_BUFFER, HistoryBuffer
 from utils.enums import TileSource
+from utils.tile_names import tile_to_str
 
 if typing.TYPE_CHECKING:
     from components.entities.player import Player
+    from components.round_engine import RoundEngine
+
+# Output index and size of each head in ``MahjongCNN.forward``
+HEADS = {"discard": 0, "chi": 1, "pon": 2, "riichi": 3}
+HEAD_SIZES = {"discard": 34, "chi": 4, "pon": 2, "riichi": 2}
+# Number of table histories whose planes are kept
+HISTORY_PLANES_CACHE_SIZE = 64
+# Actions cancelled by ``skip_when_nagashi_mangan``
+CALL_ACTIONS = (
+    ActionType.RON,
+    ActionType.TSUMO,
+    ActionType.KAN,
+    ActionType.PON,
+    ActionType.CHII,
+)
 
 
 class MahjongAIAgent:
@@ -24,192 +41,373 @@ class MahjongAIAgent:
         pon_path: str,
         riichi_path: str,
         device: str = "cpu",
+        load_history: bool = True,
+        backend: Backend = "torch",
+        mmap: bool = False,
     ):
         self.device = device
+        self.backend = backend
+        self.mmap = mmap
         self.encoder = Encoder()
 
-        self.discard_model = MahjongCNN().to(device)
-        self.discard_model.load_state_dict(
-            torch.load(discard_path, map_location=device)
+        # Models come from the process-wide registry: heads sharing a checkpoint share one model,
+        # e.g. COMBINED_MODEL is loaded once, and so do later agents and game managers
+        self.discard_model = self.__load_model(discard_path)
+        self.chi_model = self.__load_model(chi_path)
+        self.pon_model = self.__load_model(pon_path)
+        self.riichi_model = self.__load_model(riichi_path)
+
+        # Heads served by each distinct model, so one forward pass answers all of them
+        self.__model_heads: list[tuple[Model, set[str]]] = []
+        for name in HEADS:
+            model = getattr(self, f"{name}_model")
+            for _model, heads in self.__model_heads:
+                if _model is model:
+                    heads.add(name)
+                    break
+            else:
+                self.__model_heads.append((model, {name}))
+
+        # Past rounds of .history, 0 being the oldest, shared by the agents of the game and pushed by end_match
+        self.history_buffer: HistoryBuffer = (
+            HISTORY_BUFFER if load_history else HistoryBuffer()
         )
-        self.discard_model.eval()
+        # History planes of self-play tables, keyed by the frames of their history
+        self.__history_planes_cache: OrderedDict[
+            tuple[int, ...], tuple[tuple[HistoryLayer, ...], np.ndarray]
+        ] = OrderedDict()
 
-        self.chi_model = MahjongCNN().to(device)
-        self.chi_model.load_state_dict(torch.load(chi_path, map_location=device))
-        self.chi_model.eval()
+    @property
+    def history(self) -> list[HistoryLayer]:
+        return self.history_buffer.history
 
-        self.pon_model = MahjongCNN().to(device)
-        self.pon_model.load_state_dict(torch.load(pon_path, map_location=device))
-        self.pon_model.eval()
+    @property
+    def history_planes(self) -> np.ndarray:
+        """
+        History planes of the agent's own .history for each POV seat, encoded once per ended round.
+        """
+        return self.history_buffer.planes
 
-        self.riichi_model = MahjongCNN().to(device)
-        self.riichi_model.load_state_dict(torch.load(riichi_path, map_location=device))
-        self.riichi_model.eval()
+    def make_move(self, player: Player) -> ActionType:
+        return self.make_moves([(player, player.can_call)])[0]
 
-        # Load .history
-        # Read json files in HISTORY PATH, 0 being the oldest, then stores in an array to use later
-        self.history = []
-        files = self.load_files()
-        self.read_files(files)
+    def make_moves(
+        self, decisions: list[tuple[Player, list[CallType]]]
+    ) -> list[ActionType]:
+        """
+        Decide the moves of several players at once, with a single forward pass per model over the stacked batch.
+        :param decisions: List of (player, legal calls) to decide, e.g. every bot of ``GameManager.call_order``.
+        :return: The chosen action of each player, in the same order.
+        :rtype: list[ActionType]
+        """
+        actions: list[typing.Optional[ActionType]] = []
+        pending: list[int] = []
+        for i, (player, can_call) in enumerate(decisions):
+            action = self.__rule_move(
+                can_call, CallType.KAN in can_call and self.__is_ankan(player)
+            )
+            if action in CALL_ACTIONS:
+                action = self.skip_when_nagashi_mangan(action)
+            actions.append(action)
+            if action is None:
+                pending.append(i)
+
+        if len(pending) == 0:
+            return actions
+
+        X = np.stack([self.__encode_player(decisions[i][0]) for i in pending])
+        outputs = self.forward_heads(
+            X,
+            [self.needed_heads(decisions[i][1]) for i in pending],
+        )
 
-    def make_move(self, player: Player) -> ActionType:
-        gm = player.game_manager  # set in GameBuilder.new
+        for row, i in enumerate(pending):
+            player, can_call = decisions[i]
+            action = self.__model_move(can_call, outputs, row, verbose=True)
+            if action in (ActionType.RIICHI, ActionType.DISCARD):
+                self.target_to_discard(player, outputs["discard"][row])
+            elif action in CALL_ACTIONS:
+                action = self.skip_when_nagashi_mangan(action)
+            actions[i] = action
+        return actions
+
+    def make_engine_move(
+        self,
+        engine: RoundEngine,
+        seat: int,
+        history: typing.Optional[list[HistoryLayer]] = None,
+    ) -> tuple[ActionType, typing.Optional[int]]:
+        """
+        Same decisions as ``make_move`` for a seat of a headless ``RoundEngine``.
+        :param engine: The running round.
+        :param seat: The deciding seat.
+        :param history: Past rounds of this table, defaults to the agent's own .history.
+        :return: The action and, for DISCARD or RIICHI, the hand136 index to discard.
+        :rtype: tuple[ActionType, int | None]
+        """
+        return self.make_engine_moves([(engine, seat, history)])[0]
 
-        if CallType.RYUUKYOKU in player.can_call:
-            return ActionType.SKIP
+    def make_engine_moves(
+        self,
+        requests: list[
+            tuple[RoundEngine, int, typing.Optional[list[HistoryLayer]]]
+        ],
+    ) -> list[tuple[ActionType, typing.Optional[int]]]:
+        """
+        Batched ``make_engine_move``: decide seats of one or many concurrently simulated tables
+        with a single forward pass per model.
+        :param requests: List of (engine, seat, history) to decide.
+        :return: The action and tile to discard of each request, in the same order.
+        :rtype: list[tuple[ActionType, int | None]]
+        """
+        moves: list[tuple[typing.Optional[ActionType], typing.Optional[int]]] = []
+        pending: list[int] = []
+        for i, (engine, seat, _) in enumerate(requests):
+            state = engine.seats[seat]
+            is_ankan = (
+                CallType.KAN in state.can_call
+                and engine.current_seat == seat
+                and len([tile for tile in state.hand if tile // 4 == state.draw_tile // 4])
+                == 4
+            )
+            action = self.__rule_move(state.can_call, is_ankan, verbose=False)
+            moves.append((action, None))
+            if action is None:
+                pending.append(i)
+
+        if len(pending) == 0:
+            return moves
+
+        X = self.encoder.encode_engine_batch(
+            [
+                (engine, seat, self.get_history_planes(history)[seat])
+                for engine, seat, history in (requests[i] for i in pending)
+            ]
+        )
+        outputs = self.forward_heads(
+            X,
+            [
+                self.needed_heads(requests[i][0].seats[requests[i][1]].can_call)
+                for i in pending
+            ],
+        )
 
-        if CallType.RON in player.can_call:
-            return self.skip_when_nagashi_mangan(ActionType.RON)
-
-        if CallType.TSUMO in player.can_call:
-            return self.skip_when_nagashi_mangan(ActionType.TSUMO)
-
-        if CallType.KAN in player.can_call:
-            ANKAN_FLAG = False
-            draw_tile = player.get_draw_tile()
-            tiles_list = list(
-                filter(
-                    lambda tile: tile.number == draw_tile.number
-                    and tile.type == draw_tile.type
-                    and tile.source == TileSource.DRAW,
-                    player.player_deck,
+        for row, i in enumerate(pending):
+            engine, seat, _ = requests[i]
+            action = self.__model_move(engine.seats[seat].can_call, outputs, row)
+            tile = None
+            if action in (ActionType.RIICHI, ActionType.DISCARD):
+                legal_tiles = engine.legal_discards(
+                    seat, riichi=action == ActionType.RIICHI
                 )
+                tile = self.pick_discard_from_logits(outputs["discard"][row], legal_tiles)
+            moves[i] = (action, tile)
+        return moves
+
+    @staticmethod
+    def __rule_move(
+        can_call: list[CallType], is_ankan: bool, verbose: bool = True
+    ) -> typing.Optional[ActionType]:
+        """
+        Decisions taken without the models: skip kyuushu kyuuhai, always win, only ankan.
+        :return: The action, None if the models have to decide.
+        """
+        if CallType.RYUUKYOKU in can_call:
+            return ActionType.SKIP
+
+        if CallType.RON in can_call:
+            return ActionType.RON
+
+        if CallType.TSUMO in can_call:
+            return ActionType.TSUMO
+
+        if CallType.KAN in can_call:
+            if is_ankan:
+                if verbose and is_enabled(EventLevel.DEBUG):
+                    emit_event(EventType.AI_DECISION, EventLevel.DEBUG, "Choosing ANKAN")
+                return ActionType.KAN
+            if verbose and is_enabled(EventLevel.DEBUG):
+                emit_event(EventType.AI_DECISION, EventLevel.DEBUG, "Skipping KAN")
+            return ActionType.SKIP
+
+        return None
+
+    @staticmethod
+    def __is_ankan(player: Player) -> bool:
+        draw_tile = player.get_draw_tile()
+        if draw_tile is None:
+            return False
+        tiles_list = list(
+            filter(
+                lambda tile: tile.number == draw_tile.number
+                and tile.type == draw_tile.type
+                and tile.source == TileSource.DRAW,
+                player.player_deck,
             )
-            if len(tiles_list) == 4:
-                ANKAN_FLAG = True
+        )
+        return len(tiles_list) == 4
 
-            if ANKAN_FLAG:
-                print("Choosing ANKAN")
-                return self.skip_when_nagashi_mangan(ActionType.KAN)
-            else:
-                print("Skipping KAN")
-                return ActionType.SKIP
+    @staticmethod
+    def needed_heads(can_call: list[CallType]) -> set[str]:
+        """
+        Get the model heads needed to answer the given calls.
+        """
+        if CallType.RIICHI in can_call:
+            return {"riichi", "discard"}
+        if CallType.PON in can_call:
+            return {"pon"}
+        if CallType.CHII in can_call:
+            return {"chi"}
+        return {"discard"}
+
+    def forward_heads(
+        self, X: np.ndarray, needs: list[set[str]]
+    ) -> dict[str, torch.Tensor]:
+        """
+        Run each distinct model once over the rows of the batch needing one of its heads.
+        :param X: Stacked encoded game states (B,86,34,4).
+        :param needs: Heads needed by each row.
+        :return: Logits of each head (B, head size), rows not needing a head are left at zero.
+        :rtype: dict[str, torch.Tensor]
+        """
+        batch_size = len(needs)
+        outputs: dict[str, torch.Tensor] = {
+            name: torch.zeros((batch_size, HEAD_SIZES[name]), device=self.device)
+            for name in set().union(*needs)
+        }
 
-        X = self.encoder.empty_plane()
-        self.encoder.change_POV(player.player_idx)
-        self.encoder.encode_now(X, game_state=gm)  # np.ndarray (86, 34, 4)
-        self.encoder.encode_history(X, self.history)  # np.ndarray (86, 34, 4)
-        x = torch.from_numpy(X).unsqueeze(0).to(self.device)  # (1,86,34,4)
-
-        if CallType.RIICHI in player.can_call:
-            with torch.no_grad():
-                _, _, _, out_riichi = self.riichi_model(x)
-            probs_riichi = torch.softmax(out_riichi, dim=-1)[0]
-            print("Riichi probs:", probs_riichi)
+        with torch.no_grad():
+            for model, heads in self.__model_heads:
+                rows = [row for row in range(batch_size) if needs[row] & heads]
+                if len(rows) == 0:
+                    continue
+                out = model(torch.from_numpy(X[rows]).to(self.device))
+                for i, row in enumerate(rows):
+                    for name in needs[row] & heads:
+                        outputs[name][row] = out[HEADS[name]][i]
+        return outputs
+
+    def __load_model(self, path: str) -> Model:
+        return get_model(path, self.backend, self.device, self.mmap)
+
+    @staticmethod
+    def __model_move(
+        can_call: list[CallType],
+        outputs: dict[str, torch.Tensor],
+        row: int,
+        verbose: bool = False,
+    ) -> ActionType:
+        """
+        Turn the model outputs of a batch row into an action, same thresholds as the single decision.
+        """
+        if CallType.RIICHI in can_call:
+            probs_riichi = torch.softmax(outputs["riichi"][row], dim=-1)
+            if verbose and is_enabled(EventLevel.DEBUG):
+                emit_event(
+                    EventType.AI_DECISION,
+                    EventLevel.DEBUG,
+                    "Riichi probs: {probs}",
+                    probs=probs_riichi,
+                )
             if probs_riichi[1].item() > 0.5:
-                self.target_to_discard(player, x)
                 return ActionType.RIICHI
-            else:
-                return ActionType.SKIP
+            return ActionType.SKIP
 
         # Pon / Chi decisions
-        if CallType.PON in player.can_call:
-            with torch.no_grad():
-                _, _, out_pon, _ = self.pon_model(x)
-            probs_pon = torch.softmax(out_pon, dim=-1)[0]
-            print("Test:", torch.softmax(out_pon, dim=-1))
-            print("Pon probs:", probs_pon)
+        if CallType.PON in can_call:
+            probs_pon = torch.softmax(outputs["pon"][row], dim=-1)
+            if verbose and is_enabled(EventLevel.DEBUG):
+                emit_event(
+                    EventType.AI_DECISION,
+                    EventLevel.DEBUG,
+                    "Pon probs: {probs}",
+                    probs=probs_pon,
+                )
             if probs_pon[1].item() > 0.5:
-                return self.skip_when_nagashi_mangan(ActionType.PON)
-            else:
-                return ActionType.SKIP
+                return ActionType.PON
+            return ActionType.SKIP
 
-        if CallType.CHII in player.can_call:
-            with torch.no_grad():
-                _, out_chi, _, _ = self.chi_model(x)
-            probs_chi = torch.softmax(out_chi, dim=-1)[0]
-            print("Chi probs:", probs_chi.argmax())
+        if CallType.CHII in can_call:
+            probs_chi = torch.softmax(outputs["chi"][row], dim=-1)
+            if verbose and is_enabled(EventLevel.DEBUG):
+                emit_event(
+                    EventType.AI_DECISION,
+                    EventLevel.DEBUG,
+                    "Chi probs: {probs}",
+                    probs=probs_chi.argmax(),
+                )
             prob_list = list(map(lambda prob: prob.item(), probs_chi))
             if prob_list.index(max(prob_list)) == 0:
                 return ActionType.SKIP
-            else:
-                return self.skip_when_nagashi_mangan(ActionType.CHII)
+            return ActionType.CHII
 
-        self.target_to_discard(player, x)
         return ActionType.DISCARD
 
+    def __encode_player(self, player: Player) -> np.ndarray:
+        gm = player.game_manager  # set in GameBuilder.new
+        X = self.encoder.empty_plane()
+        self.encoder.change_POV(player.player_idx)
+        self.encoder.encode_now(X, game_state=gm)  # np.ndarray (86, 34, 4)
+        X[28:] = self.history_planes[player.player_idx]  # Encoded once per ended round
+        return X
+
     @staticmethod
-    def load_files():
+    def pick_discard_from_logits(logits: torch.Tensor, legal_tiles: list[int]) -> int:
         """
-        Load JSON files from HISTORY PATH (0 being the oldest)
+        Pick the legal tile with the best logit, regular 5 before aka dora.
+        :param logits: Discard logits (34,).
+        :param legal_tiles: Tiles allowed to be discarded (hand136 indices).
+        :return: The hand136 index to discard.
+        :rtype: int
         """
-        files = []
-        for entry in os.listdir(HISTORY_PATH):
-            file_path = os.path.join(HISTORY_PATH, entry)
-            if os.path.isfile(file_path):
-                files.append(file_path)
-        files.sort(key=lambda x: int(os.path.basename(x).split(".")[0]))
-        return files[-6:]
-
-    def read_files(self, files: list[str]):
+        best_tile = None
+        best_key = None
+        for tile in legal_tiles:
+            key = (logits[tile // 4].item(), tile_to_str(tile) not in AKA_DORA_TILES)
+            if best_key is None or key > best_key:
+                best_tile = tile
+                best_key = key
+        if best_tile is None:
+            raise ValueError("No valid tile found to discard.")
+        return best_tile
+
+    def get_history_planes(
+        self, history: typing.Optional[list[HistoryLayer]] = None
+    ) -> np.ndarray:
         """
-        Read JSON files and store as HistoryLayer objects in self..history (0 being the oldest)
+        Get the history planes of every POV seat, encoded only when the frames of the history change.
+        :param history: Past rounds of a table, defaults to the agent's own .history.
+        :return: Read-only array (4, 58, 34, 4), indexed by POV seat.
+        :rtype: np.ndarray
         """
-        self.history = []
-        for file_path in files:
-            with open(file_path, "+r") as file:
-                json_data = json.load(file)
+        if history is None:
+            return self.history_planes
 
-                if not json_data["end_game"]:
-                    continue
-
-                # Load hands
-                hands = []
-                for hand in json_data["hands"]:
-                    temp = []
-                    for tile in hand:
-                        temp.append(tile["string"])
-                    hands.append(temp)
-                # Load discards
-                discards = []
-                for discard in json_data["discards"]:
-                    temp = []
-                    for tile in discard:
-                        temp.append(tile["string"])
-                    discards.append(temp)
-                # Load calls
-                calls = []
-                for call in json_data["melds"]:
-                    temp = []
-                    for meld in call:
-                        for tile in meld["tiles"]:
-                            temp.append(tile["string"])
-                    calls.append(temp)
-                # Load riichi declared
-                riichi_declared = [False] * 4
-                for i in json_data["reaches"]:
-                    riichi_declared[i] = True
-                # Load dora
-                dora = []
-                for tile in json_data["dora"]:
-                    dora.append(tile["string"])
-
-                history_layer = HistoryLayer(
-                    hands=hands,
-                    discards=discards,
-                    calls=calls,
-                    riichi_declared=riichi_declared,
-                    dora=dora,
-                )
+        key = tuple(id(frame) for frame in history)
+        if key in self.__history_planes_cache:
+            self.__history_planes_cache.move_to_end(key)
+            return self.__history_planes_cache[key][1]
 
-                self.history.append(history_layer)
+        history_planes = self.encoder.encode_history_block(history)
+        # Keep the frames alive so their ids stay unique while cached
+        self.__history_planes_cache[key] = (tuple(history), history_planes)
+        while len(self.__history_planes_cache) > HISTORY_PLANES_CACHE_SIZE:
+            self.__history_planes_cache.popitem(last=False)
+        return history_planes
 
+    @staticmethod
     def target_to_discard(
-        self,
         player: Player,
-        x: torch.Tensor,
+        logits_discard: torch.Tensor,
     ) -> None:
         """
         Decide which tile to discard based on the model's output.
         :param player: Who is discarding the tile.
-        :param x: The encoded game state tensor.
+        :param logits_discard: The discard head output for this player (34,).
         :return: None
         """
         AKA_DORA_KIND_INDICES = [4, 13, 22]
 
-        with torch.no_grad():
-            out_discard, _, _, _ = self.discard_model(x)
-        logits_discard = out_discard[0]  # (34,)
         tile_kind_idx = int(torch.argmax(logits_discard).item())
         discard_index = -1
 
@@ -223,13 +421,16 @@ class MahjongAIAgent:
                         discard_index = i
                         break
                 if player.player_deck[discard_index].is_disabled:
-                    print(
-                        "Chii kuikae: ",
-                        rank_tile,
-                        torch.topk(logits_discard, rank_tile).indices,
-                        discard_index,
-                        player.player_deck[discard_index],
-                    )
+                    if is_enabled(EventLevel.DEBUG):
+                        emit_event(
+                            EventType.AI_DECISION,
+                            EventLevel.DEBUG,
+                            "Chii kuikae: {rank} {indices} {discard_index} {tile}",
+                            rank=rank_tile,
+                            indices=torch.topk(logits_discard, rank_tile).indices,
+                            discard_index=discard_index,
+                            tile=player.player_deck[discard_index],
+                        )
                     tile_kind_idx = int(
                         torch.topk(logits_discard, rank_tile).indices[-1]
                     )
@@ -277,7 +478,15 @@ class MahjongAIAgent:
             len(sys.argv) > 1
             and len(list(filter(lambda argv: "data=nm.json" in argv, sys.argv))) > 0
         ):
-            print("Nagashi Mangan activated: Skipping call.")
+            emit_event(
+                EventType.AI_DECISION,
+                EventLevel.DEBUG,
+                "Nagashi Mangan activated: Skipping call.",
+            )
             return ActionType.SKIP
-        print("Nagashi Mangan not activated. Proceeding with base action.")
+        emit_event(
+            EventType.AI_DECISION,
+            EventLevel.DEBUG,
+            "Nagashi Mangan not activated. Proceeding with base action.",
+        )
         return base_action
@@ -54,3 +54,23 @@ class MahjongCNN(nn.Module):
         out_riichi = self.head_riichi(x)
 
         return out_discard, out_chi, out_pon, out_riichi
+
+
+def fuse_for_inference(model: MahjongCNN) -> MahjongCNN:
+    """
+    Copy a trained model for inference: fold each BatchNorm into its conv and strip dropout.
+    :param model: The trained model.
+    :return: An eval-mode copy giving the same outputs as ``model.eval()``.
+    :rtype: MahjongCNN
+    """
+    import copy
+    from torch.nn.utils.fusion import fuse_conv_bn_eval
+
+    fused = copy.deepcopy(model).eval()
+    for block in (1, 2, 3):
+        conv = getattr(fused, f"conv{block}")
+        bn = getattr(fused, f"bn{block}")
+        setattr(fused, f"conv{block}", fuse_conv_bn_eval(conv, bn))
+        setattr(fused, f"bn{block}", nn.Identity())
+        setattr(fused, f"drop{block}", nn.Identity())
+    return fused
@@ -0,0 +1,296 @@
+import os
+import random
+from functools import lru_cache
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.ao.quantization as quantization
+from typing import Literal, Callable, Optional
+from components.entities.ai.model import MahjongCNN, fuse_for_inference
+
+# Inference backend of the CNN bots
+# - torch: the trained MahjongCNN in eval mode
+# - torchscript: BatchNorm folded, dropout stripped, frozen with torch.jit.optimize_for_inference
+# - onnx: the same folded graph run by onnxruntime on CPU
+# - int8: static int8 convs calibrated on headless rounds and a dynamic int8 fc layer
+Backend = Literal["torch", "torchscript", "onnx", "int8"]
+BACKENDS: tuple[Backend, ...] = ("torch", "torchscript", "onnx", "int8")
+
+ARTIFACT_SUFFIX = {"torchscript": ".torchscript.pt", "onnx": ".onnx", "int8": ".int8.pt"}
+HEAD_NAMES = ["discard", "chi", "pon", "riichi"]
+# Number of recorded decision states used to calibrate the int8 conv activations
+CALIBRATION_STATES = 512
+
+Model = Callable[[torch.Tensor], tuple[torch.Tensor, ...]]
+
+
+def artifact_path(path: str, backend: Backend) -> str:
+    """
+    Get the exported artifact path of a checkpoint, next to the ``.pth`` file.
+    :param path: The ``.pth`` checkpoint path.
+    :param backend: ``torchscript``, ``onnx`` or ``int8``.
+    :return: e.g. ``public/model/mahjong_cnn_pon_best.onnx``.
+    :rtype: str
+    """
+    return os.path.splitext(path)[0] + ARTIFACT_SUFFIX[backend]
+
+
+def load_checkpoint(path: str, device: str = "cpu", mmap: bool = False) -> MahjongCNN:
+    """
+    Load a ``.pth`` checkpoint into an eval-mode ``MahjongCNN``.
+    :param path: The ``.pth`` checkpoint path.
+    :param device: Torch device.
+    :param mmap: Memory-map the weights instead of reading them, so processes loading the same
+        checkpoint share its pages.
+    :return: The model, with gradients disabled.
+    :rtype: MahjongCNN
+    """
+    model = MahjongCNN().to(device)
+    state_dict = torch.load(path, map_location=device, mmap=mmap, weights_only=True)
+    # assign keeps the memory-mapped tensors instead of copying them into the model
+    model.load_state_dict(state_dict, assign=mmap)
+    model.requires_grad_(False)
+    model.eval()
+    return model
+
+
+def build_torchscript(path: str, device: str = "cpu") -> torch.jit.ScriptModule:
+    """
+    Fold, trace and freeze a checkpoint.
+    The frozen module is what gets saved, ``optimize_for_inference`` is applied after loading
+    since its device-specific rewrites can not be serialized.
+    """
+    fused = fuse_for_inference(load_checkpoint(path, device))
+    example = torch.zeros(1, 86, 34, 4, device=device)
+    with torch.no_grad():
+        traced = torch.jit.trace(fused, example)
+    return torch.jit.freeze(traced.eval())
+
+
+class QuantizedMahjongCNN(nn.Module):
+    """
+    Int8 variant of ``MahjongCNN``: the conv blocks (BatchNorm folded, fused with their ReLU) are
+    statically quantised and ``fc`` is a dynamically quantised Linear layer with per-channel weights.
+    The heads hold 2% of the Linear weights but flip decisions when quantised, they stay float.
+    """
+
+    def __init__(self, model: MahjongCNN):
+        super().__init__()
+        fused = fuse_for_inference(model)
+        self.quant = quantization.QuantStub()
+        self.convs = nn.Sequential(
+            fused.conv1, nn.ReLU(), fused.conv2, nn.ReLU(), fused.conv3, nn.ReLU()
+        )
+        self.dequant = quantization.DeQuantStub()
+        self.fc = fused.fc
+        self.head_discard = fused.head_discard
+        self.head_chi = fused.head_chi
+        self.head_pon = fused.head_pon
+        self.head_riichi = fused.head_riichi
+
+    def forward(self, x):
+        x = self.dequant(self.convs(self.quant(x)))
+        x = torch.relu(self.fc(x.reshape(x.size(0), -1)))
+        return (
+            self.head_discard(x),
+            self.head_chi(x),
+            self.head_pon(x),
+            self.head_riichi(x),
+        )
+
+
+@lru_cache(maxsize=2)
+def record_states(count: int, seed: int = 0) -> np.ndarray:
+    """
+    Play headless hanchan with shanten bots and encode the state of every decision, from the
+    deciding seat's POV. Used to calibrate and check the int8 models.
+    The states are recorded once per process, every checkpoint is calibrated on the same ones.
+    :param count: Number of states to record.
+    :param seed: Seed of the tables.
+    :return: The encoded states (count,86,34,4), shared by the callers.
+    :rtype: np.ndarray
+    """
+    from components.entities.ai.encoder import Encoder
+    from components.round_engine import Hanchan, ShantenPolicy
+
+    encoder = Encoder()
+    history_planes = encoder.encode_history_block([])
+    states: list[np.ndarray] = []
+
+    class RecordingPolicy(ShantenPolicy):
+        def make_move(self, engine, seat):
+            states.append(
+                encoder.encode_engine_batch([(engine, seat, history_planes[seat])])[0]
+            )
+            return super().make_move(engine, seat)
+
+    rng = random.Random(seed)
+    while len(states) < count:
+        Hanchan([RecordingPolicy() for _ in range(4)], rng=rng).play()
+    return np.stack(states[:count])
+
+
+def quantize_model(path: str, calibration: Optional[np.ndarray] = None) -> nn.Module:
+    """
+    Build the int8 model of a checkpoint.
+    :param path: The ``.pth`` checkpoint path.
+    :param calibration: Encoded states to calibrate the conv activations, recorded when None.
+    :return: The quantised model, on CPU.
+    :rtype: QuantizedMahjongCNN
+    """
+    if calibration is None:
+        calibration = record_states(CALIBRATION_STATES)
+
+    model = QuantizedMahjongCNN(load_checkpoint(path)).eval()
+    quantization.fuse_modules(
+        model.convs, [["0", "1"], ["2", "3"], ["4", "5"]], inplace=True
+    )
+    qconfig = quantization.get_default_qconfig(torch.backends.quantized.engine)
+    model.quant.qconfig = qconfig
+    model.convs.qconfig = qconfig
+    model.dequant.qconfig = qconfig
+    quantization.prepare(model, inplace=True)
+    with torch.no_grad():
+        for i in range(0, len(calibration), 64):
+            model(torch.from_numpy(calibration[i : i + 64]))
+    quantization.convert(model, inplace=True)
+    return quantization.quantize_dynamic(
+        model, {"fc": quantization.per_channel_dynamic_qconfig}, dtype=torch.qint8
+    )
+
+
+def export_model(path: str, backend: Backend, out_path: str = None) -> str:
+    """
+    Export a checkpoint to a TorchScript, ONNX or int8 artifact with BatchNorm folded and dropout stripped.
+    :param path: The ``.pth`` checkpoint path.
+    :param backend: ``torchscript``, ``onnx`` or ``int8``.
+    :param out_path: Where to write the artifact, defaults to ``artifact_path``.
+    :return: The artifact path.
+    :rtype: str
+    """
+    if out_path is None:
+        out_path = artifact_path(path, backend)
+
+    match backend:
+        case "torchscript":
+            torch.jit.save(build_torchscript(path), out_path)
+        case "onnx":
+            fused = fuse_for_inference(load_checkpoint(path))
+            torch.onnx.export(
+                fused,
+                (torch.zeros(1, 86, 34, 4),),
+                out_path,
+                input_names=["x"],
+                output_names=HEAD_NAMES,
+                dynamic_axes={
+                    "x": {0: "batch"},
+                    **{name: {0: "batch"} for name in HEAD_NAMES},
+                },
+                dynamo=False,
+            )
+        case "int8":
+            model = quantize_model(path)
+            with torch.no_grad():
+                traced = torch.jit.trace(model, torch.zeros(1, 86, 34, 4))
+            torch.jit.save(traced, out_path)
+        case _:
+            raise ValueError(f"Can not export to backend {backend}")
+    return out_path
+
+
+class OnnxModel:
+    """
+    Run an exported ONNX model with onnxruntime on CPU, called like a ``MahjongCNN``.
+    """
+
+    def __init__(self, path: str):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend needs onnxruntime, install it with `pip install onnx onnxruntime`"
+            ) from e
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = (
+            onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        )
+        self.session = onnxruntime.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+
+    def __call__(self, x: torch.Tensor) -> tuple[torch.Tensor, ...]:
+        x = np.ascontiguousarray(x.cpu().numpy(), dtype=np.float32)
+        outputs = self.session.run(HEAD_NAMES, {"x": x})
+        return tuple(torch.from_numpy(output) for output in outputs)
+
+
+def export_once(path: str, backend: Backend) -> str:
+    """
+    Get the exported artifact of a checkpoint, exporting it first when missing.
+    :param path: The ``.pth`` checkpoint path.
+    :param backend: ``onnx`` or ``int8``.
+    :return: The artifact path.
+    :rtype: str
+    """
+    exported = artifact_path(path, backend)
+    if not os.path.exists(exported):
+        # Self-play workers may export at the same time, write aside then swap in
+        temp_path = f"{exported}.{os.getpid()}.tmp"
+        export_model(path, backend, temp_path)
+        os.replace(temp_path, exported)
+    return exported
+
+
+def load_model(
+    path: str, backend: Backend = "torch", device: str = "cpu", mmap: bool = False
+) -> Model:
+    """
+    Load a checkpoint for inference with the given backend.
+    TorchScript, ONNX and int8 use the artifact exported next to the checkpoint. TorchScript is built in memory
+    when it is missing, ONNX and int8 are exported once and reused by the later loads and processes.
+    :param path: The ``.pth`` checkpoint path.
+    :param backend: The inference backend.
+    :param device: Torch device (onnx and int8 always run on CPU).
+    :param mmap: Memory-map the weights of the ``torch`` backend.
+    :return: A callable mapping (B,86,34,4) to the (discard, chi, pon, riichi) logits.
+    """
+    match backend:
+        case "torch":
+            return load_checkpoint(path, device, mmap)
+        case "torchscript":
+            exported = artifact_path(path, "torchscript")
+            if os.path.exists(exported):
+                model = torch.jit.load(exported, map_location=device).eval()
+            else:
+                model = build_torchscript(path, device)
+            return torch.jit.optimize_for_inference(model)
+        case "onnx":
+            return OnnxModel(export_once(path, "onnx"))
+        case "int8":
+            # Calibrating plays hanchan, it is only done when the artifact is missing
+            return torch.jit.load(export_once(path, "int8")).eval()
+        case _:
+            raise ValueError(f"Unknown backend {backend}, expected one of {BACKENDS}")
+
+
+# Models loaded in this process, keyed by (checkpoint path, backend, device) and shared by every agent
+MODEL_REGISTRY: dict[tuple[str, str, str], Model] = {}
+
+
+def get_model(
+    path: str, backend: Backend = "torch", device: str = "cpu", mmap: bool = False
+) -> Model:
+    """
+    Get the shared model of a checkpoint, loading it on first use.
+    Models are only used for inference, so agents and game managers can share them.
+    :param path: The ``.pth`` checkpoint path.
+    :param backend: The inference backend.
+    :param device: Torch device.
+    :param mmap: Memory-map the weights when loading with the ``torch`` backend.
+    :return: The shared model.
+    """
+    key = (os.path.abspath(path), backend, device)
+    if key not in MODEL_REGISTRY:
+        MODEL_REGISTRY[key] = load_model(path, backend, device, mmap)
+    return MODEL_REGISTRY[key]
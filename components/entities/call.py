@@ -1,8 +1,9 @@
-from utils.enums import CallType, TileSource
+from utils.enums import CallType, TileSource, EventLevel, EventType
 from components.entities.buttons.tile import Tile
 import typing
 from mahjong.meld import Meld
 from utils.helper import map_call_type_to_meld_type
+from utils.event_bus import emit_event
 
 
 class Call:
@@ -32,10 +33,10 @@ class Call:
         self.is_opened = True
         match type:
             case CallType.RON:
-                print("INIT CALL FOR RON")
+                emit_event(EventType.CALL, EventLevel.DEBUG, "INIT CALL FOR RON")
                 pass
             case CallType.KAN:
-                print("INIT CALL FOR KAN")
+                emit_event(EventType.CALL, EventLevel.DEBUG, "INIT CALL FOR KAN")
                 if not self.__check_having_same_amount_of_tiles(tiles, 4):
                     raise ValueError(
                         f"Wrong Kan format! The tiles are {list(map(lambda tile: tile.__str__(), tiles))} which are not the correct for Kan"
@@ -53,7 +54,7 @@ class Call:
                     case 3:
                         tiles = self.__rearrange_list(tiles, len(tiles))
             case CallType.PON:
-                print("INIT CALL FOR PON")
+                emit_event(EventType.CALL, EventLevel.DEBUG, "INIT CALL FOR PON")
                 if not (
                     self.__check_having_another_player_tile(tiles)
                     and self.__check_having_same_amount_of_tiles(tiles, 3)
@@ -70,7 +71,7 @@ class Call:
                     case 3:
                         tiles = self.__rearrange_list(tiles, len(tiles))
             case CallType.CHII:
-                print("INIT CALL FOR CHII")
+                emit_event(EventType.CALL, EventLevel.DEBUG, "INIT CALL FOR CHII")
                 if not (
                     self.__check_consecutive_numbers(tiles)
                     and self.__check_having_another_player_tile(tiles)
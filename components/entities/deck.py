@@ -6,7 +6,8 @@ from components.entities.call import Call
 from utils.helper import (
     parse_string_tile,
     split_every_n_chars,
-    find_suitable_tile_in_list,
+    build_tile_kind_index,
+    pop_suitable_tile_from_index,
     convert_tiles_list_to_hand34,
 )
 from shared.random_seed import generate_random_seed
@@ -84,87 +85,39 @@ class Deck:
         # Get dices score
         dices_score = sum(self.dices)
 
-        # Reading from data
+        # Reading from data, every tile is looked up by its hand136 index
         if data:
-            for tile in data["full_deck"]:
-                for tmp_tile in new_deck:
-                    if tmp_tile.hand136_idx == tile["hand136_idx"]:
-                        self.full_deck.append(tmp_tile)
-                        break
-
-            for tile in data["death_wall"]:
-                for tmp_tile in new_deck:
-                    if tmp_tile.hand136_idx == tile["hand136_idx"]:
-                        self.death_wall.append(tmp_tile)
-                        break
-
-            for tile in data["dora"]:
-                for tmp_tile in new_deck:
-                    if tmp_tile.hand136_idx == tile["hand136_idx"]:
-                        self.dora.append(tmp_tile)
-                        break
-
-            for tile in data["draw_deck"]:
-                for tmp_tile in new_deck:
-                    if tmp_tile.hand136_idx == tile["hand136_idx"]:
-                        self.draw_deck.append(tmp_tile)
-                        break
+            tiles = self.__init_deck
+            self.full_deck = [tiles[tile["hand136_idx"]] for tile in data["full_deck"]]
+            self.death_wall = [tiles[tile["hand136_idx"]] for tile in data["death_wall"]]
+            self.dora = [tiles[tile["hand136_idx"]] for tile in data["dora"]]
+            self.draw_deck = [tiles[tile["hand136_idx"]] for tile in data["draw_deck"]]
 
             for hands in data["hands"]:
                 init_hand = []
 
                 for tile_data in hands:
-                    for tmp_tile in new_deck:
-                        if tmp_tile.hand136_idx == tile_data["hand136_idx"]:
-                            if tile_data["from_death_wall"]:
-                                tmp_tile.from_death_wall = True
-                            if tile_data["is_disabled"]:
-                                tmp_tile.is_disabled = True
-                            init_hand.append(tmp_tile)
-                            break
+                    tmp_tile = tiles[tile_data["hand136_idx"]]
+                    if tile_data["from_death_wall"]:
+                        tmp_tile.from_death_wall = True
+                    if tile_data["is_disabled"]:
+                        tmp_tile.is_disabled = True
+                    init_hand.append(tmp_tile)
 
                 self.player_deck.append(init_hand)
 
             for discards in data["already_discards"]:
-                init_discard = []
-
-                for tile_data in discards:
-                    for tmp_tile in new_deck:
-                        if tmp_tile.hand136_idx == tile_data["hand136_idx"]:
-                            if tile_data["from_death_wall"]:
-                                tmp_tile.from_death_wall = True
-                            if tile_data["riichi_discard"]:
-                                tmp_tile.discard_riichi()
-                            init_discard.append(tmp_tile)
-                            break
-
-                self.already_discard_tiles.append(init_discard)
+                self.already_discard_tiles.append(self.__load_discards(discards))
 
             for discards in data["discards"]:
-                init_discard = []
-
-                for tile_data in discards:
-                    for tmp_tile in new_deck:
-                        if tmp_tile.hand136_idx == tile_data["hand136_idx"]:
-                            if tile_data["from_death_wall"]:
-                                tmp_tile.from_death_wall = True
-                            if tile_data["riichi_discard"]:
-                                tmp_tile.discard_riichi()
-                            init_discard.append(tmp_tile)
-                            break
-
-                self.discard_tiles.append(init_discard)
+                self.discard_tiles.append(self.__load_discards(discards))
 
             for melds in data["melds"]:
                 init_melds = []
                 for meld_data in melds:
                     call_tiles: list[Tile] = []
                     for idx, tile_data in enumerate(meld_data["tiles"]):
-                        suitable_tile = None
-                        for each_tile in self.full_deck:
-                            if each_tile.hand136_idx == tile_data["hand136_idx"]:
-                                suitable_tile = each_tile
-                                break
+                        suitable_tile = tiles[tile_data["hand136_idx"]]
 
                         if tile_data["from_death_wall"]:
                             suitable_tile.from_death_wall = True
@@ -187,55 +140,61 @@ class Deck:
                 self.call_list.append(init_melds)
 
             for hand136_idx in data["latest_draw_tile_hand136_idx"]:
-                for tile in self.full_deck:
-                    if tile.hand136_idx == hand136_idx:
-                        self.latest_draw_tile.append(tile)
-                        break
+                if hand136_idx is not None:
+                    self.latest_draw_tile.append(tiles[hand136_idx])
 
             for tiles_list in data["callable_tiles_list"]:
                 callable_list: list[list[Tile]] = []
-                for call_list_hand136_idx in tiles_list:
-                    tmp_list: list[Tile] = []
-                    for tile_hand136_idx in call_list_hand136_idx:
-                        if tile.hand136_idx == tile_hand136_idx:
-                            tmp_list.append(tile)
-                            break
-                    callable_list.append(tmp_list)
+                for call_list_tiles in tiles_list:
+                    # Tile data from GameManager, hand136 indices from older data
+                    callable_list.append(
+                        [
+                            tiles[
+                                tile["hand136_idx"] if isinstance(tile, dict) else tile
+                            ]
+                            for tile in call_list_tiles
+                        ]
+                    )
                 self.callable_tiles_list.append(callable_list)
-            for each_tile in self.full_deck:
-                if each_tile.hand136_idx == data["latest_discard_tile_hand136_idx"]:
-                    self.latest_discard_tile = each_tile
-                    break
+            if data["latest_discard_tile_hand136_idx"] is not None:
+                self.latest_discard_tile = tiles[data["latest_discard_tile_hand136_idx"]]
             return
 
         # Generating a new deck
         cutting_points = 34 * ((dices_score - 1) % 4 + 1) - 2 * dices_score
 
+        # Tiles of each kind left in new_deck, in wall order
+        kind_index = build_tile_kind_index(new_deck)
+        taken = 0 # Bitset of the hand136 indices taken out of new_deck
+
         if start_data and start_data["draw_deck"]:
             for tile in split_every_n_chars(start_data["draw_deck"], 2):
                 tile_type, tile_number, tile_aka = parse_string_tile(tile)
-                suitable_tile = find_suitable_tile_in_list(
-                    tile_number, tile_type, tile_aka, new_deck
+                suitable_tile = pop_suitable_tile_from_index(
+                    tile_number, tile_type, tile_aka, kind_index
                 )
                 self.draw_deck.append(suitable_tile)
-                new_deck.remove(suitable_tile)
+                taken |= 1 << suitable_tile.hand136_idx
 
         if start_data and start_data["death_wall"]:
             for tile in split_every_n_chars(start_data["death_wall"], 2):
                 tile_type, tile_number, tile_aka = parse_string_tile(tile)
-                suitable_tile = find_suitable_tile_in_list(
-                    tile_number, tile_type, tile_aka, new_deck
+                suitable_tile = pop_suitable_tile_from_index(
+                    tile_number, tile_type, tile_aka, kind_index
                 )
                 suitable_tile.from_death_wall = True
                 self.death_wall.append(suitable_tile)
-                new_deck.remove(suitable_tile)
+                taken |= 1 << suitable_tile.hand136_idx
+
+        if taken:
+            new_deck = [tile for tile in new_deck if not taken >> tile.hand136_idx & 1]
 
         if len(self.draw_deck) > 0 and len(self.death_wall) > 0:
             for tile in self.draw_deck + self.death_wall:
                 self.full_deck.append(tile)
-            for tile in new_deck:
-                self.full_deck.append(tile)
-                self.draw_deck.insert(0, tile)
+            self.full_deck += new_deck
+            # Each remaining tile goes in front of the draw deck
+            self.draw_deck = new_deck[::-1] + self.draw_deck
 
         else:
             self.full_deck = new_deck[cutting_points:] + new_deck[0:cutting_points]
@@ -244,14 +203,36 @@ class Deck:
             for tile in self.death_wall:
                 tile.from_death_wall = True
 
-        if not all(
-            [
-                tile_count == 4
-                for tile_count in convert_tiles_list_to_hand34(self.full_deck)
-            ]
-        ) and len(convert_tiles_list_to_hand34(self.full_deck) == 34):
+        if any(
+            tile_count != 4
+            for tile_count in convert_tiles_list_to_hand34(self.full_deck)
+        ):
             raise ValueError("Some tiles are missing!")
 
+    def __load_discards(self, discards: list[dict]) -> list[Tile]:
+        """
+        Look up the discarded tiles of a player from their history data.
+        :param discards: Tile data of the discards.
+        :return: The discarded Tile objects.
+        """
+        init_discard = []
+        for tile_data in discards:
+            tmp_tile = self.__init_deck[tile_data["hand136_idx"]]
+            if tile_data["from_death_wall"]:
+                tmp_tile.from_death_wall = True
+            if tile_data["riichi_discard"]:
+                tmp_tile.discard_riichi()
+            init_discard.append(tmp_tile)
+        return init_discard
+
+    def get_tile(self, hand136_idx: int) -> Tile:
+        """
+        Get the tile of a hand136 index.
+        :param hand136_idx: The hand136 index of the tile.
+        :return: The Tile object, shared by every deck built from this one.
+        """
+        return self.__init_deck[hand136_idx]
+
     def add_new_dora(self):
         self.dora.append(self.death_wall[self.current_dora_idx])
 
@@ -261,7 +242,7 @@ class Deck:
     def __init_full_deck() -> list[Tile]:
         """
         Initialize full deck of 136 tiles by generating each tile. This includes loading up images for the tiles.
-        :return: List of Tile objects representing the full deck.
+        :return: List of Tile objects representing the full deck, indexed by hand136 index.
         """
         import math
 
@@ -330,13 +311,11 @@ class Deck:
         tenhou = result[0][0]
         self.dices = result[0][1]
 
+        is_debug = len(sys.argv) > 1 and "debug" in sys.argv
         for i in tenhou:
-            tile = list(filter(lambda tile: tile.hand136_idx == i, self.__init_deck))[0]
+            tile = self.__init_deck[i]
             tile.reset()
-            if len(sys.argv) > 1 and "debug" in sys.argv:
-                tile.hidden = False
-            else:
-                tile.hidden = True
+            tile.hidden = not is_debug
             full_deck.append(tile)
 
         return full_deck
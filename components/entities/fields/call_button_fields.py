@@ -3,7 +3,8 @@ from pygame import Surface, Rect
 import pygame
 import random
 from utils.constants import CALL_BUTTON_SIZE, COLOR_BLACK
-from utils.enums import CallType, ActionType
+from utils.enums import CallType, ActionType, EventLevel, EventType
+from utils.event_bus import emit_event
 from utils.helper import build_center_rect, draw_hitbox
 
 # All call buttons
@@ -294,7 +295,12 @@ class CallButtonField(Field):
 
         for button in self.render_button_list:
             if button.check_collidepoint(local_mouse):
-                print(f"CLICKING BUTTON {button.text.upper()}")
+                emit_event(
+                    EventType.UI,
+                    EventLevel.DEBUG,
+                    "CLICKING BUTTON {button}",
+                    button=button.text.upper(),
+                )
                 if isinstance(button, Chii):
                     game_manager.action = player.make_move(ActionType.CHII)
                 elif isinstance(button, Skip):
@@ -5,21 +5,21 @@ from pygame import Surface
 import sys
 import typing
 from typing import Optional
-from utils.enums import Direction
+from utils.enums import Direction, EventLevel, EventType
 from components.entities.fields.discard_field import DiscardField
 from components.entities.fields.deck_field import DeckField
 from components.entities.fields.call_field import CallField
-from utils.helper import (
-    map_call_to_action,
-    convert_tile_to_hand34_index,
-    convert_tiles_list_to_hand34,
-    count_shanten_points,
-)
+from utils.helper import map_call_to_action
 from utils.constants import HAND_CONFIG_OPTIONS
-from mahjong.hand_calculating.hand import HandCalculator
+from utils.round_rules import closed_waits, is_kyuushu_kyuuhai
+from utils.shanten_service import calculate_shanten
+from utils.ukeire import rank_discards
+from utils.call_index import CallIndex, build_call_index
+from utils.hand_value_service import estimate_hand_value
+from utils.event_bus import emit_event
 from mahjong.hand_calculating.hand_config import HandConfig
+from mahjong.hand_calculating.hand_response import HandResponse
 from mahjong.meld import Meld
-from mahjong.shanten import Shanten
 
 if typing.TYPE_CHECKING:
     from components.game_scenes.game_manager import GameManager
@@ -29,6 +29,8 @@ class Player:
     game_manager: "GameManager | None"
     player_idx: int
     player_deck: list[Tile]
+    hand34: list[int]  # Count of each tile kind in player_deck
+    hand136: int  # Bitset of the hand136 indices in player_deck
     discard_tiles: list[Tile]
     call_list: list[Call]
     direction: Direction
@@ -82,10 +84,19 @@ class Player:
         self.__initial_direction = direction
         # Tile deck field init
         self.player_deck = player_deck if player_deck is not None else []
+        self.hand34 = [0] * 34
+        self.hand136 = 0
+        self.__hand_version = 0
+        for tile in self.player_deck:
+            self.hand34[tile.hand34_idx] += 1
+            self.hand136 |= 1 << tile.hand136_idx
         self.discard_tiles = discard_tiles if discard_tiles is not None else []
         self.__already_discard_tiles: list[Tile] = (
             already_discard_tiles if already_discard_tiles is not None else []
         )
+        self.__already_discard_kinds = set(
+            map(lambda tile: tile.hand34_idx, self.__already_discard_tiles)
+        )
         self.call_tiles_list = call_tiles_list if call_tiles_list is not None else []
         self.call_list = call_list if call_list is not None else []
 
@@ -113,7 +124,9 @@ class Player:
         self.melds = []
 
         # Game properties
-        self.__winning_tiles = []
+        self.__winning_tiles = ()
+        self.__call_index: CallIndex | None = None
+        self.__call_index_version = -1
 
         # Player information
         self.points = points if points is not None else 25000
@@ -127,11 +140,7 @@ class Player:
         self.__is_riichi = is_riichi
         if is_riichi:
             self.__riichi_turn = riichi_turn
-            for tile in self.deck_field.get_tiles_list():
-                copy_deck = self.deck_field.get_tiles_list().copy()
-                copy_deck.remove(tile)
-                if count_shanten_points(copy_deck) > 0:
-                    tile.disabled()
+            self.__disable_non_tenpai_discards()
 
     def draw(
         self,
@@ -156,7 +165,7 @@ class Player:
             self.__draw_tile = draw_deck.pop()
 
         self.__draw_tile.source = TileSource.DRAW
-        self.player_deck.append(self.__draw_tile)
+        self.__add_to_hand(self.__draw_tile)
         self.__draw_tile.update_tile_surface(self.player_idx)
         if check_call: # To check for tsumo/ankan/riichi
             self.check_call(
@@ -174,16 +183,19 @@ class Player:
         """
         self.callable_tiles_list = []
 
-        first_tile = self.find_tile(tile.type, tile.number - 2)
-        second_tile = self.find_tile(tile.type, tile.number - 1)
-        third_tile = self.find_tile(tile.type, tile.number + 1)
-        fourth_tile = self.find_tile(tile.type, tile.number + 2)
-        if first_tile and second_tile:
-            self.callable_tiles_list.append([first_tile, second_tile, tile])
-        if second_tile and third_tile:
-            self.callable_tiles_list.append([second_tile, tile, third_tile])
-        if third_tile and fourth_tile:
-            self.callable_tiles_list.append([tile, third_tile, fourth_tile])
+        # First tile of each kind in the hand, the one ``find_tile`` gives
+        first_tiles: dict[int, Tile] = {}
+        for hand_tile in self.player_deck:
+            first_tiles.setdefault(hand_tile.hand34_idx, hand_tile)
+
+        patterns = self.__build_call_index().chii_patterns.get(tile.hand34_idx, ())
+        for first_kind, second_kind in patterns:
+            self.callable_tiles_list.append(
+                sorted(
+                    [first_tiles[first_kind], first_tiles[second_kind], tile],
+                    key=lambda call_tile: call_tile.hand34_idx,
+                )
+            )
 
     def build_pon(self, tile: Tile) -> None:
         """
@@ -282,41 +294,34 @@ class Player:
         if player and not is_kakan:
             tile.source = TileSource.PLAYER
 
-        print(
-            f"Player {self.player_idx} call: {call_type} for {list(map(lambda call_tile: call_tile.__str__(True),call_list))}"
+        emit_event(
+            EventType.CALL,
+            EventLevel.INFO,
+            "Player {player} call: {call_type} for {tiles}",
+            player=self.player_idx,
+            call_type=call_type,
+            tiles=call_list,
         )
         if player and not is_kakan:
             tile.undiscard_riichi()
             player.discard_tiles.remove(tile)
-            self.player_deck.append(tile)
-
-        # Check kuikae
+            self.__add_to_hand(tile)
+
+        # Check kuikae: the stolen tile looksalike, and the other end of the run it was called into
+        kuikae_tiles = {(tile.type, tile.number)}
+        tile_idx = call_list.index(tile) # Get index of stolen tile in call list
+        if tile_idx == 0:
+            kuikae_tiles.add((call_list[-1].type, call_list[-1].number + 1))
+        elif tile_idx == 2:
+            kuikae_tiles.add((call_list[0].type, call_list[0].number - 1))
         for hand_tile in self.player_deck:
-            tile_idx = call_list.index(tile) # Get index of stolen tile in call list
-            another_kuikae_tile = None # Find the other tile that affected by kuikae
-            if tile_idx == 0:
-                another_kuikae_tile = self.find_tile(
-                    call_list[-1].type, call_list[-1].number + 1
-                )
-            elif tile_idx == 1:
-                pass
-            elif tile_idx == 2:
-                another_kuikae_tile = self.find_tile(
-                    call_list[0].type, call_list[0].number - 1
-                )
-            if (
-                another_kuikae_tile
-                and hand_tile.type == another_kuikae_tile.type
-                and hand_tile.number == another_kuikae_tile.number
-            ):
-                hand_tile.disabled()
-            if hand_tile.type == tile.type and hand_tile.number == tile.number: # Disable stolen tile looksalike
+            if (hand_tile.type, hand_tile.number) in kuikae_tiles:
                 hand_tile.disabled()
 
         # Remove called tiles from player's hand
         for tmp_tile in call_list:
-            if tmp_tile in self.player_deck:
-                self.player_deck.remove(tmp_tile)
+            if self.in_hand(tmp_tile):
+                self.__remove_from_hand(tmp_tile)
                 tmp_tile.enabled()
 
         # Add call to call list
@@ -365,9 +370,10 @@ class Player:
         tile.reveal()
         tile.unclicked()
         tile.enabled()
-        self.player_deck.remove(tile)
+        self.__remove_from_hand(tile)
         self.discard_tiles.append(tile)
         self.__already_discard_tiles.append(tile)
+        self.__already_discard_kinds.add(tile.hand34_idx)
         game_manager.latest_discarded_tile = tile # For checking calls
         game_manager.start_discarded_animation(tile)
         self.turn += 1
@@ -375,6 +381,24 @@ class Player:
 
         return tile
 
+    def __add_to_hand(self, tile: Tile) -> None:
+        self.player_deck.append(tile)
+        self.hand34[tile.hand34_idx] += 1
+        self.hand136 |= 1 << tile.hand136_idx
+        self.__hand_version += 1
+
+    def __remove_from_hand(self, tile: Tile) -> None:
+        self.player_deck.remove(tile)
+        self.hand34[tile.hand34_idx] -= 1
+        self.hand136 &= ~(1 << tile.hand136_idx)
+        self.__hand_version += 1
+
+    def in_hand(self, tile: Tile) -> bool:
+        """
+        Check if the tile is in the player's hand, with the hand136 bitset.
+        """
+        return bool(self.hand136 >> tile.hand136_idx & 1)
+
     def rearrange_deck(self):
         self.player_deck.sort(key=lambda tile: (tile.type.value, tile.number))
 
@@ -419,31 +443,49 @@ class Player:
 
     def pick_tile(self) -> Tile:
         """
-        Brute-force pick a tile to discard that minimizes shanten points.
+        Pick the tile to discard with the lowest shanten, then the most unseen effective tiles (ukeire).
         :return: The Tile object to discard.
         """
-        import sys
+        scripted_tile = self.__scripted_discard()
+        if scripted_tile is not None:
+            return scripted_tile
 
-        minimum_shanten = 14
-        discard_tile = None
-        for tile in self.player_deck:
-            tmp_tiles_list = self.player_deck.copy()
-            tmp_tiles_list.remove(tile)
-            if minimum_shanten > count_shanten_points(tmp_tiles_list):
-                discard_tile = tile
-                minimum_shanten = count_shanten_points(tmp_tiles_list)
+        best_kind = rank_discards(self.hand34, self.visible_hand34())[0].kind
+        # Keep the aka dora when a plain copy of the kind can go
+        tiles = [tile for tile in self.player_deck if tile.hand34_idx == best_kind]
+        return min(tiles, key=lambda tile: tile.aka)
 
-        if (
-            len(sys.argv) > 1
-            and len(list(filter(lambda argv: "data=kaze4.json" in argv, sys.argv))) > 0
-        ):
-            tile = self.find_tile(TileType.WIND, 1)
+    def __scripted_discard(self) -> Tile | None:
+        """
+        Discards forced by the edge case data files (``data=<data_file.json>``).
+        :return: The scripted tile, None when playing normally.
+        """
+        data_files = [argv for argv in sys.argv[1:] if argv.startswith("data=")]
+        if len(data_files) == 0:
+            return None
+        if data_files[0] == "data=kaze4.json":
+            return self.find_tile(TileType.WIND, 1)
+        if self.player_idx == 1:
+            return self.find_tile(TileType.SOU, 9)
+        return None
 
-        elif self.player_idx == 1 and self.find_tile(TileType.SOU, 9):
-            tile = self.find_tile(TileType.SOU, 9)
-        else:
-            tile = discard_tile
-        return tile
+    def visible_hand34(self) -> list[int]:
+        """
+        Count the tiles this player sees outside their hand: every discard, every meld and the dora indicators.
+        :return: A 34-array of visible tile counts.
+        :rtype: list[int]
+        """
+        visible34 = [0] * 34
+        players = self.game_manager.player_list if self.game_manager else [self]
+        for player in players:
+            for tile in player.discard_tiles:
+                visible34[tile.hand34_idx] += 1
+            for tile in player.call_tiles_list:
+                visible34[tile.hand34_idx] += 1
+        if self.game_manager:
+            for tile in self.game_manager.deck.dora:
+                visible34[tile.hand34_idx] += 1
+        return visible34
 
     def get_draw_tile(self) -> Tile:
         """
@@ -479,6 +521,7 @@ class Player:
         is_current_turn: bool,
         round_wind: Direction,
         check_chii: bool = False,
+        can_kan: bool = True,
     ):
         """
         Checking for possible calls
@@ -486,12 +529,13 @@ class Player:
         :param is_current_turn: Whether it's the player's current turn.
         :param round_wind: The current round wind.
         :param check_chii: Whether to check for chii call.
+        :param can_kan: Whether the round still allows a kan (``round_rules.can_declare_kan``).
         :return: None
         """
-        print("----- Start checking call -----")
+        emit_event(EventType.CALL_CHECK, EventLevel.DEBUG, "----- Start checking call -----")
         self.can_call = []
 
-        self.__build_winning_tiles()
+        self.__build_call_index()
         if is_current_turn and self.is_tsumo_able(tile, round_wind): # Tsumo
             self.can_call.append(CallType.TSUMO)
 
@@ -499,10 +543,10 @@ class Player:
             self.can_call.append(CallType.RON)
 
         if not self.__is_riichi:
-            if self.is_riichi_able() and is_current_turn: # Riichi
+            if is_current_turn and self.is_riichi_able(): # Riichi
                 self.can_call.append(CallType.RIICHI)
 
-            if self.is_kan_able(tile): # Kan
+            if can_kan and self.is_kan_able(tile): # Kan
                 self.can_call.append(CallType.KAN)
 
             if self.is_pon_able(tile): # Pon
@@ -514,63 +558,52 @@ class Player:
         if len(self.can_call) > 0:
             self.can_call.append(CallType.SKIP)
 
-        print(f"Player {self.player_idx} calling: {self.can_call}")
-        print("----- Done checking call -----")
+        emit_event(
+            EventType.CALL_CHECK,
+            EventLevel.DEBUG,
+            "Player {player} calling: {can_call}",
+            player=self.player_idx,
+            can_call=self.can_call,
+        )
+        emit_event(EventType.CALL_CHECK, EventLevel.DEBUG, "----- Done checking call -----")
 
-    def check_yao9(self) -> bool:
+    def check_yao9(self, interrupted: bool = False) -> bool:
         """
-        Check if the player has at least 9 different terminal and honor tiles.
-        :return: True if the player has at least 9 different terminal and honor tiles, False otherwise.
+        Check if the player can declare kyuushu kyuuhai: at least 9 different terminal and honor tiles
+        on the first draw, not declined yet.
+        :param interrupted: Whether any player called since the start of the round.
+        :return: True if the player can declare kyuushu kyuuhai, False otherwise.
         :rtype: bool
         """
-        tile_yao9_list: list[Tile] = []
-
-        for tile in self.player_deck:
-            if (
-                tile.type in [TileType.MAN, TileType.SOU, TileType.PIN]
-                and (tile.number == 1 or tile.number == 9)
-            ) or tile.type in [TileType.DRAGON, TileType.WIND]:
-                already_have_yao9_tile = False
-                for yao9_tile in tile_yao9_list:
-                    if yao9_tile.number == tile.number and yao9_tile.type == tile.type:
-                        already_have_yao9_tile = True
-                        break
-
-                if not already_have_yao9_tile:
-                    tile_yao9_list.append(tile)
-
-        if len(tile_yao9_list) >= 9 and not self.__skip_yao9:
-            return True
-        else:
-            return False
+        return is_kyuushu_kyuuhai(self.hand34, self.turn, self.__skip_yao9, interrupted)
 
     def skip_yao9(self):
         self.__skip_yao9 = True
 
-    def __build_winning_tiles(self) -> None:
+    def __build_call_index(self) -> CallIndex:
         """
-        Build the list of winning tiles for the current hand by brute-forcing every possible tile.
-        :return: None
+        Build the call index and the winning tiles of the concealed hand, only once per hand change:
+        the opponents of a discarder check every discard with the same hand.
+        :return: The call index of the current hand.
+        :rtype: CallIndex
         """
-        self.__winning_tiles = []
-        shanten_calculator = Shanten()
-        before_draw_player_deck = self.player_deck.copy()
-
-        if self.get_draw_tile() in before_draw_player_deck:
-            before_draw_player_deck.remove(self.get_draw_tile())
-        hand_34 = convert_tiles_list_to_hand34(before_draw_player_deck)
-
-        # If current hand is not Tenpai (0 shanten), Furiten concept doesn't apply yet
-        if shanten_calculator.calculate_shanten(hand_34) != 0:
-            return
+        if self.__call_index_version == self.__hand_version:
+            return self.__call_index
+
+        # Waits are those of the 13-tile part: only strip the draw before the discard,
+        # after it the draw tile may still be in the hand
+        draw_tile = self.get_draw_tile()
+        draw_kind = (
+            draw_tile.hand34_idx
+            if draw_tile is not None and self.in_hand(draw_tile)
+            else None
+        )
 
-        # Check every possible tile to see if it makes the hand complete (-1 shanten)
-        for i in range(34):
-            # Add tile 'i' temporarily
-            hand_34[i] += 1
-            if shanten_calculator.calculate_shanten(hand_34) == -1:
-                self.__winning_tiles.append(i)
-            hand_34[i] -= 1  # Remove it
+        # Empty if current hand is not Tenpai (0 shanten), Furiten concept doesn't apply yet
+        self.__winning_tiles = closed_waits(self.hand34, draw_kind)
+        self.__call_index = build_call_index(self.hand34)
+        self.__call_index_version = self.__hand_version
+        return self.__call_index
 
     def reset_call(self):
         """
@@ -580,32 +613,12 @@ class Player:
         self.can_call = []
 
     def is_chii_able(self, tile: Tile) -> bool:
-        if tile.type == TileType.DRAGON or tile.type == TileType.WIND:
-            return False
-
-        # Case 1: n - 1, n, n + 1
-        if self.find_tile(tile.type, tile.number - 1) and self.find_tile(
-            tile.type, tile.number + 1
-        ):
-            return True
-
-        # Case 2: n - 2, n - 1, n
-        if self.find_tile(tile.type, tile.number - 2) and self.find_tile(
-            tile.type, tile.number - 1
-        ):
-            return True
-
-        # Case 3: n, n + 1, n + 2
-        if self.find_tile(tile.type, tile.number + 1) and self.find_tile(
-            tile.type, tile.number + 2
-        ):
-            return True
-
-        return False
+        # Honors have no chii pattern
+        return tile.hand34_idx in self.__build_call_index().chii_patterns
 
     def is_pon_able(self, tile: Tile) -> bool:
         return (
-            convert_tiles_list_to_hand34(self.player_deck)[tile.hand34_idx] >= 2
+            tile.hand34_idx in self.__build_call_index().pon_kinds
             and tile != self.get_draw_tile()
         )
 
@@ -622,100 +635,158 @@ class Player:
                 )
             ): # Kakan from Pon
                 return True
-        if tile in self.player_deck:
+        if self.in_hand(tile):
             # Ankan
-            return convert_tiles_list_to_hand34(self.player_deck)[tile.hand34_idx] == 4
+            return self.hand34[tile.hand34_idx] == 4
         else:
             # Minkan
-            return convert_tiles_list_to_hand34(self.player_deck)[tile.hand34_idx] == 3
+            return tile.hand34_idx in self.__build_call_index().minkan_kinds
 
     def is_ron_able(self, tile: Tile, round_wind: Direction) -> bool:
         # Check for temporary furiten
         if self.temporary_furiten:
-            print(
-                f"Player {self.player_idx} is not winning with ron because temporary furiten!!"
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with ron because temporary furiten!!",
+                player=self.player_idx,
             )
             return False
 
         # Check for riichi furiten
         if self.riichi_furiten:
-            print(
-                f"Player {self.player_idx} is not winning with ron because riichi furiten!!"
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with ron because riichi furiten!!",
+                player=self.player_idx,
             )
             return False
 
-        # Check for discard furiten
-        for discard_tile in self.__already_discard_tiles:
-            # Need to check for all already discarded tiles
-            if convert_tile_to_hand34_index(discard_tile) in self.__winning_tiles:
-                print(
-                    f"Player {self.player_idx} is not winning with ron because discard furiten: {self.__winning_tiles} is in {self.__already_discard_tiles}"
-                )
-                self.discard_furiten = True
-                return False
-            else:
-                self.discard_furiten = False
-
-        calculator = HandCalculator()
-
-        config = HandConfig(
-            is_tsumo=False,
-            is_riichi=self.__is_riichi,
-            round_wind=round_wind.value + 27,
-            player_wind=self.direction.value + 27,
-            options=HAND_CONFIG_OPTIONS,
-        )
+        # Check for discard furiten, against the kinds of all already discarded tiles
+        if not self.__already_discard_kinds.isdisjoint(self.__winning_tiles):
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with ron because discard furiten: {winning_tiles} is in {discards}",
+                player=self.player_idx,
+                winning_tiles=self.__winning_tiles,
+                discards=self.__already_discard_tiles,
+            )
+            self.discard_furiten = True
+            return False
+        elif len(self.__already_discard_tiles) > 0:
+            self.discard_furiten = False
+
+        # Only a winning tile can complete the hand, skip the estimation otherwise
+        if tile.hand34_idx not in self.__winning_tiles:
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with ron because {tile} is not a winning tile",
+                player=self.player_idx,
+                tile=tile,
+            )
+            return False
 
         copy_player_deck = self.player_deck.copy()
         copy_player_deck.append(tile)
-        hands = copy_player_deck + self.call_tiles_list
-
-        result = calculator.estimate_hand_value(
-            list(map(lambda tile: tile.hand136_idx, hands)),
-            win_tile=tile.hand136_idx,
-            melds=self.melds,
-            config=config,
-        )
+        result = self.__estimate_win(tile, copy_player_deck, False, round_wind)
 
         if not result.error:
-            print(f"Player {self.player_idx} is winning: {result} with {result.yaku}")
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.INFO,
+                "Player {player} is winning: {result} with {yaku}",
+                player=self.player_idx,
+                result=result,
+                yaku=result.yaku,
+            )
             return True
         else:
-            print(
-                f"Player {self.player_idx} is not winning with ron because {result.error}"
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with ron because {error}",
+                player=self.player_idx,
+                error=result.error,
             )
             return False
 
     def is_tsumo_able(self, tile: Tile, round_wind: Direction) -> bool:
-        calculator = HandCalculator()
+        draw_tile = self.get_draw_tile()
+        # Only a winning tile can complete the hand, skip the estimation otherwise
+        if draw_tile.hand34_idx not in self.__winning_tiles:
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with tsumo because {tile} is not a winning tile",
+                player=self.player_idx,
+                tile=draw_tile,
+            )
+            return False
 
+        result = self.__estimate_win(draw_tile, self.player_deck, True, round_wind)
+
+        if not result.error:
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.INFO,
+                "Player {player} is winning: {result} with {yaku}",
+                player=self.player_idx,
+                result=result,
+                yaku=result.yaku,
+            )
+            return True
+        else:
+            emit_event(
+                EventType.WIN_CHECK,
+                EventLevel.DEBUG,
+                "Player {player} is not winning with tsumo because: {error}",
+                player=self.player_idx,
+                error=result.error,
+            )
+            return False
+
+    def __estimate_win(
+        self, win_tile: Tile, hand: list[Tile], is_tsumo: bool, round_wind: Direction
+    ) -> HandResponse:
+        """
+        Estimate a win with the shared hand value cache. Dora and table counters are passed like
+        ``GameBuilder.calculate_player_score`` does, so the response is reused when scoring the win.
+        :param win_tile: The winning tile.
+        :param hand: The concealed tiles, win tile included.
+        :param is_tsumo: Whether the tile was drawn.
+        :param round_wind: The current round wind.
+        :return: The hand response, with ``error`` set when the hand does not win.
+        :rtype: HandResponse
+        """
+        game_manager = self.game_manager
         config = HandConfig(
-            is_tsumo=True,
+            is_tsumo=is_tsumo,
             is_riichi=self.__is_riichi,
             round_wind=round_wind.value + 27,
             player_wind=self.direction.value + 27,
+            tsumi_number=game_manager.tsumi_number if game_manager else 0,
+            kyoutaku_number=game_manager.kyoutaku_number if game_manager else 0,
             options=HAND_CONFIG_OPTIONS,
         )
-        hands = self.player_deck + self.call_tiles_list
-        result = calculator.estimate_hand_value(
+        hands = hand + self.call_tiles_list
+        return estimate_hand_value(
             list(map(lambda tile: tile.hand136_idx, hands)),
-            win_tile=self.get_draw_tile().hand136_idx,
-            melds=self.melds,
-            config=config,
+            win_tile.hand136_idx,
+            self.melds,
+            (
+                list(map(lambda tile: tile.hand136_idx, game_manager.deck.dora))
+                if game_manager
+                else None
+            ),
+            config,
         )
 
-        if not result.error:
-            print(f"Player {self.player_idx} is winning: {result} with {result.yaku}")
-            return True
-        else:
-            print(
-                f"Player {self.player_idx} is not winning with tsumo because: {result.error}"
-            )
-            return False
-
     def is_riichi_able(self) -> bool:
         if (
-            count_shanten_points(self.player_deck) == 0
+            calculate_shanten(self.hand34) == 0
             and (
                 len(self.call_list) == 0
                 or (
@@ -734,11 +805,19 @@ class Player:
         self.__is_riichi = True
         self.__riichi_turn = self.turn
         self.points -= 1000
-        for tile in self.deck_field.get_tiles_list():
-            copy_deck = self.deck_field.get_tiles_list().copy()
-            copy_deck.remove(tile)
-            if count_shanten_points(copy_deck) > 0:
+        self.__disable_non_tenpai_discards()
+
+    def __disable_non_tenpai_discards(self) -> None:
+        """
+        Disable the tiles whose discard would break tenpai, once riichi.
+        :return: None
+        """
+        hand_34 = self.hand34.copy()
+        for tile in self.player_deck:
+            hand_34[tile.hand34_idx] -= 1
+            if calculate_shanten(hand_34) > 0:
                 tile.disabled()
+            hand_34[tile.hand34_idx] += 1
 
     def is_riichi(self) -> int:
         """
@@ -757,8 +836,12 @@ class Player:
 
         # Tile deck field init
         self.player_deck = []
+        self.hand34 = [0] * 34
+        self.hand136 = 0
+        self.__hand_version += 1
         self.discard_tiles = []
         self.__already_discard_tiles: list[Tile] = []
+        self.__already_discard_kinds: set[int] = set()
         self.call_tiles_list = []
         self.call_list: list[Call] = []
 
@@ -782,7 +865,7 @@ class Player:
         )
 
         # Game properties
-        self.__winning_tiles = []
+        self.__winning_tiles = ()
         self.__is_riichi = False
         self.__riichi_turn: int = None
 
@@ -839,7 +922,15 @@ class Player:
             len(sys.argv) > 1
             and len(list(filter(lambda argv: "data=nm.json" in argv, sys.argv))) > 0
         ):
-            print("Nagashi Mangan activated: Skipping call.")
+            emit_event(
+                EventType.AI_DECISION,
+                EventLevel.DEBUG,
+                "Nagashi Mangan activated: Skipping call.",
+            )
             return ActionType.SKIP
-        print("Nagashi Mangan not activated. Proceeding with base action.")
+        emit_event(
+            EventType.AI_DECISION,
+            EventLevel.DEBUG,
+            "Nagashi Mangan not activated. Proceeding with base action.",
+        )
         return base_action
\ No newline at end of file
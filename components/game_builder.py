@@ -1,6 +1,7 @@
 from components.entities.buttons.tile import Tile
 from pygame import Surface
-from utils.enums import TileType, ActionType, Direction, CallType
+from utils.enums import TileType, ActionType, Direction, CallType, EventLevel, EventType
+from utils.event_bus import emit_event
 from components.entities.player import Player
 from components.entities.deck import Deck
 from utils.helper import (
@@ -10,7 +11,7 @@ from typing import Any
 import typing
 from components.entities.fields.center_board_field import CenterBoardField
 from utils.constants import HAND_CONFIG_OPTIONS
-from mahjong.hand_calculating.hand import HandCalculator
+from utils.hand_value_service import estimate_hand_value
 from mahjong.hand_calculating.hand_config import HandConfig
 from mahjong.hand_calculating.hand_response import HandResponse
 from components.entities.call import Call
@@ -274,7 +275,12 @@ class GameBuilder:
                             direction.append(Direction.NORTH)
             else: # Random direction
                 direction = self.direction()
-            print(f"Current player direction is {direction[0]}")
+            emit_event(
+                EventType.SETUP,
+                EventLevel.DEBUG,
+                "Current player direction is {direction}",
+                direction=direction[0],
+            )
             player_list: list[Player] = []
             for i in range(4):
                 player_list.append(
@@ -340,7 +346,11 @@ class GameBuilder:
                         draw_deck=self.deck.draw_deck,
                     )
                 except IndexError as e:
-                    print("Error when creating custom deck! Regenerating deck...")
+                    emit_event(
+                        EventType.SETUP,
+                        EventLevel.WARNING,
+                        "Error when creating custom deck! Regenerating deck...",
+                    )
                     return self.init_game()
 
         else: # Standard player deck
@@ -481,12 +491,8 @@ class GameBuilder:
             options=HAND_CONFIG_OPTIONS,
         )
 
-        calculator = HandCalculator()
-
         if is_nagashi_mangan: # Handle nagashi mangan case
-            result = calculator.estimate_hand_value(
-                tiles=[], win_tile=None, config=config
-            )
+            result = estimate_hand_value(tiles=[], win_tile=None, config=config)
         else:
             copy_player_deck = player.player_deck.copy()
 
@@ -498,7 +504,8 @@ class GameBuilder:
             copy_dora_list = deck.dora.copy()
             if len(ura_dora) > 0:
                 copy_dora_list += ura_dora
-            result = calculator.estimate_hand_value(
+            # Same arguments as the ron/tsumo checks when no situational yaku applies, reused from cache
+            result = estimate_hand_value(
                 list(map(lambda tile: tile.hand136_idx, hands)),
                 win_tile.hand136_idx,
                 player.melds,
@@ -507,9 +514,13 @@ class GameBuilder:
             )
 
         if result:
-            print(result, result.yaku, result.cost)
-            print(
-                f"FINAL RESULT: {result} {result.yaku} and player scores: {result.cost['total']}"
+            emit_event(
+                EventType.SCORE,
+                EventLevel.INFO,
+                "FINAL RESULT: {result} {yaku} and player scores: {total}",
+                result=result,
+                yaku=result.yaku,
+                total=result.cost["total"] if result.cost else None,
             )
         return result
 
@@ -529,12 +540,27 @@ class GameBuilder:
 
             if getattr(game_manager, f"bot_{player.player_idx}_model") == "shanten":
                 player.agent = None
-                print(f"Assigning bot {player.player_idx} with no agent")
+                emit_event(
+                    EventType.SETUP,
+                    EventLevel.DEBUG,
+                    "Assigning bot {player} with no agent",
+                    player=player.player_idx,
+                )
             elif (
                 getattr(game_manager, f"bot_{player.player_idx}_model") == "aggressive"
             ):
                 player.agent = game_manager.ai_agent_MID
-                print(f"Assigning bot {player.player_idx} with agent MID")
+                emit_event(
+                    EventType.SETUP,
+                    EventLevel.DEBUG,
+                    "Assigning bot {player} with agent MID",
+                    player=player.player_idx,
+                )
             elif getattr(game_manager, f"bot_{player.player_idx}_model") == "passive":
                 player.agent = game_manager.ai_agent_SMART
-                print(f"Assigning bot {player.player_idx} with agent SMART")
\ No newline at end of file
+                emit_event(
+                    EventType.SETUP,
+                    EventLevel.DEBUG,
+                    "Assigning bot {player} with agent SMART",
+                    player=player.player_idx,
+                )
\ No newline at end of file
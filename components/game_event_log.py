@@ -1,10 +1,13 @@
 from typing import TypedDict, Literal, Optional
 from utils.enums import ActionType, CallType
 import typing
+from components.round_journal import JournalRecord, RoundJournal
+from utils.constants import LOG_PATH
 from utils.game_history_data_dict import GameHistoryData
+from utils.persistence_worker import PERSISTENCE_WORKER
+import copy
 import os
 import datetime
-import json
 
 if typing.TYPE_CHECKING:
     from components.entities.buttons.tile import Tile
@@ -49,21 +52,26 @@ class GameRoundLog(TypedDict):
 class GameEventLog:
     rounds: list[GameRoundLog]
     name: str
+    journal: RoundJournal
 
     def __init__(self, data: GameHistoryData):
 
         if data:
             self.name = data["from_log_name"]
-            with open(f".log/{self.name}.json", "r") as file:
-                json_data = json.load(file)
-            self.rounds = json_data["rounds"]
-            self.round = json_data["rounds"][-1]
-            self.events = json_data["rounds"][-1]["events"]
+            self.journal = RoundJournal(self.name)
+            self.rounds = self.journal.read()
+            self.round = self.rounds[-1]
+            self.events = self.rounds[-1]["events"]
+            # Number of rounds of self.rounds already in the journal,
+            # the round of an unfinished game is written again when it ends
+            self.__journaled = len(self.rounds) - (0 if data["end_game"] else 1)
             return
         self.name = datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        self.journal = RoundJournal(self.name)
         self.rounds = []
         self.round = None
         self.events = []
+        self.__journaled = 0
 
     def end_round(self, player_list: list["Player"], deltas: Optional[list[int]] = None):
         """
@@ -80,6 +88,9 @@ class GameEventLog:
             self.round["turns"].append(player.turn)
         if deltas:
             self.round["deltas"] = deltas
+        if len(self.rounds) > 0 and self.rounds[-1] is self.round:
+            # Round already ended, or continued from the log
+            return
         self.rounds.append(self.round)
 
     def new_rounds(
@@ -176,14 +187,25 @@ class GameEventLog:
         self.round["events"].append(new_event)
 
     def export(self):
-        import json
-        from pathlib import Path
+        """
+        Append the rounds ended since the last export to the journal of the log, fsynced once.
+        The records are copied here, on the game thread, so the persistence worker only writes data
+        the game no longer touches. Compact the journal to get the log as a single JSON file.
+        :return: None
+        """
+        records: list[JournalRecord] = [
+            {"idx": idx, "round": copy.deepcopy(self.rounds[idx])}
+            for idx in range(self.__journaled, len(self.rounds))
+        ]
+        self.__journaled = len(self.rounds)
+        if len(records) == 0:
+            return
 
-        FILE_FOLDER = ".log/"
-        if not os.path.exists(Path(FILE_FOLDER)):
-            os.makedirs(FILE_FOLDER)
-        os.system(f'attrib +h "{Path(FILE_FOLDER)}"')
-        file_path = Path(f".log/{self.name}.json")
+        def write_rounds() -> None:
+            if not os.path.exists(LOG_PATH):
+                os.makedirs(LOG_PATH)
+                os.system(f'attrib +h "{LOG_PATH}"') # Hide the folder (Windows only)
+            self.journal.append(records)
 
-        with open(file_path, "w+") as file:
-            json.dump({"rounds": self.rounds}, file, indent=2)
+        # Not coalesced: each export carries its own records, written in order
+        PERSISTENCE_WORKER.submit(write_rounds)
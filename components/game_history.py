@@ -1,7 +1,5 @@
 from utils.game_history_data_dict import GameHistoryData
-from utils.constants import HISTORY_PATH
-import os
-import json
+from components.history_store import HISTORY_STORE
 
 
 class GameHistory:
@@ -63,22 +61,9 @@ class GameHistory:
     def export(self) -> None:
         """
         Export the current game history data to a new JSON file in the history directory.
-        The file is named with the next available number based on existing files.
+        The file is named with the next number of the history index.
         :return: None
         """
-        files = []
-        directory = HISTORY_PATH
-        # Append all files in the directory to the list
-        for entry in os.listdir(directory):
-            full_path = os.path.join(directory, entry)
-            if os.path.isfile(full_path):
-                files.append(files)
-
-        # Create a new file with the next number
-        file_path = os.path.join(
-            directory, f"{len(files)}.json"
-        )
-
-        # Write the data to the file
-        with open(file_path, "w+") as file:
-            json.dump(self.data, file, indent=4)
\ No newline at end of file
+        if self.data is None: # Nothing played since the history was cleared
+            return
+        HISTORY_STORE.append(self.data)
\ No newline at end of file
@@ -11,7 +11,15 @@ from utils.constants import (
 )
 
 from components.game_builder import GameBuilder
-from utils.enums import Direction, ActionType, CallType, GamePopup, TileType
+from utils.enums import (
+    Direction,
+    ActionType,
+    CallType,
+    GamePopup,
+    EventLevel,
+    EventType,
+)
+from utils.event_bus import emit_event
 
 from utils.game_data_dict import AfterMatchData
 from utils.game_history_data_dict import GameHistoryData, MeldData, TileData
@@ -23,15 +31,30 @@ from components.entities.deck import Deck
 from utils.helper import (
     build_center_rect,
     map_action_to_call,
-    count_shanten_points,
     get_config,
 )
+from utils.round_rules import (
+    abortive_draw_reason,
+    call_priority,
+    can_declare_kan,
+    is_nagashi_mangan,
+    is_suufon_renda,
+    keeps_dealer,
+    nagashi_mangan_deltas,
+    tenpai_deltas,
+    tsumi_after_win,
+    ura_dora_positions,
+    win_deltas,
+    win_situation,
+)
+from utils.shanten_service import calculate_shanten
 from components.entities.fields.center_board_field import CenterBoardField
 import typing
 from typing import Optional
 import random
 from components.game_event_log import GameEventLog
 from components.entities.ai.mahjong_ai_agent import MahjongAIAgent
+from components.entities.ai.history_buffer import HISTORY_BUFFER
 from components.entities.buttons.chii import Chii
 from components.game_scenes.popup.choose_chii import ChiiPicker
 from components.game_scenes.popup.popup import Popup
@@ -83,6 +106,7 @@ class GameManager:
     latest_discarded_tile: Optional[Tile] = None
     latest_called_tile: Optional[Tile] = None
     call_order: list[Player] = []
+    bot_call_decisions: dict[int, ActionType] = {}
     calling_player: Optional[Player] = None
     prev_called_player: Optional[Player] = None
     action: Optional[ActionType] = None
@@ -134,12 +158,17 @@ class GameManager:
         self.bot_2_model: BotModelType = config["player_2"]
         self.bot_3_model: BotModelType = config["player_3"]
 
+        backend = config.get("backend", "torch")
         self.ai_agent_SMART = MahjongAIAgent(
-            DISCARD_MODEL, CHI_MODEL, PON_MODEL, RIICHI_MODEL
+            DISCARD_MODEL, CHI_MODEL, PON_MODEL, RIICHI_MODEL, backend=backend
         )
 
         self.ai_agent_MID = MahjongAIAgent(
-            COMBINED_MODEL, COMBINED_MODEL, COMBINED_MODEL, COMBINED_MODEL
+            COMBINED_MODEL,
+            COMBINED_MODEL,
+            COMBINED_MODEL,
+            COMBINED_MODEL,
+            backend=backend,
         )
 
         self.game_history = game_history
@@ -394,7 +423,7 @@ class GameManager:
             case pygame.KEYDOWN:
                 if event.key == pygame.K_F9:
                     pygame.image.save(self.render(), "game_scene_screenshot.png")
-                    print("Game scene screenshot saved!")
+                    emit_event(EventType.UI, EventLevel.INFO, "Game scene screenshot saved!")
 
     def detect_mouse_pos(self, mouse_pos: tuple[int, int]):
         player = self.player_list[0]
@@ -508,8 +537,13 @@ class GameManager:
                 # Wait until the "thinking" time (BOT_MOVE_DELAY) has passed
                 if self.bot_move_timer < self.BOT_MOVE_DELAY:
                     return  # Not time to move yet
-                self.action = self.calling_player.make_move()
-                print("--- START CHII PON KAN RON ---")
+                # Decided in one batch when the call order was built
+                self.action = self.bot_call_decisions.pop(
+                    self.calling_player.player_idx, None
+                )
+                if self.action is None:
+                    self.action = self.calling_player.make_move()
+                emit_event(EventType.ACTION, EventLevel.DEBUG, "--- START CHII PON KAN RON ---")
 
         if self.current_player == self.main_player:
             if self.action:
@@ -553,31 +587,27 @@ class GameManager:
             next_turn = Direction((self.current_turn.value + 1) % 4)
 
         if self.latest_discarded_tile:
-            print(f"Latest discard tile: {self.latest_discarded_tile}")
+            emit_event(
+                EventType.ACTION,
+                EventLevel.DEBUG,
+                "Latest discard tile: {tile}",
+                tile=self.latest_discarded_tile,
+            )
 
             # Checking for kaze4
-            if (
-                all([player.turn == 1 for player in self.player_list]) and
-                all([len(player.discard_tiles) == 1 for player in self.player_list]) # No call interruption
+            if is_suufon_renda(
+                [player.turn for player in self.player_list],
+                [
+                    [tile.hand34_idx for tile in player.discard_tiles]
+                    for player in self.player_list
+                ],
             ):
-                discard_tile = self.player_list[0].discard_tiles[0]
-                if all(
-                    [
-                        player.discard_tiles[0].type == discard_tile.type
-                        and player.discard_tiles[0].number == discard_tile.number
-                        for player in self.player_list
-                    ] # All players discard the same tile
-                ) and all(
-                    [
-                        player.discard_tiles[0].hand34_idx in [27, 28, 29, 30]
-                        for player in self.player_list
-                    ] # And that tile is a wind tile
-                ):
-                    self.action = ActionType.RYUUKYOKU
-                    self.is_disable_round = True
-                    self.disable_reason = "Suufon Renda"
-                    return
+                self.action = ActionType.RYUUKYOKU
+                self.is_disable_round = True
+                self.disable_reason = "Suufon Renda"
+                return
 
+            can_kan = can_declare_kan(self.kan_count, len(self.deck.draw_deck))
             for player in self.player_list:
                 if player == self.prev_player: # Skip previous player
                     continue
@@ -587,6 +617,7 @@ class GameManager:
                         is_current_turn=False,
                         round_wind=self.round_direction,
                         check_chii=True,
+                        can_kan=can_kan,
                     )
                 else:
                     # Check for Pon, Kan, Ron
@@ -594,38 +625,30 @@ class GameManager:
                         self.latest_discarded_tile,
                         is_current_turn=False,
                         round_wind=self.round_direction,
+                        can_kan=can_kan,
                     )
                 if len(player.can_call) > 0:
                     self.call_order.append(player)
             self.call_order.sort(
-                key=lambda player: (
-                    player.can_call[0].value,
-                    -((self.prev_player.direction.value - player.direction.value) % 4),
+                key=lambda player: call_priority(
+                    player.can_call, self.prev_player.direction, player.direction
                 ),
                 reverse=True,
             ) # Sort by call priority (RON > KAN > PON > CHII) and proximity to previous player
+            self.__batch_bot_calls()
 
             if len(self.call_order) > 0:
                 self.calling_player = self.call_order.pop()
                 return
 
-            # Checking for Kan4
-            elif len(self.call_order) == 0 and self.kan_count == 4:
-                self.action = ActionType.RYUUKYOKU
-                self.is_disable_round = True
-                self.disable_reason = "Suukaikan"
-                return
-
-            # Checking for Reach4
-            if (
-                all(
-                    [CallType.RON not in player.can_call for player in self.player_list]
-                )
-                and len(self.game_log.round["reaches"]) == 4
-            ):
+            # Checking for Kan4 and Reach4
+            reason = abortive_draw_reason(
+                self.kan_count, len(self.game_log.round["reaches"])
+            )
+            if reason is not None:
                 self.action = ActionType.RYUUKYOKU
                 self.is_disable_round = True
-                self.disable_reason = "Suucha Riichi"
+                self.disable_reason = reason
                 return
 
         if turn:
@@ -644,8 +667,12 @@ class GameManager:
         self.current_player = self.find_player(self.current_turn)
 
         self.current_player.deck_field.build_tiles_position(self.current_player)
-        print(
-            f"Switch from turn player {self.prev_player.player_idx} to player {self.current_player.player_idx}"
+        emit_event(
+            EventType.ACTION,
+            EventLevel.DEBUG,
+            "Switch from turn player {prev_player} to player {player}",
+            prev_player=self.prev_player.player_idx,
+            player=self.current_player.player_idx,
         )
 
     def find_player(self, turn: Direction) -> Player:
@@ -660,31 +687,40 @@ class GameManager:
         CHII, PON, and KAN.
         :return: None
         """
-        print(f"########## START {self.action.name.upper()} ACTION ##########")
-        print(
-            f"Current deck size: {len(self.deck.draw_deck)}, current death field size: {len(self.deck.death_wall)}"
+        emit_event(
+            EventType.ACTION,
+            EventLevel.DEBUG,
+            "########## START {action} ACTION ##########",
+            action=self.action.name.upper(),
+        )
+        emit_event(
+            EventType.ACTION,
+            EventLevel.DEBUG,
+            "Current deck size: {deck_size}, current death field size: {death_wall_size}",
+            deck_size=len(self.deck.draw_deck),
+            death_wall_size=len(self.deck.death_wall),
         )
         latest_discarded_tile: Tile = self.latest_discarded_tile
         if self.action:
             if self.calling_player:
-                print(f"{self.action} from {self.calling_player}")
+                emit_event(
+                    EventType.ACTION,
+                    EventLevel.INFO,
+                    "{action} from {player}",
+                    action=self.action,
+                    player=self.calling_player,
+                )
             else:
-                print(f"{self.action} from {self.current_player}")
+                emit_event(
+                    EventType.ACTION,
+                    EventLevel.INFO,
+                    "{action} from {player}",
+                    action=self.action,
+                    player=self.current_player,
+                )
 
         match self.action:
             case ActionType.DRAW:
-                if sum([player.turn for player in self.player_list]) == 0:
-                    # Checking for Yao9 at the start of the round
-                    for player in self.player_list:
-                        if player.check_yao9():
-                            player.can_call = [CallType.RYUUKYOKU, CallType.SKIP]
-                            self.call_order.append(player)
-
-                            print(f"{player} have yao9. Can declare Ryuukyoku...")
-                    if len(self.call_order) > 0:
-                        self.calling_player = self.call_order.pop()
-                        return None # Prioritize Yao9 check first
-
                 tile: Optional[Tile] = None
                 try:
                     if self.prev_action == ActionType.KAN: # Draw from death wall after kan
@@ -693,16 +729,50 @@ class GameManager:
                             self.deck.death_wall,
                             round_wind=self.round_direction,
                             tile=self.deck.death_wall[0],
+                            check_call=False,
                         )
+                        self.__refill_death_wall()
 
                     else:
                         self.__reset_calling_state()
                         tile = self.current_player.draw(
                             self.deck.draw_deck,
                             round_wind=self.round_direction,
+                            check_call=False,
                         )
                 except IndexError as e:
-                    print("SOMETHING WRONG WITH DRAW: ", e.args)
+                    emit_event(
+                        EventType.ACTION,
+                        EventLevel.ERROR,
+                        "SOMETHING WRONG WITH DRAW: {error}",
+                        error=e.args,
+                    )
+
+                if tile is not None:
+                    # Check for Tsumo, Riichi, Kan once the death wall is refilled
+                    self.current_player.check_call(
+                        tile,
+                        is_current_turn=True,
+                        round_wind=self.round_direction,
+                        can_kan=can_declare_kan(self.kan_count, len(self.deck.draw_deck)),
+                    )
+                    # Checking for Yao9 on the first uninterrupted draw
+                    if self.current_player.check_yao9(
+                        interrupted=any(
+                            len(player.call_list) > 0 for player in self.player_list
+                        )
+                    ):
+                        self.current_player.can_call = [
+                            call
+                            for call in self.current_player.can_call
+                            if call != CallType.SKIP
+                        ] + [CallType.RYUUKYOKU, CallType.SKIP]
+                        emit_event(
+                            EventType.CALL_CHECK,
+                            EventLevel.INFO,
+                            "{player} have yao9. Can declare Ryuukyoku...",
+                            player=self.current_player,
+                        )
 
                 if len(self.current_player.can_call) > 0 and self.kan_count < 4:
                     self.call_order.append(self.current_player)
@@ -712,8 +782,12 @@ class GameManager:
                     self.action = ActionType.DISCARD
 
                 self.game_log.append_event(ActionType.DRAW, tile, self.current_player)
-                print(
-                    f"{self.current_player} draw {self.current_player.get_draw_tile()}"
+                emit_event(
+                    EventType.ACTION,
+                    EventLevel.DEBUG,
+                    "{player} draw {tile}",
+                    player=self.current_player,
+                    tile=self.current_player.get_draw_tile(),
                 )
 
             case ActionType.DISCARD:
@@ -732,7 +806,12 @@ class GameManager:
                             )
                         )[0] # Get the clicked tile
                     except Exception as e:
-                        print("SOMETHING WRONG WITH DISCARD: ", e.args)
+                        emit_event(
+                            EventType.ACTION,
+                            EventLevel.ERROR,
+                            "SOMETHING WRONG WITH DISCARD: {error}",
+                            error=e.args,
+                        )
                         pass
 
                 if tile:
@@ -859,7 +938,6 @@ class GameManager:
                     )
                 if calling_player.call_list[-1].is_kakan: # Checking for Chankan potential
                     self.__reset_calling_state()
-                    ron_able = False
                     for player in self.player_list:
                         if player == calling_player:
                             continue
@@ -869,13 +947,24 @@ class GameManager:
                             round_wind=self.round_direction,
                             check_chii=False,
                         )
-
-                        if CallType.RON in player.can_call:
+                        # Only a ron can rob the kakan
+                        player.can_call = (
+                            [CallType.RON, CallType.SKIP]
+                            if CallType.RON in player.can_call
+                            else []
+                        )
+                        if len(player.can_call) > 0:
                             self.call_order.append(player)
-                            self.calling_player = self.call_order.pop()
-                            ron_able = True
 
-                    if not ron_able:
+                    if len(self.call_order) > 0:
+                        self.call_order.sort(
+                            key=lambda player: call_priority(
+                                player.can_call, calling_player.direction, player.direction
+                            ),
+                            reverse=True,
+                        )
+                        self.calling_player = self.call_order.pop()
+                    else:
                         self.__handle_switch_turn(calling_player, True, reset=False)
 
                 else:
@@ -1039,18 +1128,29 @@ class GameManager:
                     self.disable_reason = "Kyuushu Kyuuhai"
                 return self.end_match()
 
-        # Refill death wall if needed
+        self.__refill_death_wall()
+
+        self.bot_move_timer = 0
+        self.current_player.deck_field.build_tiles_position(self.current_player)
+        emit_event(
+            EventType.ACTION,
+            EventLevel.DEBUG,
+            "########## DONE {action} ACTION ##########",
+            action=self.prev_action.name.upper(),
+        )
+        return None
+
+    def __refill_death_wall(self) -> None:
+        """
+        Refill the death wall to 14 tiles from the draw deck, after a replacement tile was drawn.
+        :return: None
+        """
         if len(self.deck.death_wall) < 14:
             for _ in range(0, 14 - len(self.deck.death_wall)):
                 self.deck.death_wall.append(self.deck.draw_deck[0])
                 self.deck.draw_deck.remove(self.deck.draw_deck[0])
                 self.deck.current_dora_idx -= 1
 
-        self.bot_move_timer = 0
-        self.current_player.deck_field.build_tiles_position(self.current_player)
-        print(f"########## DONE {self.prev_action.name.upper()} ACTION ##########")
-        return None
-
     def __handle_switch_turn(
         self, calling_player: Player, draw: bool = False, reset: bool = True
     ):
@@ -1081,11 +1181,36 @@ class GameManager:
         self.latest_discarded_tile = None
         self.calling_player = None
         self.call_order = []
+        self.bot_call_decisions = {}
         self.action = None
 
         for player in self.player_list:
             player.reset_call()
 
+    def __batch_bot_calls(self) -> None:
+        """
+        Decide the calls of every AI bot in the call order at once, one forward pass per model for each agent.
+        The discard doesn't change while the call order is answered, so the decisions stay valid.
+        :return: None
+        """
+        self.bot_call_decisions = {}
+        agents: dict[int, list[Player]] = {}
+        for player in self.call_order:
+            if (
+                player == self.main_player
+                or player.agent is None
+                or player.is_riichi() >= 0
+            ):
+                continue
+            agents.setdefault(id(player.agent), []).append(player)
+
+        for players in agents.values():
+            actions = players[0].agent.make_moves(
+                [(player, player.can_call) for player in players]
+            )
+            for player, action in zip(players, actions):
+                self.bot_call_decisions[player.player_idx] = action
+
     def end_match(
         self,
         win_player: Player = None,
@@ -1101,11 +1226,13 @@ class GameManager:
         """
         self.pause = True
         deltas = [0, 0, 0, 0]
+        directions = [player.direction for player in self.player_list]
         for player in self.player_list:
-            if count_shanten_points(player.player_deck) == 0:
+            if calculate_shanten(player.hand34) == 0:
                 player.reveal_hand()
         if self.is_disable_round:
             self.game_log.round = None
+            self.keep_direction = keeps_dealer(directions, aborted=True)
 
             popup_data: AfterMatchData = {
                 "deltas": deltas,
@@ -1125,119 +1252,45 @@ class GameManager:
             return
 
         if win_player:
-            # is_tsumo
-            is_tsumo = True if self.action == ActionType.TSUMO else False
-
-            # is_riichi
-            riichi_turn = win_player.is_riichi()
-            is_riichi = True if riichi_turn >= 0 else False
-            ura_dora = []
-            if is_riichi:
-                start_ura_dora_idx = 4
-                for i in range(0, len(self.deck.dora)):
-                    ura_dora.append(self.deck.death_wall[start_ura_dora_idx])
-                    start_ura_dora_idx += 2
-
-            # is_double_riichi
-            is_daburu_riichi = True if riichi_turn == 0 else False
-
-            # is_ippatsu
-            is_ippatsu = (
-                True
-                if win_player.is_riichi() >= 0 and riichi_turn == win_player.turn - 1
-                else False
-            )
-
-            is_rinshan = True if win_player.get_draw_tile().from_death_wall else False
-            is_chankan = (
-                True
-                if self.prev_action == ActionType.KAN and self.action == ActionType.RON
-                else False
-            )
-            is_haitei = (
-                True
-                if self.action == ActionType.TSUMO
-                and win_player.get_draw_tile() == win_tile
-                and len(self.deck.draw_deck) == 0
-                else False
-            )
-            is_houtei = (
-                True
-                if self.action == ActionType.RON
-                and self.latest_discarded_tile == win_tile
-                and len(self.deck.draw_deck) == 0
-                else False
-            )
-            is_tenhou = (
-                True
-                if self.action == ActionType.TSUMO
-                and win_player.direction == Direction.EAST
-                and win_player.turn == 0
-                and len(win_player.melds) == 0
-                else False
-            )
-            is_chiihou = (
-                True
-                if self.action == ActionType.TSUMO
-                and win_player.direction != Direction.EAST
-                and win_player.turn == 0
-                and len(win_player.melds) == 0
-                else False
-            )
-
-            is_renhou = (
-                True
-                if self.action == ActionType.RON and win_player.turn == 0
-                else False
+            situation = win_situation(
+                is_tsumo=self.action == ActionType.TSUMO,
+                is_dealer=win_player.direction == Direction.EAST,
+                riichi_turn=win_player.is_riichi(),
+                turn=win_player.turn,
+                has_melds=len(win_player.melds) > 0,
+                is_rinshan=bool(win_player.get_draw_tile().from_death_wall),
+                is_chankan=self.prev_action == ActionType.KAN,
+                is_wall_empty=len(self.deck.draw_deck) == 0,
             )
+            ura_dora = []
+            if situation["is_riichi"]:
+                ura_dora = [
+                    self.deck.death_wall[idx]
+                    for idx in ura_dora_positions(len(self.deck.dora))
+                ]
 
             result = self.builder.calculate_player_score(
                 player=win_player,
                 round_wind=self.round_direction,
                 win_tile=win_tile,
                 deck=self.deck,
-                is_tsumo=is_tsumo,
-                is_riichi=is_riichi,
-                is_daburu_riichi=is_daburu_riichi,
-                is_ippatsu=is_ippatsu,
-                is_rinshan=is_rinshan,
-                is_chankan=is_chankan,
-                is_haitei=is_haitei,
-                is_houtei=is_houtei,
-                is_tenhou=is_tenhou,
-                is_chiihou=is_chiihou,
-                is_renhou=is_renhou,
                 tsumi_number=self.tsumi_number,
                 kyoutaku_number=self.kyoutaku_number,
                 ura_dora=ura_dora,
+                **situation,
             )
             total_cost = int(result.cost["total"] / 100)
-            if self.action == ActionType.TSUMO:
-                deltas[win_player.player_idx] += total_cost
-                divided_cost = (
-                    total_cost - self.tsumi_number * 3 - self.kyoutaku_number * 10
-                )
-                if win_player.direction == Direction.EAST:
-                    self.keep_direction = True
-                    for i in range(0, len(deltas)):
-                        if i == win_player.player_idx:
-                            continue
-
-                        deltas[i] -= int(divided_cost / 3) + self.tsumi_number
-                else:
-                    for i in range(0, len(deltas)):
-                        if i == win_player.player_idx:
-                            continue
-                        if self.player_list[i].direction == Direction.EAST:
-                            deltas[i] -= int(divided_cost / 4) * 2 + self.tsumi_number
-                        else:
-                            deltas[i] -= int(divided_cost / 4) + self.tsumi_number
-            elif self.action == ActionType.RON:
-                actual_cost = total_cost - self.kyoutaku_number * 10
-                if win_player.direction == Direction.EAST:
-                    self.keep_direction = True
-                deltas[win_player.player_idx] += total_cost
-                deltas[roned_player.player_idx] -= actual_cost
+            deltas = win_deltas(
+                total_cost,
+                win_player.player_idx,
+                roned_player.player_idx if self.action == ActionType.RON else None,
+                directions,
+                self.tsumi_number,
+                self.kyoutaku_number,
+            )
+            self.keep_direction = keeps_dealer(
+                directions, win_seat=win_player.player_idx
+            )
 
             self.game_log.append_event(self.action, win_tile, win_player, None)
             copy_player_deck = win_player.player_deck.copy()
@@ -1258,75 +1311,41 @@ class GameManager:
                 "dora": self.deck.dora,
             }
             self.kyoutaku_number = 0
-            if win_player.direction == Direction.EAST:
-                self.tsumi_number += 1
-            else:
-                self.tsumi_number = 0
+            self.tsumi_number = tsumi_after_win(
+                win_player.direction == Direction.EAST, self.tsumi_number
+            )
         else:
+            tenpai_players: list[Player] = [
+                player
+                for player in self.player_list
+                if calculate_shanten(player.hand34) == 0
+            ]
+            tenpai_seats = [player.player_idx for player in tenpai_players]
+            self.keep_direction = keeps_dealer(directions, tenpai_seats=tenpai_seats)
+
             # Check nagashi mangan player
-            is_nagashi_mangan = False
             nagashi_mangan_player = None
             for direction in Direction:
                 player = self.find_player(Direction(direction.value))
-                if len(player.get_all_discarded_tiles()) == len(player.discard_tiles):
-                    found_not_suitable_tile = False
-                    for tile in player.discard_tiles:
-                        if tile.type not in [TileType.DRAGON, TileType.WIND] and not (
-                            tile.number == 1 or tile.number == 9
-                        ):
-                            found_not_suitable_tile = True
-                            break
-
-                    if not found_not_suitable_tile:
-                        is_nagashi_mangan = True
-                        nagashi_mangan_player = player
-                        break
+                if is_nagashi_mangan(
+                    [tile.hand34_idx for tile in player.discard_tiles],
+                    len(player.get_all_discarded_tiles()),
+                ):
+                    nagashi_mangan_player = player
+                    break
 
             # Handle nagashi mangan
-            if is_nagashi_mangan:
+            if nagashi_mangan_player:
                 result = self.builder.calculate_player_score(is_nagashi_mangan=True)
-                total_cost = int(result.cost["total"] / 100)
-                deltas[nagashi_mangan_player.player_idx] += total_cost
-
-                if nagashi_mangan_player.direction == Direction.EAST:
-                    for i in range(0, len(deltas)):
-                        if i == nagashi_mangan_player.player_idx:
-                            continue
-
-                        deltas[i] -= int(total_cost / 3)
-                else:
-                    for i in range(0, len(deltas)):
-                        if i == nagashi_mangan_player.player_idx:
-                            continue
-                        if self.player_list[i].direction == Direction.EAST:
-                            deltas[i] -= int(total_cost / 4) * 2
-                        else:
-                            deltas[i] -= int(total_cost / 4)
-
-                for player in self.player_list:
-                    if count_shanten_points(player.player_deck) == 0:
-                        if player.direction == Direction.EAST:
-                            self.keep_direction = True
+                deltas = nagashi_mangan_deltas(
+                    int(result.cost["total"] / 100),
+                    nagashi_mangan_player.player_idx,
+                    directions,
+                )
 
             # Tenpai player
             else:
-                max_deltas_points = 30
-                tenpai_players: list[Player] = []
-                for player in self.player_list:
-                    if count_shanten_points(player.player_deck) == 0:
-                        tenpai_players.append(player)
-                if not (len(tenpai_players) == 0 or len(tenpai_players) == 4):
-                    for player in self.player_list:
-                        if player in tenpai_players:
-                            if player.direction == Direction.EAST:
-                                self.keep_direction = True
-                            deltas[player.player_idx] += int(
-                                max_deltas_points / len(tenpai_players)
-                            )
-                        if player not in tenpai_players:
-                            deltas[player.player_idx] -= int(
-                                max_deltas_points / (4 - len(tenpai_players))
-                            )
+                deltas = tenpai_deltas(tenpai_seats)
                 if self.main_player in tenpai_players:
                     self.scenes_controller.mixer.add_sound_queue(
                         self.main_player.player_idx, ActionType.TENPAI
@@ -1337,9 +1356,7 @@ class GameManager:
                     )
 
                 self.game_log.round["ryuukyoku_tenpai"] = (
-                    None
-                    if len(tenpai_players) == 0
-                    else list(map(lambda _player: _player.player_idx, tenpai_players))
+                    None if len(tenpai_seats) == 0 else tenpai_seats
                 )
 
             self.game_log.round["ryuukyoku"] = True
@@ -1372,10 +1389,8 @@ class GameManager:
         self.game_log.export()
         self.after_match_data = popup_data
 
-        files = self.ai_agent_MID.load_files()
-        self.ai_agent_MID.read_files(files)
-        files = self.ai_agent_SMART.load_files()
-        self.ai_agent_SMART.read_files(files)
+        # The AI agents share the history buffer, nothing is read back from .history
+        HISTORY_BUFFER.push(game_history_data)
 
     def __create_new_round_log(self):
         hands = []
@@ -1420,6 +1435,7 @@ class GameManager:
         self.latest_discarded_tile: Tile | None = None
         self.latest_called_tile: Tile | None = None
         self.call_order: list[Player] = []
+        self.bot_call_decisions: dict[int, ActionType] = {}
         self.calling_player: Player | None = None
         self.prev_called_player: Player | None = None
         self.action: ActionType | None = None
@@ -15,7 +15,8 @@ from utils.constants import (
 from pygame.freetype import Font
 from pygame.event import Event
 from utils.helper import build_center_rect, draw_hitbox
-from utils.enums import GameScene
+from utils.enums import GameScene, EventLevel, EventType
+from utils.event_bus import emit_event
 
 if typing.TYPE_CHECKING:
     from components.game_scenes.scenes_controller import ScenesController
@@ -199,7 +200,7 @@ class MainMenu:
             case pygame.KEYDOWN:
                 if event.key == pygame.K_F9:
                     pygame.image.save(self.render(), "main_menu_screenshot.png")
-                    print("Main menu screenshot saved!")
+                    emit_event(EventType.UI, EventLevel.INFO, "Main menu screenshot saved!")
 
     @staticmethod
     def draw_border(surface: Surface, bg_color: Color, border_color: Color):
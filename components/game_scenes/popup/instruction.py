@@ -15,7 +15,8 @@ from pygame import Surface, Color, Rect
 from pygame.event import Event
 from utils.instruction_data_dict import InstructionCard, InstructionPageData
 from components.game_scenes.popup.popup import Popup
-from utils.enums import InstructionSection
+from utils.enums import InstructionSection, EventLevel, EventType
+from utils.event_bus import emit_event
 from pygame.freetype import Font
 from components.entities.buttons.button import Button
 from utils.helper import build_center_rect, draw_hitbox
@@ -466,7 +467,13 @@ class Instruction(Popup):
         try:
             body_surface = getattr(self, f"build_page_{page+1}_tutorial_surface")()
         except Exception as e:
-            print(e.args, "Hello")
+            emit_event(
+                EventType.UI,
+                EventLevel.WARNING,
+                "Can not build instruction page {page}: {error}",
+                page=page + 1,
+                error=e.args,
+            )
             body_surface = Surface((0, 0), pygame.SRCALPHA)
 
         try:
@@ -479,7 +486,13 @@ class Instruction(Popup):
         try:
             body_surface = getattr(self, f"build_page_{page+1}_yaku_surface")()
         except Exception as e:
-            print(e.args, "Hello")
+            emit_event(
+                EventType.UI,
+                EventLevel.WARNING,
+                "Can not build instruction page {page}: {error}",
+                page=page + 1,
+                error=e.args,
+            )
             body_surface = Surface((0, 0), pygame.SRCALPHA)
 
         try:
@@ -492,7 +505,13 @@ class Instruction(Popup):
         try:
             body_surface = getattr(self, f"build_page_{page+1}_game_flow")()
         except Exception as e:
-            print(e.args, "Hello")
+            emit_event(
+                EventType.UI,
+                EventLevel.WARNING,
+                "Can not build instruction page {page}: {error}",
+                page=page + 1,
+                error=e.args,
+            )
             body_surface = Surface((0, 0), pygame.SRCALPHA)
 
         try:
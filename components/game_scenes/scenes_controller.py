@@ -3,10 +3,8 @@ from utils.constants import (
     GAME_TITLE,
     WINDOW_SIZE,
     FPS_LIMIT,
-    HISTORY_PATH,
     ICON_LINK,
     COLOR_WHITE,
-    LOG_PATH,
 )
 from utils.game_data_dict import AfterMatchData
 import pygame
@@ -17,11 +15,14 @@ from utils.helper import get_config, get_data_from_file
 from components.game_scenes.popup.after_match import AfterMatchPopup
 from components.entities.mouse import Mouse
 from components.game_history import GameHistory
+from components.history_store import HISTORY_STORE
+from components.entities.ai.history_buffer import HISTORY_BUFFER
+from components.round_journal import RoundJournal
+from utils.persistence_worker import PERSISTENCE_WORKER
 from components.entities.deck import Deck
 from components.game_scenes.game_manager import GameManager
 from components.game_scenes.main_menu import MainMenu
 import os
-import json
 from components.game_scenes.popup.instruction import Instruction
 from components.entities.buttons.button import Button
 from components.mixer.mixer import Mixer
@@ -327,29 +328,21 @@ class ScenesController:
                                     end_game = self.history.data["end_game"]
                                 self.history.data = None
                                 # Delete all history files
-                                for entry in os.listdir(HISTORY_PATH):
-                                    file_path = os.path.join(HISTORY_PATH, entry)
-                                    if os.path.isfile(file_path):
-                                        os.remove(file_path)
+                                HISTORY_STORE.clear()
+                                HISTORY_BUFFER.clear()
                                 if log_name:
-                                    log_path = os.path.join(LOG_PATH, f"{log_name}.json")
-                                    with open(log_path, "r") as file:
-                                        json_data = json.load(file)
-                                        if (
-                                            len(json_data["rounds"]) > 0
-                                            and not end_game
-                                        ):
-                                            # If the previous game is not ended, remove the last round
-                                            json_data["rounds"].remove(
-                                                json_data["rounds"][-1]
-                                            )
-                                    if len(json_data["rounds"]) == 0:
-                                        # If there is no round in the log, delete the log file
-                                        os.remove(log_path)
-                                    else:
-                                        # Update the log file
-                                        with open(log_path, "w") as file:
-                                            json.dump(json_data, file)
+                                    # Wait for the last exports of the log
+                                    PERSISTENCE_WORKER.flush()
+                                    journal = RoundJournal(log_name)
+                                    round_count = len(journal.read())
+                                    if round_count > 0 and not end_game:
+                                        # If the previous game is not ended, remove the last round
+                                        round_count -= 1
+                                        if round_count > 0:
+                                            journal.truncate(round_count)
+                                    if round_count == 0:
+                                        # If there is no round in the log, delete the log files
+                                        journal.remove()
 
                             if action == "New Game" or action == "Continue":
                                 # Create game manager
@@ -0,0 +1,158 @@
+import json
+import struct
+import zlib
+from typing import Any, Literal
+from utils.game_history_data_dict import GameHistoryData, TileData
+from utils.tile_names import tile_to_str
+
+# Versioned header of a binary snapshot: magic, version, compression
+HISTORY_MAGIC = b"MJHS"
+HISTORY_CODEC_VERSION = 1
+HEADER = struct.Struct("<4sBB")
+
+Compression = Literal["none", "zlib", "zstd"]
+COMPRESSIONS: tuple[Compression, ...] = ("none", "zlib", "zstd")
+
+# Bits of the tile flags, one byte per hand136 index
+RIICHI_DISCARD_FLAG = 1
+FROM_DEATH_WALL_FLAG = 2
+IS_DISABLED_FLAG = 4
+
+# Fields holding a tile list, or a tile list per player
+TILE_LIST_FIELDS = ("full_deck", "draw_deck", "death_wall", "dora")
+PLAYER_TILE_LIST_FIELDS = ("hands", "discards", "already_discards")
+
+
+def encode_history(data: GameHistoryData, compression: Compression = "zlib") -> bytes:
+    """
+    Encode a game history snapshot in the compact binary format.
+
+    Every tile list (wall, hands, discards, melds, callable tiles) becomes a uint8 array of hand136 indices,
+    and the flags of the 136 tiles a single bitfield array: a tile is one object, its flags are the same in every list.
+    The other fields are kept as compact JSON, with each tile list replaced by its number.
+    :param data: The game history data, as built by ``GameManager.__dict__``.
+    :param compression: ``none``, ``zlib`` or ``zstd`` (needs the ``zstandard`` package).
+    :return: The encoded snapshot.
+    :rtype: bytes
+    """
+    flags = bytearray(136)
+    tile_lists: list[bytes] = []
+
+    def add_tiles(tiles: list[TileData]) -> int:
+        for tile in tiles:
+            flags[tile["hand136_idx"]] = (
+                (RIICHI_DISCARD_FLAG if tile["riichi_discard"] else 0)
+                | (FROM_DEATH_WALL_FLAG if tile["from_death_wall"] else 0)
+                | (IS_DISABLED_FLAG if tile["is_disabled"] else 0)
+            )
+        tile_lists.append(bytes(tile["hand136_idx"] for tile in tiles))
+        return len(tile_lists) - 1
+
+    meta: dict[str, Any] = dict(data)
+    for name in TILE_LIST_FIELDS:
+        meta[name] = add_tiles(data[name])
+    for name in PLAYER_TILE_LIST_FIELDS:
+        meta[name] = [add_tiles(tiles) for tiles in data[name]]
+    meta["callable_tiles_list"] = [
+        [add_tiles(tiles) for tiles in callable_list]
+        for callable_list in data["callable_tiles_list"]
+    ]
+    meta["melds"] = [
+        [{**meld, "tiles": add_tiles(meld["tiles"])} for meld in melds]
+        for melds in data["melds"]
+    ]
+
+    body = bytearray(flags)
+    body += struct.pack("<H", len(tile_lists))
+    for tiles in tile_lists:
+        body += struct.pack("<B", len(tiles)) + tiles
+    body += json.dumps(meta, separators=(",", ":")).encode("utf-8")
+
+    return HEADER.pack(
+        HISTORY_MAGIC, HISTORY_CODEC_VERSION, COMPRESSIONS.index(compression)
+    ) + _compress(bytes(body), compression)
+
+
+def decode_history(blob: bytes) -> GameHistoryData:
+    """
+    Decode a snapshot written by ``encode_history``, to the same data the JSON format holds.
+    :param blob: The encoded snapshot.
+    :return: The game history data.
+    :rtype: GameHistoryData
+    """
+    magic, version, compression_idx = HEADER.unpack_from(blob)
+    if magic != HISTORY_MAGIC:
+        raise ValueError("Not a game history snapshot")
+    if version != HISTORY_CODEC_VERSION:
+        raise ValueError(f"Unsupported game history snapshot version {version}")
+    body = _decompress(blob[HEADER.size :], COMPRESSIONS[compression_idx])
+
+    flags = body[:136]
+    (list_count,) = struct.unpack_from("<H", body, 136)
+    offset = 138
+    tile_lists: list[list[TileData]] = []
+    for _ in range(list_count):
+        length = body[offset]
+        tile_lists.append(
+            [
+                {
+                    "hand136_idx": idx,
+                    "riichi_discard": bool(flags[idx] & RIICHI_DISCARD_FLAG),
+                    "from_death_wall": bool(flags[idx] & FROM_DEATH_WALL_FLAG),
+                    "is_disabled": bool(flags[idx] & IS_DISABLED_FLAG),
+                    "string": tile_to_str(idx),
+                }
+                for idx in body[offset + 1 : offset + 1 + length]
+            ]
+        )
+        offset += 1 + length
+
+    data = json.loads(body[offset:].decode("utf-8"))
+    for name in TILE_LIST_FIELDS:
+        data[name] = tile_lists[data[name]]
+    for name in PLAYER_TILE_LIST_FIELDS:
+        data[name] = [tile_lists[list_idx] for list_idx in data[name]]
+    data["callable_tiles_list"] = [
+        [tile_lists[list_idx] for list_idx in callable_list]
+        for callable_list in data["callable_tiles_list"]
+    ]
+    for melds in data["melds"]:
+        for meld in melds:
+            meld["tiles"] = tile_lists[meld["tiles"]]
+    return data
+
+
+def is_encoded_history(blob: bytes) -> bool:
+    return blob[: len(HISTORY_MAGIC)] == HISTORY_MAGIC
+
+
+def _compress(body: bytes, compression: Compression) -> bytes:
+    match compression:
+        case "none":
+            return body
+        case "zlib":
+            return zlib.compress(body, 6)
+        case "zstd":
+            return _zstandard().ZstdCompressor().compress(body)
+    raise ValueError(f"Unknown compression {compression}")
+
+
+def _decompress(body: bytes, compression: Compression) -> bytes:
+    match compression:
+        case "none":
+            return body
+        case "zlib":
+            return zlib.decompress(body)
+        case "zstd":
+            return _zstandard().ZstdDecompressor().decompress(body)
+    raise ValueError(f"Unknown compression {compression}")
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "The zstd compression needs zstandard, install it with `pip install zstandard`"
+        ) from e
+    return zstandard
@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Optional, TypedDict
+from components.history_codec import encode_history, decode_history
+from utils.constants import HISTORY_PATH, HISTORY_FORMAT, HISTORY_COMPRESSION
+from utils.game_history_data_dict import GameHistoryData
+from utils.persistence_worker import PERSISTENCE_WORKER, PersistenceWorker, write_atomic
+
+HISTORY_INDEX_FILE = "index.json"
+HISTORY_INDEX_VERSION = 1
+# Extensions of the snapshot files, binary (components.history_codec) or JSON
+HISTORY_EXTENSIONS = {"binary": ".bin", "json": ".json"}
+
+
+class HistoryEntry(TypedDict):
+    """
+    A snapshot listed in the history index.
+
+    :cvar id: Number of the snapshot, increasing with time (int).
+    :cvar file: Name of the snapshot file in the history directory (str).
+    :cvar end_game: Whether the snapshot was taken at the end of a round (bool).
+    """
+
+    id: int
+    file: str
+    end_game: bool
+
+
+class HistoryIndex(TypedDict):
+    """
+    Manifest of the history directory, stored as ``index.json``.
+
+    :cvar version: Version of the index layout (int).
+    :cvar next_id: Number of the next snapshot (int).
+    :cvar entries: Snapshots of the directory, oldest first (list[HistoryEntry]).
+    """
+
+    version: int
+    next_id: int
+    entries: list[HistoryEntry]
+
+
+class HistoryStore:
+    """
+    The game snapshots of the history directory, listed in an ``index.json`` manifest so the latest
+    snapshot, the latest ended rounds and the next number are known without listing or parsing the directory.
+    A directory without index (written before the store) is indexed once, by ``migrate``.
+    New snapshots are written in ``format``, binary or JSON, and both are read back.
+
+    The index is kept in memory and every write runs on ``worker``, each file replaced at once (temp file and rename),
+    successive index writes coalesced. A snapshot waiting for its write is loaded from memory.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = HISTORY_PATH,
+        format: str = HISTORY_FORMAT,
+        worker: PersistenceWorker = PERSISTENCE_WORKER,
+    ):
+        self.path = Path(path)
+        self.format = format
+        self.worker = worker
+        self.__index: Optional[HistoryIndex] = None
+        # Snapshots waiting for their write, by file path, shared with the worker thread under the lock
+        self.__pending: dict[str, GameHistoryData] = {}
+        self.__pending_lock = threading.Lock()
+
+    @property
+    def index(self) -> HistoryIndex:
+        if self.__index is None:
+            index_path = self.path / HISTORY_INDEX_FILE
+            if index_path.is_file():
+                with open(index_path, "r") as file:
+                    self.__index = json.load(file)
+            else:
+                self.migrate()
+        return self.__index
+
+    def entries(self) -> list[HistoryEntry]:
+        return self.index["entries"]
+
+    def append(self, data: GameHistoryData) -> HistoryEntry:
+        """
+        Write a new snapshot and list it in the index.
+        :param data: The game history data.
+        :return: The entry of the snapshot.
+        :rtype: HistoryEntry
+        """
+        index = self.index
+        entry: HistoryEntry = {
+            "id": index["next_id"],
+            "file": f"{index['next_id']}{HISTORY_EXTENSIONS[self.format]}",
+            "end_game": bool(data["end_game"]),
+        }
+        file_path = self.file_path(entry)
+        # GameHistory updates its data in place, the write keeps the snapshot of now
+        data = dict(data)
+        with self.__pending_lock:
+            self.__pending[file_path] = data
+
+        def write_snapshot() -> None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if self.format == "binary":
+                write_atomic(file_path, encode_history(data, HISTORY_COMPRESSION))
+            else:
+                write_atomic(file_path, json.dumps(data, indent=4))
+            with self.__pending_lock:
+                if self.__pending.get(file_path) is data:
+                    del self.__pending[file_path]
+
+        self.worker.submit(write_snapshot)
+
+        index["entries"].append(entry)
+        index["next_id"] += 1
+        self.__write_index()
+        return entry
+
+    def latest_entry(self) -> Optional[HistoryEntry]:
+        entries = self.entries()
+        return entries[-1] if len(entries) > 0 else None
+
+    def recent_entries(self, count: int, end_game_only: bool = False) -> list[HistoryEntry]:
+        """
+        Get the latest entries of the index, oldest first.
+        :param count: Number of entries returned, at most.
+        :param end_game_only: Whether to only count the snapshots taken at the end of a round.
+        :return: The entries.
+        :rtype: list[HistoryEntry]
+        """
+        if count <= 0:
+            return []
+        entries = self.entries()
+        if end_game_only:
+            entries = [entry for entry in entries if entry["end_game"]]
+        return entries[-count:]
+
+    def file_path(self, entry: HistoryEntry) -> str:
+        return os.path.join(self.path, entry["file"])
+
+    def load(self, entry: HistoryEntry) -> GameHistoryData:
+        return self.load_file(self.file_path(entry))
+
+    def load_file(self, file_path: str) -> GameHistoryData:
+        """
+        Read a snapshot file, binary or JSON depending on its extension.
+        :param file_path: Path of the snapshot.
+        :return: The game history data.
+        :rtype: GameHistoryData
+        """
+        with self.__pending_lock:
+            pending_data = self.__pending.get(file_path)
+        if pending_data is not None:
+            return pending_data
+        if file_path.endswith(HISTORY_EXTENSIONS["binary"]):
+            with open(file_path, "rb") as file:
+                return decode_history(file.read())
+        with open(file_path, "r") as file:
+            return json.load(file)
+
+    def remove(self, entry: HistoryEntry) -> None:
+        """
+        Delete a snapshot and drop it from the index.
+        :param entry: The entry of the snapshot.
+        :return: None
+        """
+        file_path = self.file_path(entry)
+        with self.__pending_lock:
+            self.__pending.pop(file_path, None)
+        self.worker.submit(lambda: self.__remove_file(file_path))
+        self.index["entries"].remove(entry)
+        self.__write_index()
+
+    def clear(self) -> None:
+        """
+        Delete every snapshot, the numbering starts over.
+        :return: None
+        """
+        for entry in self.entries():
+            file_path = self.file_path(entry)
+            with self.__pending_lock:
+                self.__pending.pop(file_path, None)
+            self.worker.submit(lambda file_path=file_path: self.__remove_file(file_path))
+        self.__index = {"version": HISTORY_INDEX_VERSION, "next_id": 0, "entries": []}
+        self.__write_index()
+
+    def migrate(self) -> HistoryIndex:
+        """
+        Rebuild the index from the snapshot files of the directory (``<number>.bin`` or ``<number>.json``),
+        reading each file once for its ``end_game`` flag. Unreadable files are left out.
+        :return: The new index.
+        :rtype: HistoryIndex
+        """
+        self.worker.flush()
+        self.path.mkdir(parents=True, exist_ok=True)
+        entries: list[HistoryEntry] = []
+        for entry in os.scandir(self.path):
+            name, extension = os.path.splitext(entry.name)
+            if (
+                not entry.is_file()
+                or extension not in HISTORY_EXTENSIONS.values()
+                or not name.isdigit()
+            ):
+                continue
+            try:
+                data = self.load_file(entry.path)
+            except (OSError, ValueError, KeyError, IndexError):
+                continue
+            if not isinstance(data, dict):
+                continue
+            entries.append(
+                {"id": int(name), "file": entry.name, "end_game": bool(data.get("end_game"))}
+            )
+        entries.sort(key=lambda entry: entry["id"])
+
+        self.__index = {
+            "version": HISTORY_INDEX_VERSION,
+            "next_id": entries[-1]["id"] + 1 if len(entries) > 0 else 0,
+            "entries": entries,
+        }
+        self.__write_index()
+        return self.__index
+
+    def __write_index(self) -> None:
+        # Serialised now, the index keeps changing while the write waits
+        content = json.dumps(self.__index)
+
+        def write_index() -> None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path / HISTORY_INDEX_FILE, content)
+
+        # Queued after the snapshot writes, the index never lists a snapshot not written yet
+        self.worker.submit(write_index, key=("history_index", str(self.path)))
+
+    @staticmethod
+    def __remove_file(file_path: str) -> None:
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+
+# Store of the .history directory, shared by the game, the history and the AI agents
+HISTORY_STORE = HistoryStore()
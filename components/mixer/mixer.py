@@ -7,7 +7,8 @@ from utils.constants import (
     BGM_PATH,
 )
 
-from utils.enums import ActionType
+from utils.enums import ActionType, EventLevel, EventType
+from utils.event_bus import emit_event
 from pygame.mixer import Sound, Channel
 from typing import Literal, Optional
 
@@ -197,7 +198,12 @@ class Mixer:
         :param is_double_riichi: Boolean indicating if the riichi is a double riichi.
         :return: None
         """
-        print(f"Adding sound queue for {action}")
+        emit_event(
+            EventType.SOUND,
+            EventLevel.DEBUG,
+            "Adding sound queue for {action}",
+            action=action,
+        )
         if action == ActionType.DISCARD:
             self.__queue.append(self.discard_tile_sound)
         if action == ActionType.CHII:
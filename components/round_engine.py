@@ -0,0 +1,1267 @@
+import random
+import typing
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Iterator
+from mahjong.hand_calculating.hand_config import HandConfig
+from mahjong.hand_calculating.hand_response import HandResponse
+from mahjong.meld import Meld
+from components.game_event_log import GameRoundLog, GameEvent, MeldLog
+from shared.random_seed import generate_random_seed
+from shared.reproduce_tenhou import reproduce_tenhou
+from utils.constants import HAND_CONFIG_OPTIONS
+from utils.enums import ActionType, CallType, Direction, RoundPhase
+from utils.hand_value_service import estimate_hand_value
+from utils.round_rules import (
+    abortive_draw_reason,
+    call_priority,
+    can_declare_kan,
+    closed_waits,
+    is_kyuushu_kyuuhai,
+    is_nagashi_mangan,
+    is_suufon_renda,
+    keeps_dealer,
+    nagashi_mangan_deltas,
+    tenpai_deltas,
+    tsumi_after_win,
+    ura_dora_positions,
+    win_deltas,
+    win_situation,
+)
+from utils.shanten_service import calculate_shanten
+from utils.tile_names import AKA_DORA_HAND136, tile_to_str
+from utils.ukeire import rank_discards
+
+# Hanchan ends once South 4 is over without a renchan
+HANCHAN_LAST_ROUND = (Direction.SOUTH, 4)
+
+
+def to_hand34(tiles: list[int]) -> list[int]:
+    """
+    Convert a list of hand136 indices to a 34-array hand representation.
+    :param tiles: List of hand136 indices.
+    :return: A list of integers representing the 34-array hand.
+    :rtype: list[int]
+    """
+    hand34 = [0] * 34
+    for tile in tiles:
+        hand34[tile // 4] += 1
+    return hand34
+
+
+@dataclass
+class SeatState:
+    """
+    Plain data state of one seat in a headless round.
+
+    :cvar seat: Absolute seat index (0-3), same as ``Player.player_idx``.
+    :cvar direction: Seat wind for the current round.
+    :cvar initial_direction: Seat wind at the start of the hanchan, used for rank tie breaks.
+    :cvar points: Current points.
+    :cvar hand: Concealed tiles (hand136 indices).
+    :cvar discards: Visible discards, called tiles are removed.
+    :cvar all_discards: Every discarded tile, used for furiten.
+    :cvar melds: Melds for the hand calculator.
+    :cvar meld_tiles: Every tile inside the melds (``Player.call_tiles_list``).
+    :cvar draw_tile: The latest drawn tile.
+    :cvar rinshan: Whether the latest draw came from the death wall.
+    :cvar riichi_turn: Turn number riichi was declared, -1 if not riichi.
+    :cvar riichi_discard: The sideways riichi discard.
+    :cvar can_call: Calls available for the pending decision.
+    :cvar winning_kinds: Hand34 kinds completing the 13-tile hand.
+    :cvar kuikae_kinds: Hand34 kinds that can not be discarded right after a call.
+    """
+    seat: int
+    direction: Direction
+    initial_direction: Direction
+    points: int = 25000
+    hand: list[int] = field(default_factory=list)
+    discards: list[int] = field(default_factory=list)
+    all_discards: list[int] = field(default_factory=list)
+    melds: list[Meld] = field(default_factory=list)
+    meld_tiles: list[int] = field(default_factory=list)
+    draw_tile: Optional[int] = None
+    rinshan: bool = False
+    turn: int = 0
+    riichi_turn: int = -1
+    riichi_discard: Optional[int] = None
+    temporary_furiten: bool = False
+    riichi_furiten: bool = False
+    discard_furiten: bool = False
+    skip_yao9: bool = False
+    can_call: list[CallType] = field(default_factory=list)
+    winning_kinds: list[int] = field(default_factory=list)
+    kuikae_kinds: list[int] = field(default_factory=list)
+
+    def is_riichi(self) -> int:
+        """
+        Return the turn number called riichi, -1 if not riichi.
+        """
+        return self.riichi_turn
+
+    def is_closed(self) -> bool:
+        return all(not meld.opened for meld in self.melds)
+
+
+@dataclass
+class RoundResult:
+    """
+    Outcome of one headless round.
+
+    :cvar deltas: Score changes for each seat (in hundreds, same as ``GameManager.end_match``).
+    :cvar win_seat: Seat who won, None on ryuukyoku.
+    :cvar from_seat: Seat who dealt in, None on tsumo or ryuukyoku.
+    :cvar win_tile: The winning tile.
+    :cvar hand_result: Hand calculator response for the win.
+    :cvar ryuukyoku: Whether the round ended in a draw.
+    :cvar ryuukyoku_reason: Reason of an abortive draw, None on exhaustive draw.
+    :cvar tenpai_seats: Seats tenpai at exhaustive draw.
+    :cvar keep_direction: Whether the dealer keeps the seat (renchan).
+    :cvar log: Round log in the ``GameEventLog`` layout.
+    """
+    deltas: list[int]
+    win_seat: Optional[int] = None
+    from_seat: Optional[int] = None
+    win_tile: Optional[int] = None
+    hand_result: Optional[HandResponse] = None
+    ryuukyoku: bool = False
+    ryuukyoku_reason: Optional[str] = None
+    tenpai_seats: list[int] = field(default_factory=list)
+    keep_direction: bool = False
+    log: Optional[GameRoundLog] = None
+
+
+class EnginePolicy(typing.Protocol):
+    """
+    Anything able to take decisions for a seat of ``RoundEngine``.
+
+    ``make_move`` answers the pending decision of ``seat`` with an action and, for DISCARD or RIICHI,
+    the hand136 index of the tile to discard (None lets the engine pick one).
+    """
+
+    def make_move(
+        self, engine: "RoundEngine", seat: int
+    ) -> tuple[ActionType, Optional[int]]: ...
+
+
+class ShantenPolicy:
+    """
+    Tile efficiency bot for the headless engine: always wins and riichi when possible,
+    never calls, and discards by shanten then ukeire (``Player.pick_tile``).
+    """
+
+    def make_move(
+        self, engine: "RoundEngine", seat: int
+    ) -> tuple[ActionType, Optional[int]]:
+        state = engine.seats[seat]
+        if CallType.RON in state.can_call:
+            return ActionType.RON, None
+        if CallType.TSUMO in state.can_call:
+            return ActionType.TSUMO, None
+        if CallType.RIICHI in state.can_call:
+            return ActionType.RIICHI, engine.pick_tile(seat, riichi=True)
+        if len(state.can_call) > 0:
+            return ActionType.SKIP, None
+        return ActionType.DISCARD, engine.pick_tile(seat)
+
+
+class RoundEngine:
+    """
+    Headless rules engine for a single round (kyoku), extracted from ``GameManager``.
+
+    The state is kept as plain data (hand136 indices, ``SeatState``) and is advanced one step at a time
+    with ``step``, without any rendering, sound or wall-clock waits. The wall is reproduced from a Tenhou seed
+    like ``Deck``, and the rules (call priority, abortive draws, waits, situational yaku, score deltas)
+    are those of ``utils.round_rules``, shared with ``GameManager``.
+
+    :ivar seats: State of each seat, indexed by absolute seat index.
+    :ivar full_deck: The wall after cutting.
+    :ivar draw_deck: Tiles left to draw (drawn from the end).
+    :ivar death_wall: Death wall tiles.
+    :ivar dora: Dora indicators.
+    :ivar phase: Current ``RoundPhase``.
+    :ivar current_seat: Seat of the current turn.
+    :ivar calling_seat: Seat answering the latest discard, if any.
+    :ivar call_order: Seats waiting to answer, the next one is popped from the end.
+    :ivar latest_discard: The latest discarded tile (or kakan tile when checking chankan).
+    :ivar kan_count: Number of kans in the round.
+    :ivar tsumi_number: Number of tsumi (honba) sticks.
+    :ivar kyoutaku_number: Number of riichi sticks on the table.
+    :ivar result: Round outcome once ``phase`` is END.
+    """
+
+    def __init__(
+        self,
+        points: list[int],
+        directions: list[Direction],
+        round_direction: Direction = Direction.EAST,
+        round_direction_number: int = 1,
+        tsumi_number: int = 0,
+        kyoutaku_number: int = 0,
+        seed: Optional[str] = None,
+        initial_directions: Optional[list[Direction]] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Create a round and deal the starting hands.
+        :param points: Points of each seat.
+        :param directions: Seat wind of each seat.
+        :param round_direction: Round wind.
+        :param round_direction_number: Round number inside the round wind (1-4).
+        :param tsumi_number: Number of tsumi sticks.
+        :param kyoutaku_number: Number of riichi sticks carried over.
+        :param seed: Tenhou seed for the wall, a new one is generated when None.
+        :param initial_directions: Seat winds at the start of the hanchan, defaults to ``directions``.
+        :param rng: Random generator for choices the rules leave open (which chii to take).
+        """
+        self.round_direction = round_direction
+        self.round_direction_number = round_direction_number
+        self.tsumi_number = tsumi_number
+        self.kyoutaku_number = kyoutaku_number
+        self.seed = seed if seed else generate_random_seed()
+        self.rng = rng if rng else random.Random()
+        if initial_directions is None:
+            initial_directions = directions
+
+        self.seats: list[SeatState] = [
+            SeatState(
+                seat=i,
+                direction=directions[i],
+                initial_direction=initial_directions[i],
+                points=points[i],
+            )
+            for i in range(4)
+        ]
+
+        self.phase = RoundPhase.DRAW
+        self.current_seat = self.find_seat(Direction.EAST)
+        self.calling_seat: Optional[int] = None
+        self.call_order: list[int] = []
+        self.latest_discard: Optional[int] = None
+        self.discard_seat: Optional[int] = None
+        self.kan_count = 0
+        self.result: Optional[RoundResult] = None
+
+        self.__rinshan_pending = False
+        self.__chankan_seat: Optional[int] = None
+
+        self.__deal()
+
+    # ---------------- public API ----------------
+    def find_seat(self, direction: Direction) -> int:
+        """
+        Find the seat sitting at the given wind.
+        """
+        for state in self.seats:
+            if state.direction == direction:
+                return state.seat
+        raise ValueError(f"No seat with direction {direction}")
+
+    def pending_seat(self) -> Optional[int]:
+        """
+        Get the seat whose decision ``step`` would ask for next.
+        :return: The seat index, or None if the next step needs no decision.
+        :rtype: int | None
+        """
+        match self.phase:
+            case RoundPhase.TURN:
+                state = self.seats[self.current_seat]
+                if state.is_riichi() >= 0 and len(state.can_call) == 0:
+                    return None  # Auto discard while riichi
+                return self.current_seat
+            case RoundPhase.CALL:
+                return self.calling_seat
+        return None
+
+    def step(self, policies: list[EnginePolicy]) -> bool:
+        """
+        Advance the round by one step: a draw, or one decision of the pending seat.
+        :param policies: Policy of each seat.
+        :return: False once the round is over, True otherwise.
+        :rtype: bool
+        """
+        if self.phase == RoundPhase.END:
+            return False
+
+        if self.phase == RoundPhase.DRAW:
+            self.__draw()
+            return True
+
+        seat = self.pending_seat()
+        if seat is None:
+            # Riichi: discard the drawn tile
+            state = self.seats[self.current_seat]
+            self.apply(self.current_seat, ActionType.DISCARD, state.draw_tile)
+        else:
+            action, tile = policies[seat].make_move(self, seat)
+            self.apply(seat, action, tile)
+        return self.phase != RoundPhase.END
+
+    def run(self, policies: list[EnginePolicy]) -> RoundResult:
+        """
+        Play the round until the end.
+        :param policies: Policy of each seat.
+        :return: The round result.
+        :rtype: RoundResult
+        """
+        while self.step(policies):
+            pass
+        return self.result
+
+    def apply(self, seat: int, action: ActionType, tile: Optional[int] = None) -> None:
+        """
+        Apply the decision of the pending seat.
+        :param seat: The deciding seat.
+        :param action: The chosen action.
+        :param tile: Tile to discard for DISCARD and RIICHI, None to let the engine pick.
+        :return: None
+        """
+        if seat != self.pending_seat() and not (
+            self.phase == RoundPhase.TURN and seat == self.current_seat
+        ):
+            raise ValueError(f"Seat {seat} is not waiting for a decision")
+
+        if self.phase == RoundPhase.TURN:
+            self.__apply_turn(self.seats[seat], action, tile)
+        elif self.phase == RoundPhase.CALL:
+            self.__apply_call(self.seats[seat], action)
+
+    def legal_discards(self, seat: int, riichi: bool = False) -> list[int]:
+        """
+        Get the tiles the seat is allowed to discard.
+        :param seat: The seat index.
+        :param riichi: Whether the discard declares riichi (hand must stay tenpai).
+        :return: List of hand136 indices.
+        :rtype: list[int]
+        """
+        state = self.seats[seat]
+        if state.is_riichi() >= 0:
+            return [state.draw_tile]
+        if riichi:
+            return [
+                tile
+                for tile in state.hand
+                if self.shanten([_tile for _tile in state.hand if _tile != tile]) == 0
+            ]
+        tiles = [tile for tile in state.hand if tile // 4 not in state.kuikae_kinds]
+        return tiles if len(tiles) > 0 else list(state.hand)
+
+    def pick_tile(self, seat: int, riichi: bool = False) -> int:
+        """
+        Pick the legal discard with the lowest shanten, then the most unseen effective tiles (ukeire).
+        :param seat: The seat index.
+        :param riichi: Whether the discard declares riichi.
+        :return: The hand136 index to discard.
+        :rtype: int
+        """
+        legal_tiles = self.legal_discards(seat, riichi)
+        best_kind = rank_discards(
+            to_hand34(self.seats[seat].hand),
+            self.visible_hand34(),
+            [tile // 4 for tile in legal_tiles],
+        )[0].kind
+        # Keep the aka dora when a plain copy of the kind can go
+        return min(
+            (tile for tile in legal_tiles if tile // 4 == best_kind),
+            key=lambda tile: tile in AKA_DORA_HAND136,
+        )
+
+    def visible_hand34(self) -> list[int]:
+        """
+        Count the tiles seen on the table: every discard, every meld and the dora indicators.
+        :return: A 34-array of visible tile counts.
+        :rtype: list[int]
+        """
+        visible34 = [0] * 34
+        for state in self.seats:
+            for tile in state.discards:
+                visible34[tile // 4] += 1
+            for tile in state.meld_tiles:
+                visible34[tile // 4] += 1
+        for tile in self.dora:
+            visible34[tile // 4] += 1
+        return visible34
+
+    def shanten(self, tiles: list[int]) -> int:
+        """
+        Count the shanten points of the given hand136 tiles.
+        """
+        return calculate_shanten(to_hand34(tiles))
+
+    def visible_dora(self) -> list[int]:
+        return list(self.dora)
+
+    # ---------------- setup ----------------
+    def __deal(self) -> None:
+        """
+        Build the wall from the seed (same cut as ``Deck.create_new_deck``) and deal 13 tiles each.
+        """
+        wall, dices = reproduce_tenhou(self.seed, 1)[0]
+        dices_score = sum(dices)
+        cutting_points = 34 * ((dices_score - 1) % 4 + 1) - 2 * dices_score
+
+        self.full_deck: list[int] = wall[cutting_points:] + wall[0:cutting_points]
+        self.draw_deck: list[int] = self.full_deck[2 * 7 :]
+        self.death_wall: list[int] = self.full_deck[0 : 2 * 7]
+        self.current_dora_idx = 5
+        self.dora: list[int] = []
+
+        for i in range(4):
+            for k in range(4):
+                state = self.seats[self.find_seat(Direction(k))]
+                for _ in range(1 if i == 3 else 4):
+                    state.hand.append(self.draw_deck.pop())
+
+        for state in self.seats:
+            state.hand.sort(key=lambda tile: tile // 4)
+
+        self.log: GameRoundLog = {
+            "tenhou_seed": self.seed,
+            "dealer": self.find_seat(Direction.EAST),
+            "agari": None,
+            "events": [],
+            "hands": [list(map(tile_to_str, state.hand)) for state in self.seats],
+            "deltas": [0, 0, 0, 0],
+            "turns": [0, 0, 0, 0],
+            "reaches": [],
+            "reach_turns": [],
+            "round": [
+                f"{self.round_direction} {self.round_direction_number}",
+                self.tsumi_number,
+                self.kyoutaku_number,
+            ],
+            "ryuukyoku": False,
+            "ryuukyoku_tenpai": None,
+        }
+        self.__add_new_dora()
+
+    def __add_new_dora(self) -> None:
+        tile = self.death_wall[self.current_dora_idx]
+        self.dora.append(tile)
+        self.current_dora_idx += 2
+        new_event: GameEvent = {"type": "Dora", "tile": tile_to_str(tile)}
+        self.log["events"].append(new_event)
+
+    def __refill_death_wall(self) -> None:
+        while len(self.death_wall) < 14:
+            self.death_wall.append(self.draw_deck.pop(0))
+            self.current_dora_idx -= 1
+
+    # ---------------- turn ----------------
+    def __draw(self) -> None:
+        state = self.seats[self.current_seat]
+        if self.__rinshan_pending:
+            tile = self.death_wall.pop(0)
+            self.__refill_death_wall()
+            self.__rinshan_pending = False
+            state.rinshan = True
+        else:
+            tile = self.draw_deck.pop()
+            state.rinshan = False
+
+        state.hand.append(tile)
+        state.draw_tile = tile
+        self.__log_event("Draw", tile, state.seat)
+
+        self.__check_self_calls(state)
+        self.phase = RoundPhase.TURN
+
+    def __check_self_calls(self, state: SeatState) -> None:
+        """
+        Checking for tsumo, riichi, kan and kyuushu kyuuhai after a draw.
+        """
+        state.can_call = []
+        self.__build_winning_kinds(state)
+        if self.__is_tsumo_able(state):
+            state.can_call.append(CallType.TSUMO)
+
+        if state.is_riichi() < 0:
+            if self.__is_riichi_able(state):
+                state.can_call.append(CallType.RIICHI)
+            if self.__is_self_kan_able(state):
+                state.can_call.append(CallType.KAN)
+            if self.__is_yao9_able(state):
+                state.can_call.append(CallType.RYUUKYOKU)
+
+        if self.kan_count >= 4:
+            state.can_call = []
+        if len(state.can_call) > 0:
+            state.can_call.append(CallType.SKIP)
+
+    def __apply_turn(
+        self, state: SeatState, action: ActionType, tile: Optional[int]
+    ) -> None:
+        if action not in (ActionType.DISCARD, ActionType.SKIP) and (
+            action.value >= len(CallType)
+            or CallType(action.value) not in state.can_call
+        ):
+            raise ValueError(f"Seat {state.seat} can not {action} now")
+
+        match action:
+            case ActionType.TSUMO:
+                self.__win(state, None, state.draw_tile)
+
+            case ActionType.RIICHI:
+                if tile is None or tile not in self.legal_discards(state.seat, True):
+                    tile = self.pick_tile(state.seat, riichi=True)
+                state.riichi_turn = state.turn
+                state.points -= 1000
+                self.kyoutaku_number += 1
+                self.log["reaches"].append(state.seat)
+                self.log["reach_turns"].append(state.turn)
+                self.__discard(state, tile)
+
+            case ActionType.KAN:
+                self.__self_kan(state)
+
+            case ActionType.RYUUKYOKU:
+                self.__abort("Kyuushu Kyuuhai")
+
+            case ActionType.SKIP:
+                if CallType.RYUUKYOKU in state.can_call:
+                    state.skip_yao9 = True
+                state.can_call = []
+
+            case ActionType.DISCARD:
+                if tile is None:
+                    tile = self.pick_tile(state.seat)
+                if tile not in self.legal_discards(state.seat):
+                    raise ValueError(
+                        f"Seat {state.seat} can not discard {tile_to_str(tile)}"
+                    )
+                self.__discard(state, tile)
+
+    def __discard(self, state: SeatState, tile: int) -> None:
+        state.hand.remove(tile)
+        state.hand.sort(key=lambda _tile: _tile // 4)
+        state.discards.append(tile)
+        state.all_discards.append(tile)
+        # Riichi sideway discard, moves to the next discard if the previous one got called
+        if state.is_riichi() >= 0 and state.riichi_discard not in state.discards:
+            state.riichi_discard = tile
+        state.turn += 1
+        state.temporary_furiten = False
+        state.kuikae_kinds = []
+        state.can_call = []
+        self.__log_event("Discard", tile, state.seat)
+
+        self.latest_discard = tile
+        self.discard_seat = state.seat
+        self.__check_discard_calls(state)
+
+    def __check_discard_calls(self, discard_state: SeatState) -> None:
+        """
+        Checking for Suufon Renda and every call on the latest discard, then switch turn.
+        """
+        tile = self.latest_discard
+
+        # Checking for kaze4
+        if is_suufon_renda(
+            [state.turn for state in self.seats],
+            [[discard // 4 for discard in state.discards] for state in self.seats],
+        ):
+            return self.__abort("Suufon Renda")
+
+        next_direction = Direction((discard_state.direction.value + 1) % 4)
+        for state in self.seats:
+            if state.seat == discard_state.seat:
+                continue
+            self.__check_calls_on_tile(
+                state, tile, check_chii=state.direction == next_direction
+            )
+
+        if self.__build_call_order(discard_state):
+            return
+
+        # Checking for Kan4 and Reach4
+        reason = abortive_draw_reason(self.kan_count, len(self.log["reaches"]))
+        if reason is not None:
+            return self.__abort(reason)
+
+        self.__next_turn()
+
+    def __build_call_order(self, discard_state: SeatState) -> bool:
+        """
+        Sort every seat able to call by call priority (RON > KAN > PON > CHII) and proximity to the discarder.
+        :return: True if someone can call.
+        """
+        call_order = [state for state in self.seats if len(state.can_call) > 0]
+        call_order.sort(
+            key=lambda state: call_priority(
+                state.can_call, discard_state.direction, state.direction
+            ),
+            reverse=True,
+        )
+        self.call_order = [state.seat for state in call_order]
+        if len(self.call_order) == 0:
+            return False
+        self.calling_seat = self.call_order.pop()
+        self.phase = RoundPhase.CALL
+        return True
+
+    def __next_turn(self) -> None:
+        self.latest_discard = None
+        self.calling_seat = None
+        self.call_order = []
+        for state in self.seats:
+            state.can_call = []
+
+        next_direction = Direction(
+            (self.seats[self.current_seat].direction.value + 1) % 4
+        )
+        self.current_seat = self.find_seat(next_direction)
+
+        # Check for deck exhaustion
+        if len(self.draw_deck) == 0:
+            return self.__exhaustive_draw()
+        self.phase = RoundPhase.DRAW
+
+    # ---------------- calls ----------------
+    def __check_calls_on_tile(
+        self, state: SeatState, tile: int, check_chii: bool = False
+    ) -> None:
+        state.can_call = []
+        self.__build_winning_kinds(state)
+        if self.__is_ron_able(state, tile):
+            state.can_call.append(CallType.RON)
+
+        if state.is_riichi() < 0:
+            count = to_hand34(state.hand)[tile // 4]
+            if count == 3 and can_declare_kan(self.kan_count, len(self.draw_deck)):
+                state.can_call.append(CallType.KAN)
+            if count >= 2:
+                state.can_call.append(CallType.PON)
+            if check_chii and len(self.__build_chii(state, tile)) > 0:
+                state.can_call.append(CallType.CHII)
+
+        if len(state.can_call) > 0:
+            state.can_call.append(CallType.SKIP)
+
+    def __apply_call(self, state: SeatState, action: ActionType) -> None:
+        if action != ActionType.SKIP and (
+            action.value >= len(CallType)
+            or CallType(action.value) not in state.can_call
+        ):
+            raise ValueError(f"Seat {state.seat} can not {action} now")
+
+        tile = self.latest_discard
+        discard_state = self.seats[self.discard_seat]
+        match action:
+            case ActionType.RON:
+                ron_count = len(
+                    [
+                        seat
+                        for seat in self.call_order
+                        if CallType.RON in self.seats[seat].can_call
+                    ]
+                )
+                # Checking for Ron3
+                if ron_count >= 2:
+                    return self.__abort("Sanchahou")
+                # Letting the first ron player win
+                self.__win(state, discard_state, tile)
+
+            case ActionType.SKIP:
+                if CallType.RON in state.can_call and state.is_riichi() >= 0:
+                    state.riichi_furiten = True
+                elif CallType.RON in state.can_call:
+                    state.temporary_furiten = True
+                state.can_call = []
+
+                if len(self.call_order) > 0:
+                    self.calling_seat = self.call_order.pop()
+                    return
+
+                self.calling_seat = None
+                if self.__chankan_seat is not None:
+                    # Nobody robbed the kakan, let the kan player draw again
+                    self.current_seat = self.__chankan_seat
+                    self.__chankan_seat = None
+                    self.latest_discard = None
+                    self.phase = RoundPhase.DRAW
+                    return
+
+                reason = abortive_draw_reason(self.kan_count, len(self.log["reaches"]))
+                if reason is not None:
+                    return self.__abort(reason)
+                self.__next_turn()
+
+            case ActionType.CHII:
+                patterns = self.__build_chii(state, tile)
+                call_tiles = patterns[self.rng.randint(0, len(patterns) - 1)]
+                self.__open_call(state, discard_state, tile, call_tiles, Meld.CHI)
+                # Kuikae: no discarding the stolen kind or the other end of the chii
+                state.kuikae_kinds = [tile // 4]
+                kinds = sorted(_tile // 4 for _tile in call_tiles + [tile])
+                if tile // 4 == kinds[0] and kinds[2] % 9 != 8:
+                    state.kuikae_kinds.append(kinds[2] + 1)
+                elif tile // 4 == kinds[2] and kinds[0] % 9 != 0:
+                    state.kuikae_kinds.append(kinds[0] - 1)
+
+            case ActionType.PON:
+                call_tiles = [
+                    hand_tile for hand_tile in state.hand if hand_tile // 4 == tile // 4
+                ][0:2]
+                self.__open_call(state, discard_state, tile, call_tiles, Meld.PON)
+                state.kuikae_kinds = [tile // 4]
+
+            case ActionType.KAN:
+                call_tiles = [
+                    hand_tile for hand_tile in state.hand if hand_tile // 4 == tile // 4
+                ]
+                self.kan_count += 1
+                self.__add_new_dora()
+                self.__open_call(state, discard_state, tile, call_tiles, Meld.KAN)
+                self.__rinshan_pending = True
+                self.phase = RoundPhase.DRAW
+
+    def __open_call(
+        self,
+        state: SeatState,
+        discard_state: SeatState,
+        tile: int,
+        call_tiles: list[int],
+        meld_type: str,
+    ) -> None:
+        """
+        Steal ``tile`` from the discarder and build an opened meld with ``call_tiles`` from hand.
+        """
+        discard_state.discards.remove(tile)
+        for hand_tile in call_tiles:
+            state.hand.remove(hand_tile)
+        meld_tiles = self.__arrange_meld_tiles(
+            call_tiles, tile, state.seat, discard_state.seat, meld_type
+        )
+        meld = Meld(
+            meld_type=meld_type,
+            tiles=meld_tiles,
+            opened=True,
+            called_tile=tile,
+            who=state.seat,
+            from_who=(discard_state.seat - state.seat) % 4,
+        )
+        state.melds.append(meld)
+        state.meld_tiles.extend(meld_tiles)
+        self.__log_call(state, meld, tile)
+
+        for other in self.seats:
+            other.can_call = []
+        self.call_order = []
+        self.calling_seat = None
+        self.latest_discard = None
+        self.current_seat = state.seat
+        self.phase = RoundPhase.TURN
+
+    def __self_kan(self, state: SeatState) -> None:
+        """
+        Ankan or kakan with the drawn tile, then check chankan or draw from the death wall.
+        """
+        tile = state.draw_tile
+        state.can_call = []
+        self.kan_count += 1
+        self.__add_new_dora()
+
+        pon_melds = [
+            meld
+            for meld in state.melds
+            if meld.type == Meld.PON and meld.tiles[0] // 4 == tile // 4
+        ]
+        state.hand.remove(tile)
+        if len(pon_melds) > 0:
+            # Kakan
+            pon = pon_melds[0]
+            meld = Meld(
+                meld_type=Meld.KAN,
+                tiles=pon.tiles + [tile],
+                opened=True,
+                called_tile=pon.called_tile,
+                who=state.seat,
+                from_who=pon.from_who,
+            )
+            state.melds[state.melds.index(pon)] = meld
+            state.meld_tiles.append(tile)
+            self.__log_call(state, meld, tile, is_kakan=True)
+
+            # Checking for Chankan
+            for other in self.seats:
+                if other.seat == state.seat:
+                    continue
+                self.__check_calls_on_tile(other, tile)
+                other.can_call = (
+                    [CallType.RON, CallType.SKIP]
+                    if CallType.RON in other.can_call
+                    else []
+                )
+            self.latest_discard = tile
+            self.discard_seat = state.seat
+            if self.__build_call_order(state):
+                self.__chankan_seat = state.seat
+                self.__rinshan_pending = True
+                return
+            self.latest_discard = None
+        else:
+            # Ankan
+            meld_tiles = [
+                hand_tile for hand_tile in state.hand if hand_tile // 4 == tile // 4
+            ] + [tile]
+            for hand_tile in meld_tiles[:-1]:
+                state.hand.remove(hand_tile)
+            meld_tiles.sort()
+            meld = Meld(
+                meld_type=Meld.KAN,
+                tiles=meld_tiles,
+                opened=False,
+                called_tile=None,
+                who=state.seat,
+                from_who=0,
+            )
+            state.melds.append(meld)
+            state.meld_tiles.extend(meld_tiles)
+            self.__log_call(state, meld, tile)
+
+        state.can_call = []
+        self.__rinshan_pending = True
+        self.phase = RoundPhase.DRAW
+
+    @staticmethod
+    def __build_chii(state: SeatState, tile: int) -> list[list[int]]:
+        """
+        Build possible chii calls with the given tile (pairs of hand tiles to meld with it).
+        """
+        kind = tile // 4
+        if kind >= 27:
+            return []
+
+        def find(target_kind: int) -> Optional[int]:
+            # Same suit only
+            if target_kind // 9 != kind // 9 or target_kind < 0:
+                return None
+            for hand_tile in state.hand:
+                if hand_tile // 4 == target_kind:
+                    return hand_tile
+            return None
+
+        first_tile = find(kind - 2)
+        second_tile = find(kind - 1)
+        third_tile = find(kind + 1)
+        fourth_tile = find(kind + 2)
+        patterns = []
+        if first_tile is not None and second_tile is not None:
+            patterns.append([first_tile, second_tile])
+        if second_tile is not None and third_tile is not None:
+            patterns.append([second_tile, third_tile])
+        if third_tile is not None and fourth_tile is not None:
+            patterns.append([third_tile, fourth_tile])
+        return patterns
+
+    @staticmethod
+    def __arrange_meld_tiles(
+        call_tiles: list[int], tile: int, who: int, from_seat: int, meld_type: str
+    ) -> list[int]:
+        """
+        Place the stolen tile the same way ``Call`` does: left for chii and kamicha,
+        middle for toimen, right for shimocha.
+        """
+        tiles = sorted(call_tiles)
+        if meld_type == Meld.CHI:
+            position = 0
+        else:
+            match (who - from_seat) % 4:
+                case 1:
+                    position = 0
+                case 2:
+                    position = 1
+                case _:
+                    position = len(tiles)
+        tiles.insert(position, tile)
+        return tiles
+
+    # ---------------- checks ----------------
+    def __build_winning_kinds(self, state: SeatState) -> None:
+        """
+        Look up the winning tile kinds for the 13-tile part of the hand.
+        """
+        draw_kind = state.draw_tile // 4 if state.draw_tile in state.hand else None
+        # Empty if current hand is not Tenpai (0 shanten), Furiten concept doesn't apply yet
+        state.winning_kinds = list(closed_waits(to_hand34(state.hand), draw_kind))
+
+    def __is_ron_able(self, state: SeatState, tile: int) -> bool:
+        # Check for temporary furiten and riichi furiten
+        if state.temporary_furiten or state.riichi_furiten:
+            return False
+
+        # Check for discard furiten
+        state.discard_furiten = any(
+            discard // 4 in state.winning_kinds for discard in state.all_discards
+        )
+        if state.discard_furiten or tile // 4 not in state.winning_kinds:
+            return False
+
+        result = self.__estimate(state, tile, False, self.dora)
+        return not result.error
+
+    def __is_tsumo_able(self, state: SeatState) -> bool:
+        if state.draw_tile // 4 not in state.winning_kinds:
+            return False
+        result = self.__estimate(state, state.draw_tile, True, self.dora)
+        return not result.error
+
+    def __is_riichi_able(self, state: SeatState) -> bool:
+        return (
+            state.is_closed()
+            and state.points >= 1000
+            and calculate_shanten(to_hand34(state.hand)) == 0
+        )
+
+    def __is_self_kan_able(self, state: SeatState) -> bool:
+        if not can_declare_kan(self.kan_count, len(self.draw_deck)):
+            return False
+        kind = state.draw_tile // 4
+        for meld in state.melds:
+            if meld.type == Meld.PON and meld.tiles[0] // 4 == kind:
+                return True  # Kakan from Pon
+        return to_hand34(state.hand)[kind] == 4  # Ankan
+
+    def __is_yao9_able(self, state: SeatState) -> bool:
+        return is_kyuushu_kyuuhai(
+            to_hand34(state.hand),
+            state.turn,
+            state.skip_yao9,
+            any(len(other.melds) > 0 for other in self.seats),
+        )
+
+    def __estimate(
+        self,
+        state: SeatState,
+        win_tile: int,
+        is_tsumo: bool,
+        dora_indicators: Optional[list[int]] = None,
+        config: Optional[HandConfig] = None,
+    ) -> HandResponse:
+        hand = list(state.hand)
+        if win_tile not in hand:
+            hand.append(win_tile)
+        if config is None:
+            config = HandConfig(
+                is_tsumo=is_tsumo,
+                is_riichi=state.is_riichi() >= 0,
+                round_wind=self.round_direction.value + 27,
+                player_wind=state.direction.value + 27,
+                tsumi_number=self.tsumi_number,
+                kyoutaku_number=self.kyoutaku_number,
+                options=HAND_CONFIG_OPTIONS,
+            )
+        return estimate_hand_value(
+            hand + state.meld_tiles,
+            win_tile=win_tile,
+            melds=state.melds,
+            dora_indicators=dora_indicators,
+            config=config,
+        )
+
+    # ---------------- end of round ----------------
+    def __win(
+        self, state: SeatState, from_state: Optional[SeatState], win_tile: int
+    ) -> None:
+        """
+        Score a tsumo (``from_state`` is None) or a ron, with the rules shared with ``GameManager.end_match``.
+        """
+        is_tsumo = from_state is None
+        is_dealer = state.direction == Direction.EAST
+        riichi_turn = state.is_riichi()
+        ura_dora = []
+        if riichi_turn >= 0:
+            ura_dora = [
+                self.death_wall[position]
+                for position in ura_dora_positions(len(self.dora))
+            ]
+        config = HandConfig(
+            **win_situation(
+                is_tsumo=is_tsumo,
+                is_dealer=is_dealer,
+                riichi_turn=riichi_turn,
+                turn=state.turn,
+                has_melds=len(state.melds) > 0,
+                is_rinshan=state.rinshan,
+                is_chankan=self.__chankan_seat is not None,
+                is_wall_empty=len(self.draw_deck) == 0,
+            ),
+            player_wind=state.direction.value + 27,
+            round_wind=self.round_direction.value + 27,
+            tsumi_number=self.tsumi_number,
+            kyoutaku_number=self.kyoutaku_number,
+            options=HAND_CONFIG_OPTIONS,
+        )
+        result = self.__estimate(
+            state, win_tile, is_tsumo, self.dora + ura_dora, config=config
+        )
+        if result.error:
+            raise ValueError(f"Seat {state.seat} can not win: {result.error}")
+
+        directions = [seat_state.direction for seat_state in self.seats]
+        deltas = win_deltas(
+            int(result.cost["total"] / 100),
+            state.seat,
+            None if is_tsumo else from_state.seat,
+            directions,
+            self.tsumi_number,
+            self.kyoutaku_number,
+        )
+
+        self.log["agari"] = {
+            "type": "TSUMO" if is_tsumo else "RON",
+            "player": state.seat,
+        }
+        self.kyoutaku_number = 0
+        self.tsumi_number = tsumi_after_win(is_dealer, self.tsumi_number)
+
+        self.__end(
+            RoundResult(
+                deltas=deltas,
+                win_seat=state.seat,
+                from_seat=None if is_tsumo else from_state.seat,
+                win_tile=win_tile,
+                hand_result=result,
+                keep_direction=keeps_dealer(directions, win_seat=state.seat),
+            )
+        )
+
+    def __exhaustive_draw(self) -> None:
+        """
+        Handle ryuukyoku when the wall is exhausted: nagashi mangan, otherwise tenpai payments.
+        """
+        directions = [state.direction for state in self.seats]
+        tenpai_seats = [
+            state.seat for state in self.seats if self.shanten(state.hand) == 0
+        ]
+
+        # Check nagashi mangan player
+        nagashi_mangan_state = None
+        for direction in Direction:
+            state = self.seats[self.find_seat(direction)]
+            if is_nagashi_mangan(
+                [tile // 4 for tile in state.discards], len(state.all_discards)
+            ):
+                nagashi_mangan_state = state
+                break
+
+        if nagashi_mangan_state:
+            result = estimate_hand_value(
+                tiles=[],
+                win_tile=None,
+                config=HandConfig(is_nagashi_mangan=True, options=HAND_CONFIG_OPTIONS),
+            )
+            deltas = nagashi_mangan_deltas(
+                int(result.cost["total"] / 100), nagashi_mangan_state.seat, directions
+            )
+        else:
+            deltas = tenpai_deltas(tenpai_seats)
+
+        self.log["ryuukyoku"] = True
+        if not nagashi_mangan_state:
+            self.log["ryuukyoku_tenpai"] = (
+                tenpai_seats if len(tenpai_seats) > 0 else None
+            )
+        self.__end(
+            RoundResult(
+                deltas=deltas,
+                ryuukyoku=True,
+                tenpai_seats=tenpai_seats,
+                keep_direction=keeps_dealer(directions, tenpai_seats=tenpai_seats),
+            )
+        )
+
+    def __abort(self, reason: str) -> None:
+        """
+        Abortive draw (tochuu ryuukyoku): no payments and the dealer keeps the seat.
+        """
+        self.log["ryuukyoku"] = True
+        self.__end(
+            RoundResult(
+                deltas=[0, 0, 0, 0],
+                ryuukyoku=True,
+                ryuukyoku_reason=reason,
+                keep_direction=keeps_dealer(
+                    [state.direction for state in self.seats], aborted=True
+                ),
+            )
+        )
+
+    def __end(self, result: RoundResult) -> None:
+        for state in self.seats:
+            state.points += result.deltas[state.seat] * 100
+            state.can_call = []
+        self.log["deltas"] = result.deltas
+        self.log["turns"] = [state.turn for state in self.seats]
+        result.log = self.log
+        self.result = result
+        self.calling_seat = None
+        self.call_order = []
+        self.phase = RoundPhase.END
+
+    # ---------------- log ----------------
+    def __log_event(self, event_type: str, tile: int, seat: int) -> None:
+        new_event: GameEvent = {
+            "type": event_type,
+            "tile": tile_to_str(tile),
+            "player": seat,
+        }
+        self.log["events"].append(new_event)
+
+    def __log_call(
+        self, state: SeatState, meld: Meld, tile: int, is_kakan: bool = False
+    ) -> None:
+        meld_type = None
+        match meld.type:
+            case Meld.CHI:
+                meld_type = "chi"
+            case Meld.PON:
+                meld_type = "pon"
+            case Meld.KAN:
+                meld_type = "chakan" if is_kakan else "kan"
+
+        new_meld: MeldLog = {
+            "fromPlayer": meld.from_who,
+            "called": meld.tiles.index(tile),
+            "tiles": list(map(tile_to_str, meld.tiles)),
+            "type": meld_type,
+        }
+        new_event: GameEvent = {"type": "Call", "player": state.seat, "meld": new_meld}
+        self.log["events"].append(new_event)
+
+
+@dataclass
+class HanchanResult:
+    """
+    Outcome of a full headless hanchan.
+
+    :cvar points: Final points of each seat.
+    :cvar placements: Final placement (1-4) of each seat.
+    :cvar deltas: Score deltas of each round.
+    :cvar rounds: Round logs in the ``GameEventLog`` layout.
+    :cvar seeds: Tenhou seeds used for each round.
+    """
+    points: list[int]
+    placements: list[int]
+    deltas: list[list[int]] = field(default_factory=list)
+    rounds: list[GameRoundLog] = field(default_factory=list)
+    seeds: list[str] = field(default_factory=list)
+
+
+class Hanchan:
+    """
+    Chain headless rounds into a hanchan, with the same direction rotation as ``GameBuilder``.
+
+    :ivar policies: Policy of each seat.
+    :ivar seed_factory: Callable returning the Tenhou seed of each round.
+    :ivar rng: Random generator for seat winds and engine choices.
+    """
+
+    def __init__(
+        self,
+        policies: list[EnginePolicy],
+        seed_factory: Callable[[], str] = generate_random_seed,
+        rng: Optional[random.Random] = None,
+        start_points: int = 25000,
+        max_rounds: int = 32,
+    ):
+        self.policies = policies
+        self.seed_factory = seed_factory
+        self.rng = rng if rng else random.Random()
+        self.start_points = start_points
+        self.max_rounds = max_rounds  # Safety cap against endless renchan
+        self.result: Optional[HanchanResult] = None
+
+    def new_directions(self) -> list[Direction]:
+        """
+        Randomly determine seat winds, same as ``GameBuilder.direction``.
+        """
+        current_direction = self.rng.randint(0, 3)
+        standard = [Direction.EAST, Direction.SOUTH, Direction.WEST, Direction.NORTH]
+        return standard[current_direction:] + standard[:current_direction]
+
+    def play(self) -> HanchanResult:
+        """
+        Play rounds from East 1 until South 4 is over (or someone drops below zero).
+        :return: The hanchan result.
+        :rtype: HanchanResult
+        """
+        for engine in self.rounds():
+            engine.run(self.policies)
+        return self.result
+
+    def rounds(self) -> Iterator[RoundEngine]:
+        """
+        Yield each round of the hanchan. The caller plays the round until the end before asking for the next one,
+        which lets several tables be stepped concurrently. ``result`` is set once the hanchan is over.
+        :return: Iterator of rounds to play.
+        :rtype: Iterator[RoundEngine]
+        """
+        directions = self.new_directions()
+        initial_directions = list(directions)
+        points = [self.start_points] * 4
+        round_direction = Direction.EAST
+        round_direction_number = 1
+        tsumi_number = 0
+        kyoutaku_number = 0
+        hanchan_result = HanchanResult(points=points, placements=[0, 0, 0, 0])
+
+        for _ in range(self.max_rounds):
+            seed = self.seed_factory()
+            engine = RoundEngine(
+                points,
+                directions,
+                round_direction,
+                round_direction_number,
+                tsumi_number,
+                kyoutaku_number,
+                seed=seed,
+                initial_directions=initial_directions,
+                rng=self.rng,
+            )
+            yield engine
+            result = engine.result
+            self.end_round(engine)
+
+            hanchan_result.seeds.append(seed)
+            hanchan_result.deltas.append(result.deltas)
+            hanchan_result.rounds.append(result.log)
+            points = [state.points for state in engine.seats]
+            tsumi_number = engine.tsumi_number
+            kyoutaku_number = engine.kyoutaku_number
+
+            if any(point < 0 for point in points):
+                break
+            if result.keep_direction:
+                continue
+            if (round_direction, round_direction_number) == HANCHAN_LAST_ROUND:
+                break
+
+            # Rotate direction counter-clockwise
+            directions = [Direction((direction.value - 1) % 4) for direction in directions]
+            if round_direction_number == 4:
+                round_direction = Direction((round_direction.value + 1) % 4)
+                round_direction_number = 1
+            else:
+                round_direction_number += 1
+
+        hanchan_result.points = points
+        hanchan_result.placements = self.placements(points, initial_directions)
+        self.result = hanchan_result
+
+    def end_round(self, engine: RoundEngine) -> None:
+        """
+        Hook called after each round is over.
+        """
+
+    @staticmethod
+    def placements(points: list[int], initial_directions: list[Direction]) -> list[int]:
+        """
+        Rank seats by points, ties broken by starting wind (same order as the AI encoder).
+        """
+        order = sorted(
+            range(4), key=lambda seat: (-points[seat], initial_directions[seat].value)
+        )
+        placements = [0, 0, 0, 0]
+        for rank, seat in enumerate(order):
+            placements[seat] = rank + 1
+        return placements
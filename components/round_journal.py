@@ -0,0 +1,148 @@
+import json
+import os
+import typing
+from pathlib import Path
+from typing import Optional, TypedDict
+from utils.constants import LOG_PATH
+from utils.persistence_worker import write_atomic
+
+if typing.TYPE_CHECKING:
+    from components.game_event_log import GameRoundLog
+
+JOURNAL_EXTENSION = ".jsonl"
+LOG_EXTENSION = ".json"
+
+
+class JournalRecord(TypedDict):
+    """
+    A line of a round journal.
+
+    :cvar idx: Index of the round in the game log (int).
+    :cvar round: The round, which replaces the round ``idx`` and drops the later ones,
+        None to only drop the rounds from ``idx`` (GameRoundLog | None).
+    """
+
+    idx: int
+    round: Optional["GameRoundLog"]
+
+
+class RoundJournal:
+    """
+    Append-only journal of the rounds of a game log, ``.log/<name>.jsonl``, one JSON record per line.
+
+    Each export appends the rounds it changed and fsyncs once, so its cost follows the rounds written,
+    not the whole game. After a crash the journal is read up to its last complete line.
+    ``compact`` writes the rounds in the JSON layout of the game logs, ``.log/<name>.json``, on demand.
+    A game log written before the journal is read from that JSON file, and copied to the journal on the first append.
+    """
+
+    def __init__(self, name: str, path: str | Path = LOG_PATH):
+        self.name = name
+        self.path = Path(path)
+        self.journal_path = self.path / f"{name}{JOURNAL_EXTENSION}"
+        self.log_path = self.path / f"{name}{LOG_EXTENSION}"
+        # Byte offset after the last complete record, known once the journal is replayed
+        self.__end: Optional[int] = None
+
+    def exists(self) -> bool:
+        return self.journal_path.is_file() or self.log_path.is_file()
+
+    def read(self) -> list["GameRoundLog"]:
+        """
+        Replay the journal, up to its last complete record.
+        :return: The rounds of the game log.
+        :rtype: list[GameRoundLog]
+        """
+        if not self.journal_path.is_file():
+            return self.__read_log()
+        rounds, _ = self.__replay()
+        return rounds
+
+    def append(self, records: list[JournalRecord]) -> None:
+        """
+        Append records to the journal and fsync them once.
+        An incomplete record left by a crash is cut off first.
+        :param records: The records, in order.
+        :return: None
+        """
+        if len(records) == 0:
+            return
+        if not self.journal_path.is_file():
+            self.path.mkdir(parents=True, exist_ok=True)
+            # Copy a game log written before the journal
+            records = [
+                {"idx": idx, "round": game_round}
+                for idx, game_round in enumerate(self.__read_log())
+            ] + records
+            end = 0
+        elif self.__end is not None:
+            end = self.__end
+        else:
+            _, end = self.__replay()
+
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        with open(self.journal_path, "r+b" if end > 0 else "wb") as file:
+            file.truncate(end)
+            file.seek(end)
+            file.write(lines.encode("utf-8"))
+            file.flush()
+            os.fsync(file.fileno())
+            self.__end = file.tell()
+
+    def write_round(self, idx: int, game_round: "GameRoundLog") -> None:
+        self.append([{"idx": idx, "round": game_round}])
+
+    def truncate(self, count: int) -> None:
+        """
+        Drop the rounds after the first ``count`` ones.
+        :param count: Number of rounds kept.
+        :return: None
+        """
+        self.append([{"idx": count, "round": None}])
+
+    def compact(self) -> list["GameRoundLog"]:
+        """
+        Write the rounds of the journal in the JSON layout of the game logs (``{"rounds": [...]}``),
+        replacing the JSON file at once.
+        :return: The rounds.
+        :rtype: list[GameRoundLog]
+        """
+        rounds = self.read()
+        self.path.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.log_path, json.dumps({"rounds": rounds}, indent=2))
+        return rounds
+
+    def remove(self) -> None:
+        self.__end = None
+        for file_path in (self.journal_path, self.log_path):
+            if file_path.is_file():
+                os.remove(file_path)
+
+    def __read_log(self) -> list["GameRoundLog"]:
+        if not self.log_path.is_file():
+            return []
+        with open(self.log_path, "r") as file:
+            return json.load(file)["rounds"]
+
+    def __replay(self) -> tuple[list["GameRoundLog"], int]:
+        """
+        Replay the records of the journal.
+        :return: The rounds, and the byte offset after the last complete record.
+        :rtype: tuple[list[GameRoundLog], int]
+        """
+        rounds: list["GameRoundLog"] = []
+        end = 0
+        with open(self.journal_path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record: JournalRecord = json.loads(line)
+                except ValueError:
+                    break
+                del rounds[record["idx"] :]
+                if record["round"] is not None:
+                    rounds.append(record["round"])
+                end += len(line)
+        self.__end = end
+        return rounds, end
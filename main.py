@@ -5,8 +5,15 @@ import json
 from components.game_scenes.scenes_controller import ScenesController
 from components.game_scenes.main_menu import MainMenu
 import os
+import sys
 from components.game_history import GameHistory
+from components.history_store import HISTORY_STORE
 from pathlib import Path
+from utils.event_bus import configure_event_bus
+from utils.persistence_worker import PERSISTENCE_WORKER
+
+# Game events are dropped unless "log=<level>" or "log_file=<path>" is given
+configure_event_bus(sys.argv[1:])
 
 # Create the history folder if not exist
 history_path = Path(HISTORY_PATH)
@@ -14,21 +21,14 @@ if not os.path.exists(history_path):
     os.makedirs(history_path)
 os.system(f'attrib +h "{history_path}"') # Hide the folder (Windows only)
 
-# Read previous game history if exist
-files = []
-for entry in os.listdir(history_path):
-    file_path = os.path.join(history_path, entry)
-    if os.path.isfile(file_path):
-        files.append(file_path)
-
-# Read the latest file (highest number)
-if len(files) > 0:
-    with open(files[-1], "+r") as file:
-        json_data = json.load(file)
+# Read the latest game history (highest number) if exist
+latest_entry = HISTORY_STORE.latest_entry()
+if latest_entry:
+    json_data = HISTORY_STORE.load(latest_entry)
     game_history = GameHistory(json_data)
 
     if not json_data["end_game"]: # If the previous game is not ended, delete the file
-        os.remove(files[-1])
+        HISTORY_STORE.remove(latest_entry)
 else:
     game_history = GameHistory()
 
@@ -56,5 +56,6 @@ while running:
     # Update the display
     pygame.display.flip()
 
-
+# Wait for the game files still being written
+PERSISTENCE_WORKER.flush()
 pygame.quit()
@@ -0,0 +1,346 @@
+"""
+Bot-vs-bot self-play farm.
+
+Play full hanchan with the headless ``RoundEngine`` in a process pool and aggregate placements,
+deltas and round logs into a single JSON file under ``SELFPLAY_PATH``.
+
+Usage (``key=value`` arguments, like ``data=nm.json`` for ``main.py``)::
+
+    python selfplay.py games=200 workers=32 seats=aggressive,aggressive,passive,passive
+
+- games: number of hanchan to play (default 8)
+- workers: number of worker processes (default ``os.cpu_count()``)
+- tables: hanchan simulated concurrently by each task, their AI decisions are batched (default 8)
+- seats: bot model of each seat, one of ``shanten``, ``aggressive`` or ``passive``
+- backend: inference backend, ``torch``, ``torchscript``, ``onnx`` or ``int8`` (default ``backend`` of the setting config)
+- mmap: memory-map the ``torch`` weights so the workers share them, ``1`` or ``0`` (default 1)
+- out: output file (default ``SELFPLAY_PATH/<datetime>.json``)
+- seed: master seed, the walls and seat winds of each game are derived from it to replay the batch (default random)
+"""
+
+import datetime
+import json
+import os
+import random
+import sys
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, TypedDict
+from components.entities.ai.history_buffer import HISTORY_SIZE, history_layer_from_engine
+from components.round_engine import (
+    EnginePolicy,
+    Hanchan,
+    RoundEngine,
+    ShantenPolicy,
+)
+from components.game_event_log import GameRoundLog
+from shared.random_seed import SeedFactory
+from utils.cli_args import parse_args
+from utils.constants import (
+    CHI_MODEL,
+    COMBINED_MODEL,
+    DISCARD_MODEL,
+    PON_MODEL,
+    RIICHI_MODEL,
+    SELFPLAY_PATH,
+    SETTING_CONFIG_PATH,
+)
+from utils.enums import ActionType, RoundPhase
+
+if typing.TYPE_CHECKING:
+    from components.entities.ai.helper import HistoryLayer
+    from components.entities.ai.mahjong_ai_agent import MahjongAIAgent
+
+BOT_MODELS = ("shanten", "aggressive", "passive")
+
+
+class SelfPlayGame(TypedDict):
+    game: int
+    seats: list[str]
+    points: list[int]
+    placements: list[int]
+    deltas: list[list[int]]
+    seeds: list[str]
+    rounds: list[GameRoundLog]
+
+
+class AgentPolicy:
+    """
+    Let a ``MahjongAIAgent`` play a seat of a headless table, with the history of that table.
+    """
+
+    def __init__(self, agent: "MahjongAIAgent", history: list["HistoryLayer"]):
+        self.agent = agent
+        self.history = history
+
+    def make_move(
+        self, engine: RoundEngine, seat: int
+    ) -> tuple[ActionType, Optional[int]]:
+        return self.agent.make_engine_move(engine, seat, self.history)
+
+
+class SelfPlayHanchan(Hanchan):
+    """
+    Hanchan keeping the last rounds of the table as AI history, like the .history folder does in game.
+    The history is only kept when an AI seat reads it.
+    """
+
+    def __init__(self, policies: list[EnginePolicy], history: list["HistoryLayer"], **kwargs):
+        super().__init__(policies, **kwargs)
+        self.history = history
+        self.record_history = any(isinstance(policy, AgentPolicy) for policy in policies)
+
+    def end_round(self, engine: RoundEngine) -> None:
+        if not self.record_history:
+            return
+        self.history.append(history_layer_from_engine(engine))
+        del self.history[:-HISTORY_SIZE]
+
+
+class SelfPlayTable:
+    """
+    One hanchan being simulated, stepped alongside the other tables of the task.
+
+    :ivar game: Index of the game.
+    :ivar hanchan: The hanchan played on this table.
+    :ivar engine: The round being played, None once the hanchan is over.
+    """
+
+    def __init__(self, game: int, bot_models: list[str], master_seed: Optional[str] = None):
+        self.game = game
+        history: list["HistoryLayer"] = []
+        policies: list[EnginePolicy] = []
+        for bot_model in bot_models:
+            if bot_model == "shanten":
+                policies.append(ShantenPolicy())
+            else:
+                policies.append(AgentPolicy(WORKER_AGENTS[bot_model], history))
+        if master_seed is None:
+            seed_factory, rng = SeedFactory(), random.Random()
+        else:
+            game_seed = f"{master_seed}:{game}"
+            seed_factory, rng = SeedFactory(game_seed), random.Random(game_seed)
+        self.hanchan = SelfPlayHanchan(
+            policies, history, seed_factory=seed_factory, rng=rng
+        )
+        self.__rounds = self.hanchan.rounds()
+        self.engine: Optional[RoundEngine] = next(self.__rounds)
+
+    def advance(self) -> Optional[tuple[AgentPolicy, int]]:
+        """
+        Step the table until an AI seat has to decide, or the hanchan is over.
+        :return: The policy and seat waiting for a decision, None once the hanchan is over.
+        :rtype: tuple[AgentPolicy, int] | None
+        """
+        policies = self.hanchan.policies
+        while self.engine is not None:
+            if self.engine.phase == RoundPhase.END:
+                self.engine = next(self.__rounds, None)
+                continue
+            seat = self.engine.pending_seat()
+            if seat is not None and isinstance(policies[seat], AgentPolicy):
+                return policies[seat], seat
+            self.engine.step(policies)
+        return None
+
+
+# Agents of the worker process, loaded once by init_worker
+WORKER_AGENTS: dict[str, "MahjongAIAgent"] = {}
+
+
+def init_worker(bot_models: list[str], backend: str = "torch", mmap: bool = False) -> None:
+    """
+    Load the models needed by the seats once per worker process.
+    """
+    import torch
+    from components.entities.ai.mahjong_ai_agent import MahjongAIAgent
+
+    # One process per core already, avoid oversubscribing with intra-op threads
+    torch.set_num_threads(1)
+
+    if "aggressive" in bot_models:
+        WORKER_AGENTS["aggressive"] = MahjongAIAgent(
+            COMBINED_MODEL,
+            COMBINED_MODEL,
+            COMBINED_MODEL,
+            COMBINED_MODEL,
+            load_history=False,
+            backend=backend,
+            mmap=mmap,
+        )
+    if "passive" in bot_models:
+        WORKER_AGENTS["passive"] = MahjongAIAgent(
+            DISCARD_MODEL,
+            CHI_MODEL,
+            PON_MODEL,
+            RIICHI_MODEL,
+            load_history=False,
+            backend=backend,
+            mmap=mmap,
+        )
+
+
+def play_games(
+    games: list[int], bot_models: list[str], master_seed: Optional[str] = None
+) -> list[SelfPlayGame]:
+    """
+    Play several hanchan concurrently in the worker process. Every step, the pending AI decisions
+    of all tables are answered with one batched call per agent.
+    :param games: Indices of the games.
+    :param bot_models: Bot model of each seat.
+    :param master_seed: Master seed the games are derived from, None for random games.
+    :return: The game results.
+    :rtype: list[SelfPlayGame]
+    """
+    tables = [SelfPlayTable(game, bot_models, master_seed) for game in games]
+    results: list[SelfPlayGame] = []
+    while len(tables) > 0:
+        requests: dict[int, list[tuple[SelfPlayTable, AgentPolicy, int]]] = {}
+        for table in list(tables):
+            pending = table.advance()
+            if pending is None:
+                tables.remove(table)
+                results.append(table_result(table, bot_models))
+                continue
+            policy, seat = pending
+            requests.setdefault(id(policy.agent), []).append((table, policy, seat))
+
+        for agent_requests in requests.values():
+            agent = agent_requests[0][1].agent
+            moves = agent.make_engine_moves(
+                [(table.engine, seat, policy.history) for table, policy, seat in agent_requests]
+            )
+            for (table, _, seat), (action, tile) in zip(agent_requests, moves):
+                table.engine.apply(seat, action, tile)
+    return results
+
+
+def table_result(table: SelfPlayTable, bot_models: list[str]) -> SelfPlayGame:
+    result = table.hanchan.result
+    return {
+        "game": table.game,
+        "seats": bot_models,
+        "points": result.points,
+        "placements": result.placements,
+        "deltas": result.deltas,
+        "seeds": result.seeds,
+        "rounds": result.rounds,
+    }
+
+
+def summarize(games: list[SelfPlayGame]) -> dict[str, dict[str, float]]:
+    """
+    Average placement, points and placement rates of each bot model.
+    """
+    summary = {}
+    for bot_model in BOT_MODELS:
+        placements = []
+        points = []
+        for game in games:
+            for seat, seat_model in enumerate(game["seats"]):
+                if seat_model == bot_model:
+                    placements.append(game["placements"][seat])
+                    points.append(game["points"][seat])
+        if len(placements) == 0:
+            continue
+        summary[bot_model] = {
+            "samples": len(placements),
+            "average_placement": sum(placements) / len(placements),
+            "average_points": sum(points) / len(points),
+            **{
+                f"rate_{rank}": placements.count(rank) / len(placements)
+                for rank in range(1, 5)
+            },
+        }
+    return summary
+
+
+def config_backend() -> str:
+    """
+    Backend of the setting config, without importing pygame through ``utils.helper.get_config``.
+    """
+    if not os.path.exists(SETTING_CONFIG_PATH):
+        return "torch"
+    with open(SETTING_CONFIG_PATH) as file:
+        return json.load(file).get("backend", "torch")
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    games = int(args.get("games", 8))
+    workers = int(args.get("workers", os.cpu_count() or 1))
+    tables = max(1, int(args.get("tables", 8)))
+    bot_models = args.get("seats", "aggressive,aggressive,passive,passive").split(",")
+    if len(bot_models) != 4 or any(model not in BOT_MODELS for model in bot_models):
+        raise ValueError(f"seats must be 4 of {BOT_MODELS}, got {bot_models}")
+    backend = args.get("backend", config_backend())
+    mmap = args.get("mmap", "1") == "1"
+    master_seed = args.get("seed")
+
+    out_path = Path(
+        args.get(
+            "out",
+            os.path.join(
+                SELFPLAY_PATH,
+                datetime.datetime.now().strftime("%Y-%m-%d-%H-%M-%S") + ".json",
+            ),
+        )
+    )
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Shanten bots need no model, nor torch
+    uses_agents = any(bot_model != "shanten" for bot_model in bot_models)
+
+    results: list[SelfPlayGame] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker if uses_agents else None,
+        initargs=(bot_models, backend, mmap) if uses_agents else (),
+    ) as executor:
+        futures = [
+            executor.submit(
+                play_games,
+                list(range(start_game, min(start_game + tables, games))),
+                bot_models,
+                master_seed,
+            )
+            for start_game in range(0, games, tables)
+        ]
+        # Results stream back as soon as each task ends
+        for future in as_completed(futures):
+            for game_result in future.result():
+                results.append(game_result)
+                print(
+                    f"[{len(results)}/{games}] game {game_result['game']}: "
+                    f"placements={game_result['placements']} points={game_result['points']}"
+                )
+
+    results.sort(key=lambda game_result: game_result["game"])
+    summary = summarize(results)
+    with open(out_path, "w") as file:
+        json.dump(
+            {
+                "seats": bot_models,
+                "backend": backend,
+                "seed": master_seed,
+                "games": len(results),
+                "elapsed": time.perf_counter() - start,
+                "summary": summary,
+                "results": results,
+            },
+            file,
+        )
+
+    for bot_model, stats in summary.items():
+        print(
+            f"{bot_model}: avg placement {stats['average_placement']:.3f} "
+            f"over {stats['samples']} seats"
+        )
+    print(f"Saved {len(results)} games to {out_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class MT19937:
     """
     Python implementation of the Mersenne Twister (MT19937)
@@ -93,3 +96,104 @@ class MT19937:
         y ^= y >> 18
 
         return y
+
+
+class MT19937Vec:
+    """
+    NumPy implementation of MT19937, producing the same words as ``MT19937`` in blocks of 624:
+    the twist of the whole state is done in four vectorised slices, then the block is tempered at once.
+    The seeding (``init_by_array``) is sequential and stays in Python, from a cached ``init_genrand(19650218)``.
+    """
+
+    N = 624
+    M = 397
+    MATRIX_A = np.uint32(0x9908B0DF)
+    UPPER_MASK = np.uint32(0x80000000)
+    LOWER_MASK = np.uint32(0x7FFFFFFF)
+
+    # State of init_genrand(19650218), the start of every init_by_array
+    __base_state: list[int] = []
+
+    def __init__(self):
+        self.mt = np.zeros(self.N, dtype=np.uint32)
+        self.__block = np.zeros(0, dtype=np.uint32)
+        self.__block_idx = 0
+
+    def init_by_array(self, init_key) -> None:
+        N = self.N
+        if not MT19937Vec.__base_state:
+            base = MT19937()
+            base.init_genrand(19650218)
+            MT19937Vec.__base_state = base.mt
+        mt = list(MT19937Vec.__base_state)
+
+        i, j = 1, 0
+        key_length = len(init_key)
+        for _ in range(max(N, key_length)):
+            prev = mt[i - 1]
+            mt[i] = ((mt[i] ^ ((prev ^ (prev >> 30)) * 1664525)) + init_key[j] + j) & 0xFFFFFFFF
+            i += 1
+            j += 1
+            if i >= N:
+                mt[0] = mt[N - 1]
+                i = 1
+            if j >= key_length:
+                j = 0
+
+        for _ in range(N - 1):
+            prev = mt[i - 1]
+            mt[i] = ((mt[i] ^ ((prev ^ (prev >> 30)) * 1566083941)) - i) & 0xFFFFFFFF
+            i += 1
+            if i >= N:
+                mt[0] = mt[N - 1]
+                i = 1
+
+        mt[0] = 0x80000000
+        self.mt = np.array(mt, dtype=np.uint32)
+        self.__block = np.zeros(0, dtype=np.uint32)
+        self.__block_idx = 0
+
+    def __twist(self) -> None:
+        N, M = self.N, self.M
+        mt = self.mt
+        # mt[kk] is built from mt[kk + 1] before it is updated, and from mt[kk + M - N] after,
+        # so each slice only reads words of the previous state or of an earlier slice
+        for start, stop in ((0, N - M), (N - M, 2 * (N - M)), (2 * (N - M), N - 1)):
+            y = (mt[start:stop] & self.UPPER_MASK) | (mt[start + 1 : stop + 1] & self.LOWER_MASK)
+            source = mt[start + M : stop + M] if stop <= N - M else mt[start + M - N : stop + M - N]
+            mt[start:stop] = source ^ (y >> 1) ^ np.where(y & 1, self.MATRIX_A, np.uint32(0))
+
+        y = (mt[N - 1] & self.UPPER_MASK) | (mt[0] & self.LOWER_MASK)
+        mt[N - 1] = mt[M - 1] ^ (y >> 1) ^ (self.MATRIX_A if y & 1 else np.uint32(0))
+
+    def genrand_block(self) -> np.ndarray:
+        """
+        Twist the state and temper it into the next 624 words.
+        :return: The 624 next outputs of ``genrand_int32``.
+        :rtype: np.ndarray
+        """
+        self.__twist()
+        y = self.mt.copy()
+        y ^= y >> 11
+        y ^= (y << 7) & np.uint32(0x9D2C5680)
+        y ^= (y << 15) & np.uint32(0xEFC60000)
+        y ^= y >> 18
+        return y
+
+    def genrand_int32_array(self, size: int) -> np.ndarray:
+        """
+        Get the next words of the generator, continuing the current block.
+        :param size: Number of words.
+        :return: The ``size`` next outputs of ``genrand_int32``, as uint32.
+        :rtype: np.ndarray
+        """
+        parts = []
+        while size > 0:
+            if self.__block_idx >= len(self.__block):
+                self.__block = self.genrand_block()
+                self.__block_idx = 0
+            part = self.__block[self.__block_idx : self.__block_idx + size]
+            self.__block_idx += len(part)
+            size -= len(part)
+            parts.append(part)
+        return np.concatenate(parts) if len(parts) != 1 else parts[0]
@@ -1,6 +1,10 @@
-import random
-import struct
 import base64
+import hashlib
+import os
+from typing import Optional
+
+# A seed is the internal state array of the MT19937 PRNG: 624 u32 integers
+SEED_SIZE = 624 * 4
 
 
 def generate_random_seed():
@@ -10,17 +14,64 @@ def generate_random_seed():
     The seed is a base64 encoded representation of 624 random u32 integers,
     which represent the internal state array of the MT19937 PRNG.
     """
+    return base64.b64encode(generate_random_seed_bytes()).decode("utf-8")
+
+
+def generate_random_seed_bytes() -> bytes:
+    """
+    Generates a new Tenhou seed as raw bytes, from a single ``os.urandom`` read.
+    ``reproduce_tenhou`` takes it as is, without the base64 round trip.
+    """
+    return os.urandom(SEED_SIZE)
 
-    rng = random.SystemRandom()
 
-    mt_state_array = [rng.getrandbits(32) for _ in range(624)]
+class SeedFactory:
+    """
+    Produce Tenhou seeds in bulk, either random or derived from a master seed.
+
+    A derived seed is the SHAKE-256 digest of the master seed and its index, so a batch of experiments
+    can be replayed from its master seed alone.
+
+    :ivar master_seed: Master seed of the derived seeds, None for random seeds.
+    :ivar raw: Whether the seeds are raw bytes (for ``reproduce_tenhou`` in the same process)
+        instead of base64 strings (for logs and histories).
+    :ivar count: Number of seeds produced so far.
+    """
 
-    byte_sequence = b""
-    for value in mt_state_array:
-        byte_sequence += struct.pack("<I", value)
+    def __init__(
+        self, master_seed: Optional[int | str | bytes] = None, raw: bool = False
+    ):
+        self.master_seed = master_seed
+        self.raw = raw
+        self.count = 0
+        self.__master = (
+            master_seed
+            if isinstance(master_seed, bytes) or master_seed is None
+            else str(master_seed).encode("utf-8")
+        )
 
-    encoded_bytes = base64.b64encode(byte_sequence)
+    def __call__(self) -> str | bytes:
+        return self.batch(1)[0]
 
-    seed_string = encoded_bytes.decode("utf-8")
+    def batch(self, count: int) -> list[str | bytes]:
+        """
+        Get the next seeds of the factory.
+        :param count: Number of seeds.
+        :return: The seeds, raw bytes or base64 strings depending on ``raw``.
+        :rtype: list[str | bytes]
+        """
+        if self.__master is None:
+            data = os.urandom(SEED_SIZE * count)
+            seeds = [data[i * SEED_SIZE : (i + 1) * SEED_SIZE] for i in range(count)]
+        else:
+            seeds = [
+                hashlib.shake_256(
+                    self.__master + (self.count + i).to_bytes(8, "little")
+                ).digest(SEED_SIZE)
+                for i in range(count)
+            ]
+        self.count += count
 
-    return seed_string
+        if self.raw:
+            return seeds
+        return [base64.b64encode(seed).decode("utf-8") for seed in seeds]
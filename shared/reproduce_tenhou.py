@@ -1,84 +1,106 @@
 import hashlib
 import base64
-import struct
-from shared.mt19937 import MT19937
+import numpy as np
+from shared.mt19937 import MT19937Vec
+
+SHA512_DIGEST_LENGTH = 64  # bytes
+
+# Calculate array sizes based on C++ logic
+# rnd size: (64 / 4 * 9) = 144 uint32s
+RND_SIZE = (SHA512_DIGEST_LENGTH // 4) * 9
+
+# src size: 144 * 2 = 288 uint32s
+SRC_SIZE = RND_SIZE * 2
+
+# Below this number of games, shuffling each wall in Python beats the vectorised swaps
+BATCH_SHUFFLE_MIN_GAMES = 16
 
 
 def reproduce_tenhou(seed_str, num) -> list[tuple[list[int], list[int]]]:
     """
     Reproduces Tenhou wall generation.
-    :param seed_str: Base64 encoded seed string.
+    :param seed_str: Base64 encoded seed string, or the raw seed bytes.
     :param num: Number of games/walls to generate.
     :return: List of tuples (wall_tiles, dice_rolls)
     """
+    walls, dices = reproduce_tenhou_batch([seed_str], num)
+    return [
+        (wall, dice) for wall, dice in zip(walls[0].tolist(), dices[0].tolist())
+    ]
 
-    # 1. Base64 Decode
-    decoded_seed = base64.b64decode(seed_str)
-
-    # 2. Convert to Integers (Seed Preparation)
-    # The C++ code constructs Big-Endian ints then bswaps them.
-    # This is equivalent to reading the bytes as Little-Endian uint32.
-    # Since the seed is 624 * 4 bytes, we unpack 624 integers.
-    if len(decoded_seed) < 624 * 4:
-        raise ValueError("Seed length is too short")
-
-    rt_seed = list(struct.unpack("<" + "I" * 624, decoded_seed[: 624 * 4]))
-
-    # 3. Initialize MT19937
-    mt = MT19937()
-    mt.init_by_array(rt_seed)
-
-    results = []
-
-    SHA512_DIGEST_LENGTH = 64  # bytes
-
-    # Calculate array sizes based on C++ logic
-    # rnd size: (64 / 4 * 9) = 144 uint32s
-    rnd_size = (SHA512_DIGEST_LENGTH // 4) * 9
 
-    # src size: 144 * 2 = 288 uint32s
-    src_size = rnd_size * 2
-
-    for _ in range(num):
-        # 4. Generate Random Noise (src)
-        src = [mt.genrand_int32() for _ in range(src_size)]
-
-        # 5. Hash Noise to get Wall RNG (rnd)
-        rnd = []
-
-        # We process 'src' in chunks of (SHA512_DIGEST_LENGTH * 2) bytes
-        # which is 64 * 2 = 128 bytes (32 uint32s)
-        chunk_size_ints = (SHA512_DIGEST_LENGTH * 2) // 4
+def reproduce_tenhou_batch(seed_strs, num) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reproduces Tenhou wall generation for several seeds at once, same walls and dices as
+    ``reproduce_tenhou`` run on each seed.
+    :param seed_strs: Base64 encoded seed strings, or raw seed bytes.
+    :param num: Number of games/walls to generate per seed.
+    :return: The walls, shape (seeds, num, 136), and the dice rolls, shape (seeds, num, 2).
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    # 1. Generate Random Noise (src) of every game, from each seed
+    src = np.empty((len(seed_strs), num * SRC_SIZE), dtype="<u4")
+    for idx, seed_str in enumerate(seed_strs):
+        src[idx] = _seed_mt(seed_str).genrand_int32_array(num * SRC_SIZE)
+
+    # 2. Hash Noise to get Wall RNG (rnd)
+    # 'src' is processed in chunks of (SHA512_DIGEST_LENGTH * 2) bytes (32 uint32s),
+    # whose Little Endian bytes mimic the C++ memory casting
+    src_bytes = memoryview(src.tobytes())
+    chunk_size = SHA512_DIGEST_LENGTH * 2
+    digests = b"".join(
+        hashlib.sha512(src_bytes[start : start + chunk_size]).digest()
+        for start in range(0, len(src_bytes), chunk_size)
+    )
+    rnd = np.frombuffer(digests, dtype="<u4").astype(np.int64).reshape(-1, RND_SIZE)
+
+    # 3. Shuffle Wall (0-135 tiles)
+    # Swap logic: std::swap(wall[i], wall[i + (rnd[i] % (136 - i))])
+    if len(rnd) < BATCH_SHUFFLE_MIN_GAMES:
+        walls = np.array([_shuffle_wall(game_rnd) for game_rnd in rnd.tolist()], dtype=np.int64)
+    else: # All games at once, one swap per step
+        walls = np.tile(np.arange(136, dtype=np.int64), (len(rnd), 1))
+        rows = np.arange(len(rnd))
+        for i in range(136 - 1):
+            swap_idx = i + rnd[:, i] % (136 - i)
+            swapped = walls[rows, swap_idx]
+            walls[rows, swap_idx] = walls[:, i]
+            walls[:, i] = swapped
 
-        for i in range(9):
-            # Extract chunk from src
-            start_idx = i * chunk_size_ints
-            chunk_ints = src[start_idx : start_idx + chunk_size_ints]
+    # 4. Get Dice
+    # rnd[135] and rnd[136] are used for dice
+    dices = rnd[:, 135:137] % 6 + 1
 
-            # Convert ints to bytes (Little Endian) to mimic C++ memory casting
-            chunk_bytes = struct.pack("<" + "I" * len(chunk_ints), *chunk_ints)
+    return (
+        walls.reshape(len(seed_strs), num, 136),
+        dices.reshape(len(seed_strs), num, 2),
+    )
 
-            # Perform SHA512
-            sha_hash = hashlib.sha512(chunk_bytes).digest()
 
-            # Convert hash back to uint32s (Little Endian)
-            hash_ints = struct.unpack("<" + "I" * (len(sha_hash) // 4), sha_hash)
-            rnd.extend(hash_ints)
+def _shuffle_wall(rnd: list[int]) -> list[int]:
+    wall = list(range(136))
+    for i in range(136 - 1):
+        swap_idx = i + (rnd[i] % (136 - i))
+        wall[i], wall[swap_idx] = wall[swap_idx], wall[i]
+    return wall
 
-        # 6. Shuffle Wall
-        # 0-135 tiles
-        wall = list(range(136))
 
-        for i in range(136 - 1):
-            # Swap logic: std::swap(wall[i], wall[i + (rnd[i] % (136 - i))])
-            swap_idx = i + (rnd[i] % (136 - i))
-            wall[i], wall[swap_idx] = wall[swap_idx], wall[i]
+def _seed_mt(seed_str) -> MT19937Vec:
+    """
+    Initialize MT19937 with the 624 integers of a seed.
+    """
+    # Base64 Decode, raw seeds (``generate_random_seed_bytes``) are used as is
+    decoded_seed = seed_str if isinstance(seed_str, bytes) else base64.b64decode(seed_str)
 
-        # 7. Get Dice
-        # rnd[135] and rnd[136] are used for dice
-        dice1 = (rnd[135] % 6) + 1
-        dice2 = (rnd[136] % 6) + 1
+    # Convert to Integers (Seed Preparation)
+    # The C++ code constructs Big-Endian ints then bswaps them.
+    # This is equivalent to reading the bytes as Little-Endian uint32.
+    # Since the seed is 624 * 4 bytes, we unpack 624 integers.
+    if len(decoded_seed) < 624 * 4:
+        raise ValueError("Seed length is too short")
 
-        results.append((wall, [dice1, dice2]))
+    rt_seed = np.frombuffer(decoded_seed[: 624 * 4], dtype="<u4").tolist()
 
-    return results
+    mt = MT19937Vec()
+    mt.init_by_array(rt_seed)
+    return mt
@@ -0,0 +1,74 @@
+"""
+Benchmark the inference backends of the AI bots on game states recorded from headless rounds.
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.benchmark_backends states=512 batch=32 model=public/model/mahjong_cnn_discard_best.pth
+
+- states: number of recorded decision states (default 512)
+- batch: batch size of the batched run, like the self-play tables (default 32)
+- model: checkpoint to benchmark (default ``COMBINED_MODEL``)
+- backends: comma separated backends (default ``torch,torchscript,onnx,int8``)
+- threads: torch intra-op threads (default 1, like the self-play workers)
+
+For each backend, print the latency of a single decision (batch of 1), the per-decision latency of the
+batched run, and the largest logit difference with the ``torch`` backend.
+"""
+
+import sys
+import time
+import numpy as np
+import torch
+from typing import Optional
+from components.entities.ai.runtime import BACKENDS, load_model, record_states
+from utils.cli_args import parse_args
+from utils.constants import COMBINED_MODEL
+
+
+def run(model, X: np.ndarray, batch: int) -> tuple[float, list[np.ndarray]]:
+    """
+    Run the model over the states by batches.
+    :return: Seconds per state and the concatenated head outputs.
+    :rtype: tuple[float, list[np.ndarray]]
+    """
+    outputs = []
+    with torch.no_grad():
+        model(torch.from_numpy(X[:batch]))  # Warm up
+        start = time.perf_counter()
+        for i in range(0, len(X), batch):
+            outputs.append(model(torch.from_numpy(X[i : i + batch])))
+        elapsed = time.perf_counter() - start
+    heads = [
+        np.concatenate([out[head].numpy() for out in outputs]) for head in range(4)
+    ]
+    return elapsed / len(X), heads
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    count = int(args.get("states", 512))
+    batch = int(args.get("batch", 32))
+    path = args.get("model", COMBINED_MODEL)
+    backends = args.get("backends", ",".join(BACKENDS)).split(",")
+    torch.set_num_threads(int(args.get("threads", 1)))
+
+    X = record_states(count, seed=1)
+    print(f"Recorded {len(X)} states, model {path}")
+
+    reference: Optional[list[np.ndarray]] = None
+    for backend in backends:
+        model = load_model(path, backend)
+        single, heads = run(model, X, 1)
+        batched, _ = run(model, X, batch)
+        if reference is None:
+            reference = heads
+        diff = max(float(np.abs(a - b).max()) for a, b in zip(heads, reference))
+        print(
+            f"{backend:>12}: {single * 1e3:.3f} ms/decision, "
+            f"{batched * 1e3:.3f} ms/decision at batch {batch}, "
+            f"max |logit diff| {diff:.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
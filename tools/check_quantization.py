@@ -0,0 +1,83 @@
+"""
+Compare the decisions of the float and int8 agents over a corpus of encoded states.
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.check_quantization states=2000 seats=passive
+
+- states: number of states recorded from headless rounds when no corpus is given (default 1000)
+- corpus: ``.npy`` file of encoded states (N,86,34,4) to use instead, saved with ``save``
+- save: save the recorded states to this ``.npy`` file
+- seats: bot model to check, ``aggressive`` (COMBINED_MODEL) or ``passive`` (separate models), default both
+
+For each head, print how often the int8 agent takes the same decision as the float agent (discard kind,
+chi choice, pon and riichi yes/no) and the largest logit difference.
+"""
+
+import sys
+import numpy as np
+import torch
+from components.entities.ai.mahjong_ai_agent import HEADS, MahjongAIAgent
+from components.entities.ai.runtime import record_states
+from utils.cli_args import parse_args
+from utils.constants import (
+    CHI_MODEL,
+    COMBINED_MODEL,
+    DISCARD_MODEL,
+    PON_MODEL,
+    RIICHI_MODEL,
+)
+
+AGENT_MODELS = {
+    "aggressive": (COMBINED_MODEL, COMBINED_MODEL, COMBINED_MODEL, COMBINED_MODEL),
+    "passive": (DISCARD_MODEL, CHI_MODEL, PON_MODEL, RIICHI_MODEL),
+}
+# States per forward pass
+BATCH_SIZE = 256
+
+
+def agent_outputs(agent: MahjongAIAgent, X: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Logits of every head over the corpus.
+    :rtype: dict[str, np.ndarray]
+    """
+    outputs: dict[str, list[np.ndarray]] = {name: [] for name in HEADS}
+    for i in range(0, len(X), BATCH_SIZE):
+        batch = X[i : i + BATCH_SIZE]
+        heads = agent.forward_heads(batch, [set(HEADS)] * len(batch))
+        for name in HEADS:
+            outputs[name].append(heads[name].numpy())
+    return {name: np.concatenate(logits) for name, logits in outputs.items()}
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    torch.set_num_threads(1)
+    if "corpus" in args:
+        X = np.load(args["corpus"])
+    else:
+        # Seed 1, the int8 models are calibrated on seed 0
+        X = record_states(int(args.get("states", 1000)), seed=1)
+        if "save" in args:
+            np.save(args["save"], X)
+    print(f"Checking {len(X)} states")
+
+    for bot_model in args.get("seats", "aggressive,passive").split(","):
+        models = AGENT_MODELS[bot_model]
+        float_outputs = agent_outputs(MahjongAIAgent(*models, load_history=False), X)
+        int8_outputs = agent_outputs(
+            MahjongAIAgent(*models, load_history=False, backend="int8"), X
+        )
+        for name in HEADS:
+            agreement = np.mean(
+                float_outputs[name].argmax(axis=1) == int8_outputs[name].argmax(axis=1)
+            )
+            diff = np.abs(float_outputs[name] - int8_outputs[name]).max()
+            print(
+                f"{bot_model:>10} {name:>8}: {agreement:.2%} same decision, "
+                f"max |logit diff| {diff:.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,94 @@
+"""
+Check ``utils.shanten_table.TableShanten`` against ``mahjong.shanten.Shanten`` over random hands.
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.check_shanten hands=50000 seed=0
+
+- hands: number of random hands (default 20000)
+- seed: seed of the hands (default 0)
+- draws: number of those hands of 3n+1 tiles also checked after each draw,
+  by ``calculate_shanten_after_draws`` (default 10000)
+- rebuild: ``1`` to rebuild the table under ``SHANTEN_TABLE_PATH`` first
+
+Hands have 14 down to 1 concealed tiles (the rest being called melds), drawn from the full wall,
+from one suit, from two suits, or from one suit and the honors. Exits with status 1 on any mismatch.
+"""
+
+import random
+import sys
+import time
+from mahjong.shanten import Shanten
+from utils.cli_args import parse_args
+from utils.shanten_table import TableShanten, load_suit_table
+
+HAND_SIZES = (14, 13, 11, 10, 8, 7, 5, 4, 2, 1)
+# Tile kinds each hand is drawn from
+KIND_POOLS = (
+    list(range(34)),
+    list(range(9)),
+    list(range(18)),
+    list(range(9)) + list(range(27, 34)),
+)
+
+
+def random_hand(rng: random.Random) -> list[int]:
+    tiles = [kind for kind in rng.choice(KIND_POOLS) for _ in range(4)]
+    hand34 = [0] * 34
+    for kind in rng.sample(tiles, rng.choice(HAND_SIZES)):
+        hand34[kind] += 1
+    return hand34
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    rng = random.Random(int(args.get("seed", 0)))
+    hands = [random_hand(rng) for _ in range(int(args.get("hands", 20000)))]
+
+    library = Shanten()
+    table = TableShanten(load_suit_table(rebuild=args.get("rebuild") == "1"))
+
+    start = time.perf_counter()
+    expected = [library.calculate_shanten(hand34) for hand34 in hands]
+    library_time = time.perf_counter() - start
+    start = time.perf_counter()
+    results = [table.calculate_shanten(hand34) for hand34 in hands]
+    table_time = time.perf_counter() - start
+
+    mismatches = [
+        (hand34, want, got)
+        for hand34, want, got in zip(hands, expected, results)
+        if want != got
+    ]
+    for hand34, want, got in mismatches[:10]:
+        print(f"Mismatch {hand34}: library {want}, table {got}")
+    print(
+        f"{len(hands) - len(mismatches)}/{len(hands)} hands match, "
+        f"library {library_time / len(hands) * 1e6:.1f} us/hand, "
+        f"table {table_time / len(hands) * 1e6:.1f} us/hand"
+    )
+
+    draw_hands = [hand34 for hand34 in hands if sum(hand34) % 3 == 1]
+    draw_hands = draw_hands[: int(args.get("draws", 10000))]
+    draw_mismatches = []
+    for hand34 in draw_hands:
+        kinds = [kind for kind in range(34) if hand34[kind] < 4]
+        results = table.calculate_shanten_after_draws(hand34, kinds)
+        for kind, got in zip(kinds, results):
+            hand34[kind] += 1
+            want = library.calculate_shanten(hand34)
+            hand34[kind] -= 1
+            if want != got:
+                draw_mismatches.append((hand34, kind, want, got))
+    for hand34, kind, want, got in draw_mismatches[:10]:
+        print(f"Mismatch {hand34} drawing {kind}: library {want}, table {got}")
+    print(
+        f"{len(draw_hands) - len({id(hand34) for hand34, *_ in draw_mismatches})}"
+        f"/{len(draw_hands)} hands match after each draw"
+    )
+    if len(mismatches) > 0 or len(draw_mismatches) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
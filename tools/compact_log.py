@@ -0,0 +1,40 @@
+"""
+Compact the round journals of ``.log`` (``<name>.jsonl``) into the JSON game logs (``<name>.json``).
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.compact_log name=2025-01-31-20-15-00 path=.log/
+
+- name: game log to compact (default every journal of the folder)
+- path: log folder (default ``LOG_PATH``)
+
+The game only appends to the journals, a JSON log is written by this tool, in the same layout as before
+(``{"rounds": [...]}``). A journal cut by a crash is read up to its last complete round.
+"""
+
+import sys
+from pathlib import Path
+from components.round_journal import RoundJournal, JOURNAL_EXTENSION
+from utils.cli_args import parse_args
+from utils.constants import LOG_PATH
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    path = Path(args.get("path", LOG_PATH))
+    if "name" in args:
+        names = [args["name"]]
+    else:
+        names = sorted(file.stem for file in path.glob(f"*{JOURNAL_EXTENSION}"))
+
+    for name in names:
+        journal = RoundJournal(name, path)
+        if not journal.exists():
+            print(f"No game log {name} in {path}")
+            continue
+        rounds = journal.compact()
+        print(f"Compacted {name}: {len(rounds)} rounds to {journal.log_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
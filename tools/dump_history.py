@@ -0,0 +1,41 @@
+"""
+Dump a ``.history`` snapshot as JSON, for debugging the binary snapshots of ``components.history_codec``.
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.dump_history file=.history/3.bin out=3.json
+
+- file: snapshot to read, binary or JSON (default the latest snapshot of ``HISTORY_PATH``)
+- out: JSON file to write (default printed)
+
+Set ``HISTORY_FORMAT = "json"`` in ``utils/constants.py`` to have the game write JSON snapshots directly.
+"""
+
+import json
+import sys
+from components.history_store import HISTORY_STORE
+from utils.cli_args import parse_args
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    if "file" in args:
+        file_path = args["file"]
+    else:
+        latest_entry = HISTORY_STORE.latest_entry()
+        if latest_entry is None:
+            print(f"No snapshot in {HISTORY_STORE.path}")
+            return
+        file_path = HISTORY_STORE.file_path(latest_entry)
+
+    data = HISTORY_STORE.load_file(file_path)
+    if "out" in args:
+        with open(args["out"], "w") as file:
+            json.dump(data, file, indent=4)
+        print(f"Dumped {file_path} to {args['out']}")
+    else:
+        print(json.dumps(data, indent=4))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
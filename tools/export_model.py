@@ -0,0 +1,43 @@
+"""
+Export the MahjongCNN checkpoints to TorchScript, ONNX or int8, BatchNorm folded and dropout stripped.
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.export_model backend=onnx
+    python -m tools.export_model backend=torchscript model=public/model/mahjong_cnn_pon_best.pth
+
+- backend: ``torchscript``, ``onnx``, ``int8`` or ``all`` (default ``all``)
+- model: checkpoint to export (default every checkpoint of ``utils.constants``)
+- out: output file, only with ``model`` (default next to the checkpoint)
+
+The agent loads these artifacts when the setting config ``backend`` is ``torchscript``, ``onnx`` or ``int8``.
+"""
+
+import sys
+from components.entities.ai.runtime import export_model
+from utils.cli_args import parse_args
+from utils.constants import (
+    CHI_MODEL,
+    COMBINED_MODEL,
+    DISCARD_MODEL,
+    PON_MODEL,
+    RIICHI_MODEL,
+)
+
+MODELS = (DISCARD_MODEL, CHI_MODEL, PON_MODEL, RIICHI_MODEL, COMBINED_MODEL)
+EXPORT_BACKENDS = ("torchscript", "onnx", "int8")
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    backend = args.get("backend", "all")
+    backends = EXPORT_BACKENDS if backend == "all" else (backend,)
+    models = (args["model"],) if "model" in args else MODELS
+    for model in models:
+        for backend in backends:
+            out_path = export_model(model, backend, args.get("out"))
+            print(f"Exported {model} -> {out_path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
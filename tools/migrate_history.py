@@ -0,0 +1,37 @@
+"""
+Index an existing ``.history`` folder for ``components.history_store.HistoryStore``.
+
+Usage (``key=value`` arguments, like ``selfplay.py``)::
+
+    python -m tools.migrate_history path=.history/
+
+- path: history folder to index (default ``HISTORY_PATH``)
+
+Reads every ``<number>.bin`` or ``<number>.json`` snapshot once for its ``end_game`` flag and writes ``index.json``, replacing
+any previous index. The game indexes a folder without index on its own, this only does it ahead of time.
+"""
+
+import sys
+import time
+from components.history_store import HistoryStore
+from utils.cli_args import parse_args
+from utils.constants import HISTORY_PATH
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    store = HistoryStore(args.get("path", HISTORY_PATH))
+
+    start = time.perf_counter()
+    index = store.migrate()
+    elapsed = time.perf_counter() - start
+
+    ended = sum(1 for entry in index["entries"] if entry["end_game"])
+    print(
+        f"Indexed {len(index['entries'])} snapshots ({ended} ended rounds) "
+        f"of {store.path} in {elapsed:.2f}s, next id {index['next_id']}"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
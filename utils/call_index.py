@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import Sequence
+
+
+@dataclass(frozen=True)
+class CallIndex:
+    """
+    Tile kinds a discard can be called with, built once from a concealed hand.
+
+    :cvar pon_kinds: Kinds held at least twice.
+    :cvar minkan_kinds: Kinds held three times.
+    :cvar chii_patterns: For each kind completing a run, the kind pairs it is called with.
+    """
+
+    pon_kinds: frozenset[int] = frozenset()
+    minkan_kinds: frozenset[int] = frozenset()
+    chii_patterns: dict[int, tuple[tuple[int, int], ...]] = field(default_factory=dict)
+
+
+def build_call_index(hand34: Sequence[int]) -> CallIndex:
+    """
+    Index the pon, kan and chii kinds of a hand, chii patterns from the lowest run to the highest.
+    :param hand34: Count of each of the 34 tile kinds in the concealed hand.
+    :return: The call index of the hand.
+    :rtype: CallIndex
+    """
+    chii_patterns: dict[int, tuple[tuple[int, int], ...]] = {}
+    for kind in range(27):
+        number = kind % 9
+        patterns = []
+        if number >= 2 and hand34[kind - 2] and hand34[kind - 1]:
+            patterns.append((kind - 2, kind - 1))
+        if 1 <= number <= 7 and hand34[kind - 1] and hand34[kind + 1]:
+            patterns.append((kind - 1, kind + 1))
+        if number <= 6 and hand34[kind + 1] and hand34[kind + 2]:
+            patterns.append((kind + 1, kind + 2))
+        if patterns:
+            chii_patterns[kind] = tuple(patterns)
+
+    return CallIndex(
+        pon_kinds=frozenset(kind for kind in range(34) if hand34[kind] >= 2),
+        minkan_kinds=frozenset(kind for kind in range(34) if hand34[kind] == 3),
+        chii_patterns=chii_patterns,
+    )
@@ -0,0 +1,12 @@
+def parse_args(argv: list[str]) -> dict[str, str]:
+    """
+    Parse the ``key=value`` command line arguments of ``selfplay.py`` and the tools.
+    :param argv: The command line arguments, without the program name.
+    :return: The value of each key, an empty string for an argument without ``=``.
+    :rtype: dict[str, str]
+    """
+    args = {}
+    for arg in argv:
+        key, _, value = arg.partition("=")
+        args[key] = value
+    return args
@@ -26,8 +26,14 @@ CHI_MODEL = "public/model/mahjong_cnn_chi_best.pth"
 PON_MODEL = "public/model/mahjong_cnn_pon_best.pth"
 RIICHI_MODEL = "public/model/mahjong_cnn_riichi_best.pth"
 COMBINED_MODEL = "public/model/mahjong_cnn_discard_chi_pon_riichi_best.pth"
+SHANTEN_TABLE_PATH = "public/shanten/suit_table.npz"
 HISTORY_PATH = ".history/"
+# Format of the new .history snapshots: "binary" (components.history_codec) or "json" for debugging
+HISTORY_FORMAT = "binary"
+# Compression of the binary snapshots: "none", "zlib" or "zstd" (needs zstandard)
+HISTORY_COMPRESSION = "zlib"
 LOG_PATH = ".log/"
+SELFPLAY_PATH = ".selfplay/"
 
 MAIN_MENU_BACKGROUND = "public/images/main_menu_bg.png"
 
@@ -96,6 +102,7 @@ CONSTANT_SETTING_CONFIG: "SettingConfig" = {
     "player_1": "aggressive",
     "player_2": "shanten",
     "player_3": "passive",
+    "backend": "torch",
 }
 
 # POPUP BACKGROUND COLOR
@@ -117,3 +117,58 @@ class InstructionSection(Enum):
     TUTORIAL = 0
     YAKU_OVERVIEW = 1
     GAME_FLOW = 2
+
+
+class RoundPhase(Enum):
+    """
+    Phase of a headless round in ``RoundEngine``
+
+    - DRAW: the current seat is about to draw
+    - TURN: the current seat has to tsumo/riichi/kan or discard
+    - CALL: a seat in the call order has to answer the latest discard
+    - END: the round is over
+    """
+    DRAW = 0
+    TURN = 1
+    CALL = 2
+    END = 3
+
+
+class EventLevel(Enum):
+    """
+    Level of a game event, events below the level of the ``EventBus`` are dropped
+
+    - OFF: only used as a bus level, drops every event
+    """
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+    ERROR = 40
+    OFF = 100
+
+
+class EventType(Enum):
+    """
+    Type of a game event
+
+    - SETUP: game and round setup, bot agents
+    - ACTION: start and end of a game action
+    - CALL_CHECK: calls (chii/pon/kan/riichi/ron/tsumo) a player can make
+    - CALL: a call being made
+    - WIN_CHECK: whether a hand wins, and why not
+    - SCORE: the hand result of a win
+    - AI_DECISION: probabilities and choices of the AI agents
+    - SOUND: queued sound effects
+    - UI: button clicks and screenshots
+    - PERSISTENCE: background writes of the game files
+    """
+    SETUP = 0
+    ACTION = 1
+    CALL_CHECK = 2
+    CALL = 3
+    WIN_CHECK = 4
+    SCORE = 5
+    AI_DECISION = 6
+    SOUND = 7
+    UI = 8
+    PERSISTENCE = 9
@@ -0,0 +1,236 @@
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Protocol, TypedDict
+from utils.enums import EventLevel, EventType
+
+# Number of events kept by a RingBufferSink
+EVENT_BUFFER_SIZE = 1 << 12
+
+
+class EventDict(TypedDict):
+    """
+    JSON form of an ``Event``, one line of a JSONL event file.
+
+    :cvar time: Unix time of the event (float).
+    :cvar type: Name of the event type (str).
+    :cvar level: Name of the event level (str).
+    :cvar message: The formatted message (str).
+    :cvar fields: The fields of the message, as strings when not JSON serialisable (dict).
+    """
+
+    time: float
+    type: str
+    level: str
+    message: str
+    fields: dict[str, Any]
+
+
+@dataclass
+class Event:
+    """
+    A game event. The message is a ``str.format`` template only formatted by the sinks,
+    so an event dropped by the bus level costs no string formatting.
+
+    :cvar type: Type of the event.
+    :cvar level: Level of the event.
+    :cvar template: Message template, formatted with the fields.
+    :cvar fields: Values of the message template.
+    :cvar time: Unix time of the event.
+    """
+
+    type: EventType
+    level: EventLevel
+    template: str
+    fields: dict[str, Any] = field(default_factory=dict)
+    time: float = 0.0
+
+    @property
+    def message(self) -> str:
+        return self.template.format(**self.fields) if self.fields else self.template
+
+    def to_dict(self) -> EventDict:
+        return {
+            "time": self.time,
+            "type": self.type.name,
+            "level": self.level.name,
+            "message": self.message,
+            "fields": self.fields,
+        }
+
+
+class EventSink(Protocol):
+    """
+    Destination of the events emitted on an ``EventBus``.
+    """
+
+    def write(self, event: Event) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NullSink:
+    """
+    Drop every event.
+    """
+
+    def write(self, event: Event) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class ConsoleSink:
+    """
+    Print the events to stdout, like the game used to.
+    """
+
+    def write(self, event: Event) -> None:
+        print(event.message)
+
+    def close(self) -> None:
+        pass
+
+
+class RingBufferSink:
+    """
+    Keep the latest events in memory, for tests and post-mortem inspection.
+
+    :ivar events: The latest events, oldest first.
+    """
+
+    def __init__(self, max_size: int = EVENT_BUFFER_SIZE):
+        self.events: deque[Event] = deque(maxlen=max_size)
+
+    def write(self, event: Event) -> None:
+        self.events.append(event)
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlFileSink:
+    """
+    Append the events to a JSONL file, one ``EventDict`` per line.
+    """
+
+    def __init__(self, path: str | Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.__file = open(path, "a", encoding="utf-8")
+
+    def write(self, event: Event) -> None:
+        self.__file.write(json.dumps(event.to_dict(), default=str) + "\n")
+
+    def close(self) -> None:
+        self.__file.close()
+
+
+class EventBus:
+    """
+    Dispatch game events to sinks, dropping those below the bus level.
+    Disabled by default (level ``OFF``, no sink): ``emit`` then returns after a single comparison.
+
+    :ivar level: Lowest level of the events dispatched.
+    :ivar sinks: Destinations of the dispatched events.
+    """
+
+    def __init__(self, level: EventLevel = EventLevel.OFF, sinks: Optional[list[EventSink]] = None):
+        self.level = level
+        self.sinks: list[EventSink] = sinks if sinks is not None else []
+        self.__threshold = level.value if self.sinks else EventLevel.OFF.value
+
+    def configure(self, level: EventLevel, sinks: Optional[list[EventSink]] = None) -> None:
+        """
+        Set the level and replace the sinks of the bus, closing the previous ones.
+        :param level: Lowest level of the events dispatched.
+        :param sinks: New destinations of the events, the current ones are kept when None.
+        :return: None
+        """
+        if sinks is not None:
+            for sink in self.sinks:
+                sink.close()
+            self.sinks = sinks
+        self.level = level
+        self.__threshold = level.value if self.sinks else EventLevel.OFF.value
+
+    def enabled_for(self, level: EventLevel) -> bool:
+        return level.value >= self.__threshold
+
+    def emit(self, type: EventType, level: EventLevel, template: str, **fields: Any) -> None:
+        """
+        Dispatch an event to every sink, if its level is high enough.
+        :param type: Type of the event.
+        :param level: Level of the event.
+        :param template: Message template, formatted with the fields by the sinks.
+        :param fields: Values of the message template.
+        :return: None
+        """
+        if level.value < self.__threshold:
+            return
+        event = Event(type, level, template, fields, time.time())
+        for sink in self.sinks:
+            sink.write(event)
+
+    def close(self) -> None:
+        """
+        Close the sinks and disable the bus.
+        :return: None
+        """
+        self.configure(EventLevel.OFF, [])
+
+
+# Bus shared by the game loop, the players and the AI agents
+EVENT_BUS = EventBus()
+# Levels accepted by the ``log=<level>`` argument
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+def configure_event_bus(args: list[str]) -> None:
+    """
+    Enable the shared ``EVENT_BUS`` from ``key=value`` command line arguments:
+    ``log=<debug|info|warning|error>`` prints the events, ``log_file=<path>`` appends them to a JSONL file
+    (at the ``log`` level, ``debug`` when not given). The bus stays disabled without them.
+    :param args: The command line arguments.
+    :return: None
+    """
+    options = dict(arg.split("=", 1) for arg in args if "=" in arg)
+    sinks: list[EventSink] = []
+    if "log" in options:
+        sinks.append(ConsoleSink())
+    if "log_file" in options:
+        sinks.append(JsonlFileSink(options["log_file"]))
+    if len(sinks) > 0:
+        level_name = options.get("log", "debug")
+        if level_name.upper() not in LOG_LEVELS:
+            raise ValueError(
+                f"Unknown log level {level_name}, expected one of "
+                f"{', '.join(name.lower() for name in LOG_LEVELS)}"
+            )
+        EVENT_BUS.configure(EventLevel[level_name.upper()], sinks)
+
+
+def is_enabled(level: EventLevel) -> bool:
+    """
+    Whether events of this level reach a sink of the shared ``EVENT_BUS``.
+    Guard the events whose fields are costly to compute with it.
+    :param level: Level of the event.
+    :return: True if the events are dispatched.
+    :rtype: bool
+    """
+    return EVENT_BUS.enabled_for(level)
+
+
+def emit_event(type: EventType, level: EventLevel, template: str, **fields: Any) -> None:
+    """
+    Dispatch an event on the shared ``EVENT_BUS``.
+    :param type: Type of the event.
+    :param level: Level of the event.
+    :param template: Message template, formatted with the fields by the sinks.
+    :param fields: Values of the message template.
+    :return: None
+    """
+    EVENT_BUS.emit(type, level, template, **fields)
@@ -112,7 +112,7 @@ class GameHistoryData(TypedDict):
     points: list[int]
     latest_draw_tile_hand136_idx: list[int] | None
     can_call: list[list[int]] | None
-    callable_tiles_list: list[list[list[int]]] | None
+    callable_tiles_list: list[list[list[TileData]]] | None
 
     # For center board render
     is_reaches: list[bool]
@@ -0,0 +1,169 @@
+from collections import OrderedDict
+from typing import Optional, Sequence, TypedDict
+from mahjong.hand_calculating.hand import HandCalculator
+from mahjong.hand_calculating.hand_config import HandConfig
+from mahjong.hand_calculating.hand_response import HandResponse
+from mahjong.meld import Meld
+
+# Number of distinct wins whose hand value is kept
+HAND_VALUE_CACHE_SIZE = 1 << 12
+
+# Every HandConfig field changing the yaku or the cost of a hand
+HAND_CONFIG_FIELDS = (
+    "is_tsumo",
+    "is_riichi",
+    "is_ippatsu",
+    "is_rinshan",
+    "is_chankan",
+    "is_haitei",
+    "is_houtei",
+    "is_daburu_riichi",
+    "is_nagashi_mangan",
+    "is_tenhou",
+    "is_renhou",
+    "is_chiihou",
+    "is_open_riichi",
+    "player_wind",
+    "round_wind",
+    "kyoutaku_number",
+    "tsumi_number",
+    "paarenchan",
+)
+
+
+class HandValueCacheInfo(TypedDict):
+    """
+    Counters of a ``HandValueService`` cache.
+
+    :cvar hits: Estimations answered from the cache (int).
+    :cvar misses: Estimations computed by the calculator (int).
+    :cvar size: Number of wins in the cache (int).
+    :cvar max_size: Bound of the cache (int).
+    """
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+
+class HandValueService:
+    """
+    ``HandCalculator.estimate_hand_value`` with one shared calculator, memoised in a bounded LRU cache
+    keyed by (hand136 tiles, win tile, melds, dora indicators, config).
+
+    A win is estimated when checking whether it has a yaku (``Player.is_ron_able``, ``is_tsumo_able``)
+    then again when scoring it at ``end_match``, with the same arguments unless a situational yaku
+    (ippatsu, haitei, ura dora...) only known at scoring applies.
+    The cached ``HandResponse`` is shared, callers must not modify it.
+
+    :ivar hits: Estimations answered from the cache.
+    :ivar misses: Estimations computed by the calculator.
+    """
+
+    def __init__(self, max_size: int = HAND_VALUE_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__calculator = HandCalculator()
+        self.__cache: OrderedDict[tuple, HandResponse] = OrderedDict()
+
+    def estimate(
+        self,
+        tiles: Sequence[int],
+        win_tile: Optional[int],
+        melds: Optional[list[Meld]] = None,
+        dora_indicators: Optional[Sequence[int]] = None,
+        config: Optional[HandConfig] = None,
+    ) -> HandResponse:
+        """
+        Get the value of a winning hand, same arguments as ``HandCalculator.estimate_hand_value``.
+        :param tiles: Hand136 indexes of the whole hand, melds and win tile included.
+        :param win_tile: Hand136 index of the winning tile.
+        :param melds: The called melds.
+        :param dora_indicators: Hand136 indexes of the dora (and ura dora) indicators.
+        :param config: The hand config.
+        :return: The hand response, with ``error`` set when the hand does not win.
+        :rtype: HandResponse
+        """
+        key = self.__key(tiles, win_tile, melds, dora_indicators, config)
+        result = self.__cache.get(key)
+        if result is not None:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return result
+
+        self.misses += 1
+        result = self.__calculator.estimate_hand_value(
+            list(tiles),
+            win_tile,
+            melds=melds,
+            dora_indicators=list(dora_indicators) if dora_indicators else None,
+            config=config,
+        )
+        self.__cache[key] = result
+        if len(self.__cache) > self.max_size:
+            self.__cache.popitem(last=False)
+        return result
+
+    def cache_info(self) -> HandValueCacheInfo:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__cache),
+            "max_size": self.max_size,
+        }
+
+    def clear(self) -> None:
+        """
+        Empty the cache and reset the counters.
+        :return: None
+        """
+        self.__cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def __key(
+        tiles: Sequence[int],
+        win_tile: Optional[int],
+        melds: Optional[list[Meld]],
+        dora_indicators: Optional[Sequence[int]],
+        config: Optional[HandConfig],
+    ) -> tuple:
+        # called_tile does not change the value (and is a GUI Tile for Player melds)
+        melds_key = tuple(
+            (meld.type, tuple(meld.tiles), meld.opened) for meld in melds or []
+        )
+        config_key = None
+        if config is not None:
+            config_key = (
+                tuple(getattr(config, name) for name in HAND_CONFIG_FIELDS),
+                tuple(sorted(vars(config.options).items())),
+            )
+        return (
+            tuple(sorted(tiles)),
+            win_tile,
+            melds_key,
+            tuple(sorted(dora_indicators or ())),
+            config_key,
+        )
+
+
+# Service shared by the players, the game builder and the headless engine
+HAND_VALUE_SERVICE = HandValueService()
+
+
+def estimate_hand_value(
+    tiles: Sequence[int],
+    win_tile: Optional[int],
+    melds: Optional[list[Meld]] = None,
+    dora_indicators: Optional[Sequence[int]] = None,
+    config: Optional[HandConfig] = None,
+) -> HandResponse:
+    """
+    Get the value of a winning hand with the shared ``HAND_VALUE_SERVICE``.
+    :return: The hand response, shared with later lookups of the same win.
+    :rtype: HandResponse
+    """
+    return HAND_VALUE_SERVICE.estimate(tiles, win_tile, melds, dora_indicators, config)
@@ -1,6 +1,7 @@
 from pygame import Surface, Rect, Color
 import pygame
 import sys
+from collections import deque
 from utils.enums import CallType, ActionType, TileType
 import typing
 from mahjong.meld import Meld
@@ -64,28 +65,10 @@ def convert_tiles_list_to_hand34(tiles: list["Tile"]) -> list[int]:
     :return: A list of integers representing the 34-array hand.
     :rtype: list[int]
     """
-    from mahjong.tile import TilesConverter
-
-    mans = ""
-    sous = ""
-    pins = ""
-    honors = ""
+    hand34 = [0] * 34
     for tile in tiles:
-        match tile.type:
-            case TileType.MAN:
-                mans += str(tile.number)
-            case TileType.SOU:
-                sous += str(tile.number)
-            case TileType.PIN:
-                pins += str(tile.number)
-            case TileType.WIND:
-                honors += str(tile.number)
-            case TileType.DRAGON:
-                honors += str(tile.number + 4)
-
-    return TilesConverter.string_to_34_array(
-        man=mans, sou=sous, pin=pins, honors=honors
-    )
+        hand34[tile.hand34_idx] += 1
+    return hand34
 
 
 def convert_tiles_list_to_hand136(tiles: list["Tile"]) -> list[int]:
@@ -279,6 +262,45 @@ def find_suitable_tile_in_list(
         )
 
 
+def build_tile_kind_index(
+        tiles_list: list["Tile"],
+) -> dict[tuple[TileType, int, bool], deque["Tile"]]:
+    """
+    Index the tiles of a list by type, number and aka status, for ``pop_suitable_tile_from_index``.
+    :param tiles_list: The list of Tile objects to index.
+    :return: The tiles of each (type, number, aka), in list order.
+    :rtype: dict[tuple[TileType, int, bool], deque[Tile]]
+    """
+    kind_index: dict[tuple[TileType, int, bool], deque["Tile"]] = {}
+    for tile in tiles_list:
+        kind_index.setdefault((tile.type, tile.number, tile.aka), deque()).append(tile)
+    return kind_index
+
+
+def pop_suitable_tile_from_index(
+        tile_number: int,
+        tile_type: TileType,
+        tile_aka: bool,
+        kind_index: dict[tuple[TileType, int, bool], deque["Tile"]],
+) -> "Tile":
+    """
+    Take the first tile of the indexed list that matches the specified number, type, and aka status,
+    same tile as ``find_suitable_tile_in_list`` once the previous ones are removed from the list.
+    :param tile_number: The number of the tile to find.
+    :param tile_type: The type of the tile to find.
+    :param tile_aka: Whether the tile is an aka dora.
+    :param kind_index: The index built by ``build_tile_kind_index``, the tile is removed from it.
+    :return: The matching Tile object.
+    :rtype: Tile
+    """
+    tiles = kind_index.get((tile_type, tile_number, tile_aka))
+    if not tiles:
+        raise IndexError(
+            f"Can not get tile from list {tile_number}, {tile_type}, {tile_aka}! Error: no tile left"
+        )
+    return tiles.popleft()
+
+
 def count_shanten_points(tiles: list["Tile"]) -> int:
     """
     Count the shanten points of the given tiles.
@@ -286,10 +308,6 @@ def count_shanten_points(tiles: list["Tile"]) -> int:
     :return: An integer representing the shanten points.
     :rtype: int
     """
-    from mahjong.shanten import Shanten
+    from utils.shanten_service import calculate_shanten
 
-    shanten_calculator = Shanten()
-    points = shanten_calculator.calculate_shanten(
-        convert_tiles_list_to_hand34(tiles),
-    )
-    return points
+    return calculate_shanten(convert_tiles_list_to_hand34(tiles))
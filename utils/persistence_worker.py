@@ -0,0 +1,112 @@
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from itertools import count
+from pathlib import Path
+from typing import Callable, Hashable, Optional
+from utils.enums import EventLevel, EventType
+from utils.event_bus import emit_event
+
+
+def write_atomic(path: str | Path, data: bytes | str) -> None:
+    """
+    Replace a file at once: write and fsync a temporary file next to it, then rename it over the file.
+    A crash, even a power loss, leaves either the old or the new file, never half of it.
+    Each write has its own temporary file, concurrent writers of the same file never share one.
+    :param path: Path of the file.
+    :param data: Content of the file, text is written as UTF-8.
+    :return: None
+    """
+    path = Path(path)
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+    ) as file:
+        temp_path = file.name
+        try:
+            file.write(data.encode("utf-8") if isinstance(data, str) else data)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            file.close()
+            os.remove(temp_path)
+            raise
+    os.replace(temp_path, path)
+
+
+class PersistenceWorker:
+    """
+    Run file writes on a background thread, in submission order, so the game loop never waits for the disk.
+
+    A write submitted with the key of a write still waiting replaces it, and moves to the end of the queue:
+    rapid successive writes of the same file (an index, a journal) are done once, with the latest content.
+    ``flush`` waits for every submitted write, for shutdown and tests.
+    """
+
+    def __init__(self, name: str = "persistence"):
+        self.name = name
+        self.__jobs: OrderedDict[Hashable, Callable[[], None]] = OrderedDict()
+        self.__condition = threading.Condition()
+        self.__running = 0 # Number of jobs taken from the queue and not done yet
+        self.__unkeyed = count()
+        self.__thread: Optional[threading.Thread] = None
+
+    def submit(self, job: Callable[[], None], key: Optional[Hashable] = None) -> None:
+        """
+        Queue a write.
+        :param job: Function doing the write, run on the worker thread.
+        :param key: Coalescing key, a waiting job of the same key is dropped. None to never coalesce.
+        :return: None
+        """
+        if key is None:
+            key = ("unkeyed", next(self.__unkeyed))
+        with self.__condition:
+            self.__jobs.pop(key, None)
+            self.__jobs[key] = job
+            if self.__thread is None or not self.__thread.is_alive():
+                self.__thread = threading.Thread(
+                    target=self.__run, name=self.name, daemon=True
+                )
+                self.__thread.start()
+            self.__condition.notify_all()
+
+    def pending(self) -> int:
+        with self.__condition:
+            return len(self.__jobs) + self.__running
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every submitted write is done.
+        :param timeout: Maximum wait in seconds, None to wait as long as needed.
+        :return: Whether every write is done.
+        :rtype: bool
+        """
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: len(self.__jobs) == 0 and self.__running == 0, timeout
+            )
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: len(self.__jobs) > 0)
+                key, job = self.__jobs.popitem(last=False)
+                self.__running += 1
+            try:
+                job()
+            except Exception as e:
+                emit_event(
+                    EventType.PERSISTENCE,
+                    EventLevel.ERROR,
+                    "Write {key} failed: {error}",
+                    key=key,
+                    error=e,
+                )
+            finally:
+                with self.__condition:
+                    self.__running -= 1
+                    self.__condition.notify_all()
+
+
+# Worker of the game files (history snapshots and index, game log journals), flushed on exit by main.py
+PERSISTENCE_WORKER = PersistenceWorker()
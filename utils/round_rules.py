@@ -0,0 +1,270 @@
+from typing import Optional, Sequence
+from utils.enums import CallType, Direction
+from utils.shanten_service import calculate_waits
+
+# Rules of a round shared by ``GameManager`` and the headless ``RoundEngine``, on plain values
+# (hand34 counts, seat indices, winds) so both apply them the same way.
+# Costs and deltas are in hundreds of points, like ``GameManager.end_match``.
+
+WIND_KINDS = (27, 28, 29, 30)
+# Kans of a round, the round is aborted once they are all declared and nobody wins
+MAX_KAN_COUNT = 4
+# Paid by the noten seats to the tenpai seats at an exhaustive draw
+NOTEN_PAYMENT = 30
+# Position of the first ura dora indicator in the death wall, the next ones every 2 tiles
+URA_DORA_START_IDX = 4
+
+
+def is_yao9_kind(kind: int) -> bool:
+    return kind >= 27 or kind % 9 in (0, 8)
+
+
+def closed_waits(hand34: Sequence[int], draw_kind: Optional[int] = None) -> tuple[int, ...]:
+    """
+    Get the winning tile kinds of the 13-tile part of a concealed hand: a hand waiting for its discard
+    sets the drawn tile aside, other hands are used as they are.
+    :param hand34: Count of each of the 34 tile kinds in the concealed hand.
+    :param draw_kind: Kind of the drawn tile when it is still in the hand, None otherwise.
+    :return: The kinds completing the hand, empty when it is not tenpai.
+    :rtype: tuple[int, ...]
+    """
+    if sum(hand34) % 3 == 2 and draw_kind is not None and hand34[draw_kind] > 0:
+        hand34 = list(hand34)
+        hand34[draw_kind] -= 1
+    return calculate_waits(hand34)
+
+
+def can_declare_kan(kan_count: int, wall_size: int) -> bool:
+    """
+    Whether a kan can be declared: fewer than 4 kans so far, and a tile left in the wall
+    for the death wall to give a replacement tile.
+    :param kan_count: Number of kans declared in the round.
+    :param wall_size: Number of tiles left to draw, after the latest draw.
+    :return: Whether a kan is allowed.
+    :rtype: bool
+    """
+    return kan_count < MAX_KAN_COUNT and wall_size > 0
+
+
+def is_kyuushu_kyuuhai(
+    hand34: Sequence[int], turn: int, skipped: bool, interrupted: bool
+) -> bool:
+    """
+    Whether a seat can abort the round with 9 different terminal and honor kinds,
+    only on its first draw and while nobody called.
+    :param hand34: Count of each of the 34 tile kinds in the hand, with the drawn tile.
+    :param turn: Number of discards of the seat.
+    :param skipped: Whether the seat already declined it.
+    :param interrupted: Whether any seat called (ankan included).
+    :return: Whether kyuushu kyuuhai can be declared.
+    :rtype: bool
+    """
+    if turn != 0 or skipped or interrupted:
+        return False
+    return len([kind for kind in range(34) if hand34[kind] > 0 and is_yao9_kind(kind)]) >= 9
+
+
+def is_suufon_renda(turns: Sequence[int], discard_kinds: Sequence[Sequence[int]]) -> bool:
+    """
+    Whether the 4 first discards are the same wind, without any call in between.
+    :param turns: Number of discards of each seat.
+    :param discard_kinds: Kinds of the visible discards of each seat.
+    :return: Whether the round is aborted by suufon renda.
+    :rtype: bool
+    """
+    if any(turn != 1 for turn in turns) or any(len(kinds) != 1 for kinds in discard_kinds):
+        return False
+    first_kind = discard_kinds[0][0]
+    return first_kind in WIND_KINDS and all(kinds[0] == first_kind for kinds in discard_kinds)
+
+
+def abortive_draw_reason(kan_count: int, riichi_count: int) -> Optional[str]:
+    """
+    Get the abortive draw ending the round once nobody calls the latest discard.
+    :param kan_count: Number of kans declared in the round.
+    :param riichi_count: Number of seats in riichi.
+    :return: ``Suukaikan``, ``Suucha Riichi``, or None when the round goes on.
+    :rtype: str | None
+    """
+    if kan_count == MAX_KAN_COUNT:
+        return "Suukaikan"
+    if riichi_count == 4:
+        return "Suucha Riichi"
+    return None
+
+
+def call_priority(
+    can_call: Sequence[CallType], from_direction: Direction, direction: Direction
+) -> tuple[int, int]:
+    """
+    Sort key of a seat answering a discard or a kakan. A call order sorted with ``reverse=True``
+    is answered from its end: RON > KAN > PON > CHII first, then the closest seat after the discarder.
+    :param can_call: Calls available to the seat, the best one first.
+    :param from_direction: Wind of the discarder.
+    :param direction: Wind of the seat.
+    :return: The sort key.
+    :rtype: tuple[int, int]
+    """
+    return can_call[0].value, -((from_direction.value - direction.value) % 4)
+
+
+def win_situation(
+    is_tsumo: bool,
+    is_dealer: bool,
+    riichi_turn: int,
+    turn: int,
+    has_melds: bool,
+    is_rinshan: bool,
+    is_chankan: bool,
+    is_wall_empty: bool,
+) -> dict[str, bool]:
+    """
+    Get the situational yaku of a win, as ``HandConfig`` keyword arguments.
+    :param is_tsumo: Whether the win is a tsumo, a ron otherwise.
+    :param is_dealer: Whether the winner is the dealer.
+    :param riichi_turn: Turn the winner declared riichi, -1 if not riichi.
+    :param turn: Number of discards of the winner.
+    :param has_melds: Whether the winner has melds (ankan included).
+    :param is_rinshan: Whether the winning tile was drawn from the death wall.
+    :param is_chankan: Whether the ron robs a kakan.
+    :param is_wall_empty: Whether no tile is left to draw.
+    :return: The ``is_*`` flags of the win.
+    :rtype: dict[str, bool]
+    """
+    is_riichi = riichi_turn >= 0
+    return {
+        "is_tsumo": is_tsumo,
+        "is_riichi": is_riichi,
+        "is_daburu_riichi": riichi_turn == 0,
+        "is_ippatsu": is_riichi and riichi_turn == turn - 1,
+        "is_rinshan": is_tsumo and is_rinshan,
+        "is_chankan": not is_tsumo and is_chankan,
+        "is_haitei": is_tsumo and is_wall_empty,
+        "is_houtei": not is_tsumo and not is_chankan and is_wall_empty,
+        "is_tenhou": is_tsumo and is_dealer and turn == 0 and not has_melds,
+        "is_chiihou": is_tsumo and not is_dealer and turn == 0 and not has_melds,
+        "is_renhou": not is_tsumo and turn == 0,
+    }
+
+
+def ura_dora_positions(dora_count: int) -> list[int]:
+    """
+    Get the death wall positions of the ura dora indicators, one under each dora indicator.
+    """
+    return [URA_DORA_START_IDX + 2 * i for i in range(dora_count)]
+
+
+def win_deltas(
+    total_cost: int,
+    win_seat: int,
+    from_seat: Optional[int],
+    directions: Sequence[Direction],
+    tsumi_number: int,
+    kyoutaku_number: int,
+) -> list[int]:
+    """
+    Get the score changes of a win. The winner gets the whole cost, riichi sticks included,
+    a tsumo is split between the other seats (the dealer paying double), a ron is paid by the discarder.
+    :param total_cost: Total cost of the hand, in hundreds, with the tsumi and riichi sticks.
+    :param win_seat: Seat of the winner.
+    :param from_seat: Seat of the discarder, None on tsumo.
+    :param directions: Wind of each seat.
+    :param tsumi_number: Number of tsumi sticks.
+    :param kyoutaku_number: Number of riichi sticks on the table.
+    :return: Score change of each seat, in hundreds.
+    :rtype: list[int]
+    """
+    deltas = [0, 0, 0, 0]
+    deltas[win_seat] += total_cost
+    if from_seat is not None:
+        deltas[from_seat] -= total_cost - kyoutaku_number * 10
+        return deltas
+
+    divided_cost = total_cost - tsumi_number * 3 - kyoutaku_number * 10
+    for seat in range(4):
+        if seat == win_seat:
+            continue
+        if directions[win_seat] == Direction.EAST:
+            deltas[seat] -= int(divided_cost / 3) + tsumi_number
+        elif directions[seat] == Direction.EAST:
+            deltas[seat] -= int(divided_cost / 4) * 2 + tsumi_number
+        else:
+            deltas[seat] -= int(divided_cost / 4) + tsumi_number
+    return deltas
+
+
+def is_nagashi_mangan(discard_kinds: Sequence[int], all_discard_count: int) -> bool:
+    """
+    Whether a seat gets nagashi mangan: none of its discards called, and all of them terminals or honors.
+    :param discard_kinds: Kinds of the visible discards of the seat.
+    :param all_discard_count: Number of discards of the seat, called ones included.
+    :return: Whether the seat gets nagashi mangan.
+    :rtype: bool
+    """
+    return len(discard_kinds) == all_discard_count and all(
+        is_yao9_kind(kind) for kind in discard_kinds
+    )
+
+
+def nagashi_mangan_deltas(
+    total_cost: int, seat: int, directions: Sequence[Direction]
+) -> list[int]:
+    """
+    Get the score changes of a nagashi mangan, paid like a tsumo without sticks.
+    :param total_cost: Cost of the nagashi mangan, in hundreds.
+    :param seat: Seat getting the nagashi mangan.
+    :param directions: Wind of each seat.
+    :return: Score change of each seat, in hundreds.
+    :rtype: list[int]
+    """
+    return win_deltas(total_cost, seat, None, directions, 0, 0)
+
+
+def tenpai_deltas(tenpai_seats: Sequence[int]) -> list[int]:
+    """
+    Get the noten payments of an exhaustive draw, nothing when every seat or no seat is tenpai.
+    :param tenpai_seats: Seats tenpai at the draw.
+    :return: Score change of each seat, in hundreds.
+    :rtype: list[int]
+    """
+    deltas = [0, 0, 0, 0]
+    if not 0 < len(tenpai_seats) < 4:
+        return deltas
+    for seat in range(4):
+        if seat in tenpai_seats:
+            deltas[seat] += int(NOTEN_PAYMENT / len(tenpai_seats))
+        else:
+            deltas[seat] -= int(NOTEN_PAYMENT / (4 - len(tenpai_seats)))
+    return deltas
+
+
+def keeps_dealer(
+    directions: Sequence[Direction],
+    win_seat: Optional[int] = None,
+    tenpai_seats: Sequence[int] = (),
+    aborted: bool = False,
+) -> bool:
+    """
+    Whether the dealer keeps the seat for the next round (renchan): the dealer won,
+    the round was aborted, or the dealer was tenpai at the exhaustive draw.
+    :param directions: Wind of each seat.
+    :param win_seat: Seat of the winner, None on a draw.
+    :param tenpai_seats: Seats tenpai at an exhaustive draw.
+    :param aborted: Whether the round ended in an abortive draw.
+    :return: Whether the dealer keeps the seat.
+    :rtype: bool
+    """
+    if aborted:
+        return True
+    dealer = list(directions).index(Direction.EAST)
+    if win_seat is not None:
+        return win_seat == dealer
+    return dealer in tenpai_seats
+
+
+def tsumi_after_win(dealer_won: bool, tsumi_number: int) -> int:
+    """
+    Get the tsumi sticks of the next round after a win: one more after a dealer win, none otherwise.
+    The riichi sticks go to the winner.
+    """
+    return tsumi_number + 1 if dealer_won else 0
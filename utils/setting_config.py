@@ -11,6 +11,7 @@ class SettingConfig(TypedDict):
     :cvar player_2: Strategy for player 2 (str).
     :cvar player_3: Strategy for player 3 (str).
     :cvar name: Name of the configuration (str).
+    :cvar backend: Inference backend of the AI bots (str).
     """
     bgm: int
     sfx: int
@@ -18,3 +19,4 @@ class SettingConfig(TypedDict):
     player_2: Literal["shanten", "aggressive", "passive"]
     player_3: Literal["shanten", "aggressive", "passive"]
     name: str
+    backend: Literal["torch", "torchscript", "onnx", "int8"]
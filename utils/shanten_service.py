@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from typing import Sequence, TypedDict
+from utils.shanten_table import TableShanten
+
+# Number of distinct hands whose shanten is kept
+SHANTEN_CACHE_SIZE = 1 << 16
+
+
+class ShantenCacheInfo(TypedDict):
+    """
+    Counters of a ``ShantenService`` cache.
+
+    :cvar hits: Lookups answered from the cache (int).
+    :cvar misses: Lookups computed by the calculator (int).
+    :cvar size: Number of hands in the cache (int).
+    :cvar max_size: Bound of the cache (int).
+    :cvar wait_hits: Wait lookups answered from the cache (int).
+    :cvar wait_misses: Wait lookups computed from the hand (int).
+    :cvar wait_size: Number of 13-tile hands in the wait cache (int).
+    """
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+    wait_hits: int
+    wait_misses: int
+    wait_size: int
+
+
+class ShantenService:
+    """
+    Shanten of 34-array hands with one shared ``TableShanten`` calculator,
+    memoised by the hand34 tuple in a bounded LRU cache.
+
+    Bots evaluate the same hands again and again (every discard candidate, riichi tiles, tenpai at
+    ryuukyoku), so most lookups are cache hits.
+    The winning tiles (machi) of 13-tile hands are kept in a second cache of the same size: every
+    discard checks the waits of the three other hands, which have not changed since their last turn.
+
+    :ivar hits: Lookups answered from the cache.
+    :ivar misses: Lookups computed by the calculator.
+    :ivar wait_hits: Wait lookups answered from the cache.
+    :ivar wait_misses: Wait lookups computed from the hand.
+    """
+
+    def __init__(self, max_size: int = SHANTEN_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.wait_hits = 0
+        self.wait_misses = 0
+        self.__calculator = TableShanten()
+        self.__cache: OrderedDict[tuple[int, ...], int] = OrderedDict()
+        self.__waits: OrderedDict[tuple[int, ...], tuple[int, ...]] = OrderedDict()
+
+    def calculate(self, hand34: Sequence[int]) -> int:
+        """
+        Get the shanten of a hand, chiitoitsu and kokushi included like ``Shanten.calculate_shanten``.
+        :param hand34: Count of each of the 34 tile kinds.
+        :return: The shanten, -1 for a complete hand.
+        :rtype: int
+        """
+        key = tuple(hand34)
+        shanten = self.__cache.get(key)
+        if shanten is not None:
+            self.hits += 1
+            self.__cache.move_to_end(key)
+            return shanten
+
+        self.misses += 1
+        # The calculator works on a list it may modify, never hand it the key
+        shanten = self.__calculator.calculate_shanten(list(key))
+        self.__cache[key] = shanten
+        if len(self.__cache) > self.max_size:
+            self.__cache.popitem(last=False)
+        return shanten
+
+    def waits(self, hand34: Sequence[int]) -> tuple[int, ...]:
+        """
+        Get the winning tile kinds (machi) of a 13-tile hand.
+        :param hand34: Count of each of the 34 tile kinds, without the drawn tile.
+        :return: The kinds completing the hand, empty when it is not tenpai.
+        :rtype: tuple[int, ...]
+        """
+        key = tuple(hand34)
+        waits = self.__waits.get(key)
+        if waits is not None:
+            self.wait_hits += 1
+            self.__waits.move_to_end(key)
+            return waits
+
+        self.wait_misses += 1
+        waits = ()
+        # Waits only exist at tenpai, the furiten rules do not apply before
+        if self.calculate(key) == 0:
+            kinds = [kind for kind in range(34) if key[kind] < 4]
+            shantens = self.__calculator.calculate_shanten_after_draws(list(key), kinds)
+            waits = tuple(kind for kind, shanten in zip(kinds, shantens) if shanten == -1)
+        self.__waits[key] = waits
+        if len(self.__waits) > self.max_size:
+            self.__waits.popitem(last=False)
+        return waits
+
+    def calculate_after_draws(self, hand34: list[int], kinds: Sequence[int]) -> list[int]:
+        """
+        Get the shanten of a hand after drawing each of the given kinds. Not cached: the hands
+        of an ukeire count are each seen once, they are computed incrementally instead.
+        :param hand34: Count of each of the 34 tile kinds, left unchanged.
+        :param kinds: Kinds to draw, each with less than 4 copies in hand.
+        :return: The shanten after each draw.
+        :rtype: list[int]
+        """
+        return self.__calculator.calculate_shanten_after_draws(hand34, kinds)
+
+    def cache_info(self) -> ShantenCacheInfo:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self.__cache),
+            "max_size": self.max_size,
+            "wait_hits": self.wait_hits,
+            "wait_misses": self.wait_misses,
+            "wait_size": len(self.__waits),
+        }
+
+    def clear(self) -> None:
+        """
+        Empty the caches and reset the counters.
+        :return: None
+        """
+        self.__cache.clear()
+        self.__waits.clear()
+        self.hits = 0
+        self.misses = 0
+        self.wait_hits = 0
+        self.wait_misses = 0
+
+
+# Service shared by the players, the headless engine and the helpers
+SHANTEN_SERVICE = ShantenService()
+
+
+def calculate_shanten(hand34: Sequence[int]) -> int:
+    """
+    Get the shanten of a hand with the shared ``SHANTEN_SERVICE``.
+    :param hand34: Count of each of the 34 tile kinds.
+    :return: The shanten, -1 for a complete hand.
+    :rtype: int
+    """
+    return SHANTEN_SERVICE.calculate(hand34)
+
+
+def calculate_waits(hand34: Sequence[int]) -> tuple[int, ...]:
+    """
+    Get the winning tile kinds of a 13-tile hand with the shared ``SHANTEN_SERVICE``.
+    :param hand34: Count of each of the 34 tile kinds, without the drawn tile.
+    :return: The kinds completing the hand, empty when it is not tenpai.
+    :rtype: tuple[int, ...]
+    """
+    return SHANTEN_SERVICE.waits(hand34)
@@ -0,0 +1,307 @@
+import os
+import itertools
+import numpy as np
+from typing import Optional, Sequence
+from mahjong.shanten import Shanten
+from utils.constants import SHANTEN_TABLE_PATH
+
+# Base-5 weight of each of the 9 tiles of a suit: a suit count vector is indexed by sum(count * 5**i)
+SUIT_POWERS = [5**i for i in range(9)]
+SUIT_SIZE = 5**9
+# Entry h * 5 + m of a table row: head h (0/1) and m mentsu
+ROW_SIZE = 10
+# Blocks beyond 4 never lower the shanten, so they are capped to fit the table in int8
+MAX_BLOCKS = 4
+EMPTY_ROW = (0,) + (-1,) * (ROW_SIZE - 1)
+# Terminal and honor kinds counted by kokushi
+YAOCHUU_KIND_LIST = (0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33)
+YAOCHUU_KINDS = frozenset(YAOCHUU_KIND_LIST)
+# Chiitoitsu and kokushi only count for hands of at least this many tiles (no called meld)
+CLOSED_HAND_MIN_TILES = 13
+
+
+def suit_key(tiles_34: Sequence[int], start: int) -> int:
+    """
+    Get the table row of the suit starting at ``start`` (0, 9 or 18).
+    """
+    key = 0
+    for count, power in zip(tiles_34[start : start + 9], SUIT_POWERS):
+        key += count * power
+    return key
+
+
+def _add_mentsu(row: tuple[int, ...]) -> tuple[int, ...]:
+    return (-1,) + row[0:4] + (-1,) + row[5:9]
+
+
+def _add_block(row: tuple[int, ...]) -> tuple[int, ...]:
+    return tuple(min(blocks + 1, MAX_BLOCKS) if blocks >= 0 else -1 for blocks in row)
+
+
+def _add_head(row: tuple[int, ...]) -> tuple[int, ...]:
+    return (-1,) * 5 + row[0:5]
+
+
+def _merge(a: tuple[int, ...], b: tuple[int, ...]) -> tuple[int, ...]:
+    return tuple(x if x > y else y for x, y in zip(a, b))
+
+
+def build_suit_table() -> np.ndarray:
+    """
+    Precompute the decompositions of every 9-tile suit count vector holding at most 14 tiles.
+
+    Row ``key`` of the table describes the suit with counts ``c`` where ``key = sum(c[i] * 5**i)``:
+    entry ``h * 5 + m`` is the largest number of blocks (taatsu and pairs other than the head, capped to 4)
+    of a decomposition into ``m`` mentsu with ``h`` head, -1 when there is none.
+
+    The lowest tile of a suit is either isolated or starts a triplet, pair, sequence or taatsu,
+    so each row is merged from the rows of the smaller suits, memoised by key.
+    :return: The table (5**9, 10) int8.
+    :rtype: np.ndarray
+    """
+    rows: dict[int, tuple[int, ...]] = {0: EMPTY_ROW}
+
+    def solve(counts: list[int], key: int) -> tuple[int, ...]:
+        if key in rows:
+            return rows[key]
+        i = 0
+        while counts[i] == 0:
+            i += 1
+
+        def sub(*tiles: int) -> tuple[int, ...]:
+            for tile in tiles:
+                counts[tile] -= 1
+            row = solve(counts, key - sum(SUIT_POWERS[tile] for tile in tiles))
+            for tile in tiles:
+                counts[tile] += 1
+            return row
+
+        row = sub(i)  # Isolated tile
+        if counts[i] >= 3:
+            row = _merge(row, _add_mentsu(sub(i, i, i)))
+        if counts[i] >= 2:
+            pair = sub(i, i)
+            row = _merge(row, _merge(_add_block(pair), _add_head(pair)))
+        if i <= 6 and counts[i + 1] and counts[i + 2]:
+            row = _merge(row, _add_mentsu(sub(i, i + 1, i + 2)))
+        if i <= 7 and counts[i + 1]:
+            row = _merge(row, _add_block(sub(i, i + 1)))
+        if i <= 6 and counts[i + 2]:
+            row = _merge(row, _add_block(sub(i, i + 2)))
+        rows[key] = row
+        return row
+
+    table = np.full((SUIT_SIZE, ROW_SIZE), -1, dtype=np.int8)
+    for counts in itertools.product(range(5), repeat=9):
+        if sum(counts) > 14:
+            continue
+        key = sum(count * power for count, power in zip(counts, SUIT_POWERS))
+        table[key] = solve(list(counts), key)
+    return table
+
+
+def load_suit_table(path: str = SHANTEN_TABLE_PATH, rebuild: bool = False) -> np.ndarray:
+    """
+    Load the suit table, building and saving it first when missing.
+    :param path: The ``.npz`` file of the table.
+    :param rebuild: Build and save the table even if the file exists.
+    :return: The table (5**9, 10) int8.
+    :rtype: np.ndarray
+    """
+    if rebuild or not os.path.exists(path):
+        table = build_suit_table()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez_compressed(path, table=table)
+        return table
+    with np.load(path) as data:
+        return data["table"]
+
+
+# Best blocks for each (head, mentsu) of the tiles combined so far
+Frontier = dict[tuple[int, int], int]
+# Suit rows kept as their valid (head, mentsu, blocks) entries
+ENTRIES_CACHE_SIZE = 1 << 16
+
+
+class TableShanten:
+    """
+    Shanten calculator giving the same results as ``mahjong.shanten.Shanten.calculate_shanten``,
+    with the regular hand computed from three suit table lookups plus the honor counts.
+
+    A regular hand scores ``8 - 2 * mentsu - min(blocks, 4 - mentsu) - head``, so the best
+    (mentsu, blocks, head) of each suit from the table are combined and the highest score is kept.
+    Hands holding all 4 copies of a tile go through the library, whose rules for them
+    (waits on a tile the hand already holds 4 of) do not split by suit.
+    """
+
+    def __init__(self, table: Optional[np.ndarray] = None):
+        self.__table = table
+        self.__library = Shanten()
+        self.__entries: dict[int, list[tuple[int, int, int]]] = {}
+
+    @property
+    def table(self) -> np.ndarray:
+        # Loaded on first use, importing the calculator stays cheap
+        if self.__table is None:
+            self.__table = load_suit_table()
+        return self.__table
+
+    def calculate_shanten(self, tiles_34: Sequence[int]) -> int:
+        """
+        Return the minimum shanten for provided hand, chiitoitsu and kokushi included
+        when the hand holds at least 13 tiles, like the library.
+        """
+        regular = self.calculate_shanten_for_regular_hand(tiles_34)
+        if sum(tiles_34) < CLOSED_HAND_MIN_TILES:
+            return regular
+        return min(
+            regular,
+            self.__library.calculate_shanten_for_chiitoitsu_hand(tiles_34),
+            self.__library.calculate_shanten_for_kokushi_hand(tiles_34),
+        )
+
+    def calculate_shanten_for_regular_hand(self, tiles_34: Sequence[int]) -> int:
+        if max(tiles_34) == 4:
+            return self.__library.calculate_shanten_for_regular_hand(tiles_34)
+
+        best = self.__honor_frontier(tiles_34)
+        for start in (0, 9):
+            best = self.__combine(best, self.__suit_entries(suit_key(tiles_34, start)))
+        return self.__combine_score(best, self.__suit_entries(suit_key(tiles_34, 18)))
+
+    def calculate_shanten_after_draws(
+        self, tiles_34: list[int], kinds: Sequence[int]
+    ) -> list[int]:
+        """
+        Get the shanten of the hand after drawing each of the given kinds, in one pass.
+        The honors and the two other suits are combined once per suit, so a draw costs
+        one suit lookup instead of a whole hand.
+        :param tiles_34: The hand before drawing, left unchanged.
+        :param kinds: Kinds to draw, each with less than 4 copies in hand.
+        :return: The shanten after each draw.
+        :rtype: list[int]
+        """
+        keys = [suit_key(tiles_34, start) for start in (0, 9, 18)]
+        honors = self.__honor_frontier(tiles_34)
+        suits = [self.__suit_entries(key) for key in keys]
+        # Frontier of everything but suit s, built on first draw in that suit
+        others: list[Optional[Frontier]] = [None, None, None]
+
+        pairs = sum(1 for count in tiles_34 if count >= 2)
+        distinct = sum(1 for count in tiles_34 if count >= 1)
+        terminals = sum(1 for kind in YAOCHUU_KIND_LIST if tiles_34[kind] > 0)
+        terminal_pair = any(tiles_34[kind] >= 2 for kind in YAOCHUU_KIND_LIST)
+
+        has_quad = max(tiles_34) == 4
+        closed_hand = sum(tiles_34) + 1 >= CLOSED_HAND_MIN_TILES
+        results = []
+        for kind in kinds:
+            count = tiles_34[kind]
+            if count == 3 or has_quad:
+                # The library handles the 4 copies
+                tiles_34[kind] += 1
+                results.append(self.calculate_shanten(tiles_34))
+                tiles_34[kind] -= 1
+                continue
+
+            if kind >= 27:
+                tiles_34[kind] += 1
+                best = self.__honor_frontier(tiles_34)
+                tiles_34[kind] -= 1
+                for entries in suits[:2]:
+                    best = self.__combine(best, entries)
+                regular = self.__combine_score(best, suits[2])
+            else:
+                suit = kind // 9
+                if others[suit] is None:
+                    best = honors
+                    for other in range(3):
+                        if other != suit:
+                            best = self.__combine(best, suits[other])
+                    others[suit] = best
+                entries = self.__suit_entries(keys[suit] + SUIT_POWERS[kind % 9])
+                regular = self.__combine_score(others[suit], entries)
+
+            if not closed_hand:
+                results.append(regular)
+                continue
+
+            # Chiitoitsu and kokushi after the draw, same formulas as the library
+            draw_pairs = pairs + (count == 1)
+            draw_distinct = distinct + (count == 0)
+            if draw_pairs == 7:
+                chiitoitsu = -1
+            else:
+                chiitoitsu = 6 - draw_pairs + max(0, 7 - draw_distinct)
+            kokushi = 13
+            if kind in YAOCHUU_KINDS:
+                kokushi -= terminals + (count == 0)
+                kokushi -= 1 if terminal_pair or count == 1 else 0
+            else:
+                kokushi -= terminals + (1 if terminal_pair else 0)
+            results.append(min(regular, chiitoitsu, kokushi))
+        return results
+
+    def __suit_entries(self, key: int) -> list[tuple[int, int, int]]:
+        entries = self.__entries.get(key)
+        if entries is None:
+            if len(self.__entries) >= ENTRIES_CACHE_SIZE:
+                self.__entries.clear()
+            entries = [
+                (entry // 5, entry % 5, blocks)
+                for entry, blocks in enumerate(self.table[key].tolist())
+                if blocks >= 0
+            ]
+            self.__entries[key] = entries
+        return entries
+
+    @staticmethod
+    def __honor_frontier(tiles_34: Sequence[int]) -> Frontier:
+        # Called melds and honor triplets are mentsu, honor pairs are blocks or the head
+        mentsu = (14 - sum(tiles_34)) // 3
+        pairs = 0
+        for count in tiles_34[27:34]:
+            if count == 3:
+                mentsu += 1
+            elif count == 2:
+                pairs += 1
+
+        best = {(0, mentsu): min(pairs, MAX_BLOCKS)}
+        if pairs > 0:
+            best[(1, mentsu)] = min(pairs - 1, MAX_BLOCKS)
+        return best
+
+    @staticmethod
+    def __combine(best: Frontier, entries: list[tuple[int, int, int]]) -> Frontier:
+        combined: Frontier = {}
+        for (head, mentsu), blocks in best.items():
+            for suit_head, suit_mentsu, suit_blocks in entries:
+                total_head = head + suit_head
+                total_mentsu = mentsu + suit_mentsu
+                if total_head > 1 or total_mentsu > 4:
+                    continue
+                total_blocks = blocks + suit_blocks
+                if total_blocks > MAX_BLOCKS:
+                    total_blocks = MAX_BLOCKS
+                key = (total_head, total_mentsu)
+                if combined.get(key, -1) < total_blocks:
+                    combined[key] = total_blocks
+        return combined
+
+    @staticmethod
+    def __combine_score(best: Frontier, entries: list[tuple[int, int, int]]) -> int:
+        # Last combine, scores each decomposition instead of keeping the frontier
+        score = 0
+        for (head, mentsu), blocks in best.items():
+            for suit_head, suit_mentsu, suit_blocks in entries:
+                total_head = head + suit_head
+                total_mentsu = mentsu + suit_mentsu
+                if total_head > 1 or total_mentsu > 4:
+                    continue
+                total_blocks = blocks + suit_blocks
+                if total_blocks > 4 - total_mentsu:
+                    total_blocks = 4 - total_mentsu
+                total = 2 * total_mentsu + total_blocks + total_head
+                if total > score:
+                    score = total
+        return 8 - score
@@ -0,0 +1,19 @@
+# Same naming as ``Tile.__str__`` so logs, snapshots and AI encoders can read hand136 tiles
+TILE_KIND_NAMES = [
+    *(f"{n}m" for n in range(1, 10)),
+    *(f"{n}p" for n in range(1, 10)),
+    *(f"{n}s" for n in range(1, 10)),
+    "E", "S", "W", "N", "P", "F", "C",
+]
+AKA_DORA_HAND136 = (16, 52, 88)  # 0th copy of 5m, 5p, 5s
+
+
+def tile_to_str(tile: int) -> str:
+    """
+    Convert a hand136 index to the same string ``Tile.__str__`` gives.
+    :param tile: The hand136 index of the tile.
+    :return: String representation of the tile, e.g. ``5mr`` or ``E``.
+    :rtype: str
+    """
+    name = TILE_KIND_NAMES[tile // 4]
+    return f"{name}r" if tile in AKA_DORA_HAND136 else name
@@ -0,0 +1,90 @@
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Sequence
+from utils.shanten_service import SHANTEN_SERVICE
+
+# Terminal and honor kinds, kokushi can use them even when nothing around them is in hand
+YAOCHUU_KINDS = frozenset((0, 8, 9, 17, 18, 26, 27, 28, 29, 30, 31, 32, 33))
+
+
+@dataclass
+class DiscardCandidate:
+    """
+    A tile kind the hand can discard, with the shanten and ukeire left after discarding it.
+
+    :cvar kind: Tile kind (hand34 index) to discard.
+    :cvar shanten: Shanten of the hand after the discard.
+    :cvar ukeire: Number of unseen tiles lowering that shanten.
+    :cvar effective_kinds: Tile kinds lowering that shanten.
+    """
+
+    kind: int
+    shanten: int
+    ukeire: int
+    effective_kinds: list[int] = field(default_factory=list)
+
+
+def useful_kinds(hand34: Sequence[int]) -> list[int]:
+    """
+    Get the tile kinds that may lower the shanten of a hand when drawn. A tile not forming a pair,
+    taatsu or mentsu with the hand only adds an isolated tile, unless it helps chiitoitsu
+    (less than 7 kinds) or kokushi (terminals and honors).
+    :param hand34: Count of each of the 34 tile kinds.
+    :return: Candidate kinds, in kind order.
+    :rtype: list[int]
+    """
+    if sum(1 for count in hand34 if count > 0) < 7:
+        return [kind for kind in range(34) if hand34[kind] < 4]
+
+    kinds = set(YAOCHUU_KINDS)
+    for kind, count in enumerate(hand34):
+        if count == 0:
+            continue
+        if kind >= 27:
+            kinds.add(kind)
+            continue
+        start = kind - kind % 9
+        kinds.update(range(max(start, kind - 2), min(start + 9, kind + 3)))
+    return [kind for kind in sorted(kinds) if hand34[kind] < 4]
+
+
+def rank_discards(
+    hand34: list[int],
+    visible34: Optional[Sequence[int]] = None,
+    kinds: Optional[Iterable[int]] = None,
+) -> list[DiscardCandidate]:
+    """
+    Rank the discards of a hand by shanten, then by ukeire, in one pass over a single count vector.
+    Every candidate is removed from ``hand34`` then added back, the draws after it are computed
+    incrementally from the remaining hand, so ``hand34`` is left unchanged.
+    :param hand34: Count of each of the 34 tile kinds in hand, including the drawn tile.
+    :param visible34: Count of each kind seen outside the hand (discards, melds, dora indicators).
+    :param kinds: Kinds allowed to be discarded, defaults to every kind in hand.
+    :return: Candidates, best first. Ties keep kind order.
+    :rtype: list[DiscardCandidate]
+    """
+    if visible34 is None:
+        visible34 = [0] * 34
+    if kinds is None:
+        kinds = [kind for kind in range(34) if hand34[kind] > 0]
+
+    candidates: list[DiscardCandidate] = []
+    for kind in sorted(set(kinds)):
+        hand34[kind] -= 1
+        shanten = SHANTEN_SERVICE.calculate(hand34)
+        candidate = DiscardCandidate(kind, shanten, 0)
+        # Copies of the discarded kind are not drawable, it stays counted as held
+        unseen = {
+            draw_kind: 4 - hand34[draw_kind] - visible34[draw_kind] - (draw_kind == kind)
+            for draw_kind in useful_kinds(hand34)
+        }
+        draw_kinds = [draw_kind for draw_kind, left in unseen.items() if left > 0]
+        draw_shantens = SHANTEN_SERVICE.calculate_after_draws(hand34, draw_kinds)
+        for draw_kind, draw_shanten in zip(draw_kinds, draw_shantens):
+            if draw_shanten < shanten:
+                candidate.ukeire += unseen[draw_kind]
+                candidate.effective_kinds.append(draw_kind)
+        hand34[kind] += 1
+        candidates.append(candidate)
+
+    candidates.sort(key=lambda candidate: (candidate.shanten, -candidate.ukeire))
+    return candidates